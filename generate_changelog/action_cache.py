@@ -0,0 +1,176 @@
+"""Memoization of action results."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from generate_changelog.indented_logger import get_indented_logger
+
+logger = get_indented_logger(__name__)
+
+MISSING = object()
+"""Returned by [`ActionCache.get`][generate_changelog.action_cache.ActionCache.get] when there is no cached value."""
+
+CACHEABLE_TYPES = (str, int, float, bool, type(None))
+"""The result types that are cached. They are immutable and come back from the persistent store unchanged."""
+
+
+def make_key(action: str, args: list, kwargs: dict, input_value: Any) -> str:
+    """
+    Create the cache key for an action call.
+
+    Args:
+        action: The python path or built-in name of the action.
+        args: The rendered positional arguments of the action.
+        kwargs: The rendered keyword arguments of the action.
+        input_value: The value passed to the action.
+
+    Returns:
+        A hex digest identifying the call.
+    """
+    input_bytes = input_value.encode("utf-8") if isinstance(input_value, str) else repr(input_value).encode("utf-8")
+    input_hash = hashlib.sha256(input_bytes).hexdigest()
+    call = json.dumps([action, args, kwargs, input_hash], sort_keys=True, default=repr)
+    return hashlib.sha256(call.encode("utf-8")).hexdigest()
+
+
+class ActionCache:
+    """
+    An in-memory LRU cache of action results with an optional persistent store.
+
+    Args:
+        max_size: The maximum number of results to keep in memory.
+        path: The path to a SQLite database for keeping results between runs. If `None`, results are only kept
+            in memory.
+    """
+
+    def __init__(self, max_size: int = 4096, path: Optional[Path] = None):
+        self.max_size = max_size
+        self.path = path
+        self._entries: OrderedDict[str, Tuple[Any, Optional[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._connection = self._connect(path)
+
+    @staticmethod
+    def _connect(path: Path) -> sqlite3.Connection:
+        """Open the persistent store and remove expired results."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS action_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL)"
+        )
+        connection.execute("DELETE FROM action_cache WHERE expires < ?", (time.time(),))
+        return connection
+
+    def get(self, key: str) -> Any:
+        """
+        Return the cached result for a key.
+
+        Args:
+            key: The key created by [`make_key`][generate_changelog.action_cache.make_key].
+
+        Returns:
+            The cached result, or `MISSING` if it isn't cached or has expired.
+        """
+        now = time.time()
+        with self._lock:
+            if key in self._entries:
+                value, expires = self._entries[key]
+                if expires is None or expires > now:
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+
+            if self._connection is None:
+                return MISSING
+
+            row = self._connection.execute(
+                "SELECT value, expires FROM action_cache WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return MISSING
+
+            value = json.loads(row[0])
+            self._remember(key, value, row[1])
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Cache the result for a key.
+
+        Results that aren't strings, numbers, booleans or `None` aren't cached: a cached list or dict could be changed
+        by the code using it, and would come back from the persistent store as different types.
+
+        Args:
+            key: The key created by [`make_key`][generate_changelog.action_cache.make_key].
+            value: The result to cache.
+            ttl: The number of seconds the result is valid. If `None`, it doesn't expire.
+        """
+        if not isinstance(value, CACHEABLE_TYPES):
+            logger.debug(f"Not caching the {type(value).__name__} result; only scalar results are cached.")
+            return
+
+        expires = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._remember(key, value, expires)
+            if self._connection is None:
+                return
+
+            self._connection.execute(
+                "INSERT OR REPLACE INTO action_cache (key, value, expires) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires),
+            )
+
+    def _remember(self, key: str, value: Any, expires: Optional[float]) -> None:
+        """Put a result in the in-memory LRU, evicting the least recently used results if necessary."""
+        self._entries[key] = (value, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def close(self) -> None:
+        """Close the persistent store."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+_CACHE: Optional[ActionCache] = None
+"""The action cache for this run."""
+
+
+def get_action_cache() -> ActionCache:
+    """
+    Return the action cache for the current configuration, creating it if necessary.
+
+    Returns:
+        The action cache.
+    """
+    from generate_changelog.configuration import get_config
+
+    global _CACHE  # noqa: PLW0603
+    cache_path = get_config().action_cache_path
+    path = Path(cache_path).expanduser() if cache_path else None
+    if _CACHE is None or _CACHE.path != path:
+        if _CACHE is not None:
+            _CACHE.close()
+        _CACHE = ActionCache(path=path)
+    return _CACHE
+
+
+def reset_action_cache() -> None:
+    """Discard the action cache. Use in tests only."""
+    global _CACHE  # noqa: PLW0603
+    if _CACHE is not None:
+        _CACHE.close()
+    _CACHE = None
@@ -1,8 +1,13 @@
 """File reading and writing actions."""
 
+import mmap
+import os
 import re
+import shutil
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
+from typing import BinaryIO, Optional
 
 import rich_click as click
 
@@ -82,15 +87,72 @@ class IncrementalFileInsert:
         filename = Path(eval_if_callable(self.filename))
         pattern = eval_if_callable(self.last_heading_pattern)
         text = eval_if_callable(input_text)
-        existing_text = filename.read_text(encoding="utf-8") if filename.exists() else ""
 
-        match = re.search(pattern, existing_text, re.MULTILINE)
-        new_text = f"{text}\n{existing_text[match.start() :]}" if match else text
+        if not filename.exists():
+            filename.write_text(text, encoding="utf-8")
+            return input_text
 
-        filename.write_text(new_text, encoding="utf-8")
+        offset = first_match_offset(filename, pattern)
+        replace_file_head(filename, f"{text}\n" if offset is not None else text, offset)
         return input_text
 
 
+def first_match_offset(filepath: Path, pattern: str) -> Optional[int]:
+    """
+    Find the byte offset of the first match of a pattern in a file.
+
+    The file is memory-mapped and searched as bytes, so only the pages up to the match are read.
+
+    Args:
+        filepath: The file to search.
+        pattern: The regular expression to search for. It is evaluated in multi-line mode.
+
+    Returns:
+        The byte offset of the start of the match, or `None` if there isn't one.
+    """
+    with filepath.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as contents:
+            match = re.search(pattern.encode("utf-8"), contents, re.MULTILINE)
+            return match.start() if match else None
+
+
+def replace_file_head(filepath: Path, head: str, offset: Optional[int], chunk_size: int = 1024 * 1024) -> None:
+    """
+    Atomically replace everything in a file before `offset` with `head`.
+
+    The new head is written to a temporary file next to `filepath`, the remainder of the existing file is copied
+    after it in chunks, and the temporary file is renamed over the original. Readers never see a partial file.
+
+    Args:
+        filepath: The file to update. It must exist.
+        head: The text to put at the start of the file.
+        offset: The byte offset in the existing file where the kept content starts. If `None`, nothing is kept.
+        chunk_size: The number of bytes to copy at a time.
+    """
+    handle, temp_path = tempfile.mkstemp(dir=filepath.parent, prefix=f".{filepath.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as dest:
+            _write_spliced(dest, head, filepath, offset, chunk_size)
+        shutil.copymode(filepath, temp_path)
+        os.replace(temp_path, filepath)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def _write_spliced(dest: BinaryIO, head: str, filepath: Path, offset: Optional[int], chunk_size: int) -> None:
+    """Write `head` followed by the content of `filepath` from `offset` and flush it to disk."""
+    dest.write(head.encode("utf-8"))
+    if offset is not None:
+        with filepath.open("rb") as source:
+            source.seek(offset)
+            shutil.copyfileobj(source, dest, chunk_size)
+    dest.flush()
+    os.fsync(dest.fileno())
+
+
 @register_builtin
 @dataclass(frozen=True)
 class MDFormat:
@@ -99,19 +161,41 @@ class MDFormat:
     filename: StrOrCallable
     """The file name to format when called."""
 
+    last_heading_pattern: Optional[StrOrCallable] = None
+    """A regular expression to detect the last heading. When set, only content before this position is formatted."""
+
     def __call__(self, *args, **kwargs) -> StrOrCallable:
         """
         Read the text into a buffer and write it back out with `mdformat`.
 
+        If `last_heading_pattern` is set, only the text before its first match is formatted. The remaining,
+        previously formatted, content is copied unchanged.
+
         Returns:
             The formatted text
         """
         from mdformat import text as mdformat_text
 
         filename = Path(eval_if_callable(self.filename))
-        existing_text = filename.read_text(encoding="utf-8") if filename.exists() else ""
+        if not filename.exists():
+            new_text = mdformat_text("")
+            filename.write_text(new_text, encoding="utf-8")
+            return new_text
 
-        new_text = mdformat_text(existing_text)
+        pattern = eval_if_callable(self.last_heading_pattern)
+        offset = first_match_offset(filename, pattern) if pattern else None
+        with filename.open("rb") as f:
+            existing_text = f.read(offset if offset is not None else -1).decode("utf-8")
 
-        filename.write_text(new_text, encoding="utf-8")
+        new_text = mdformat_text(existing_text)
+        # Keep a blank line between the formatted text and the rest, unless nothing comes before the heading
+        replace_file_head(filename, f"{new_text}\n" if offset is not None and new_text else new_text, offset)
         return new_text
+
+
+@register_builtin
+def format_markdown(content: str) -> str:
+    """Format markdown content with `mdformat`."""
+    from mdformat import text as mdformat_text
+
+    return mdformat_text(content)
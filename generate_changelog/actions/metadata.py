@@ -1,55 +1,300 @@
 """Metadata callback and processing functions."""
 
+import os
 import re
+import subprocess
+import tempfile
 import textwrap
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from generate_changelog.actions import register_builtin
-from generate_changelog.data_merge import comprehensive_merge
+from generate_changelog.data_merge import OrderedMerger, copy_value
 
-RFC822_KEY_VALUE_PATTERN = r"(?:^|\n)(?P<key>[-\w]*)\s*:\s*(?P<value>[^\n]*(?:\n\s+[^\n]*)*)"
+TRAILER_PATTERN = re.compile(r"(?P<key>[A-Za-z0-9-]+)[ \t]*:[ \t]*(?P<value>.*)")
+"""A trailer line: a token of letters, digits and hyphens, a colon and the value."""
+
+GIT_GENERATED_PREFIXES = ("Signed-off-by: ", "(cherry picked from commit ")
+"""Lines git adds to messages. A trailer block with one of them may also contain other lines."""
+
+END_OF_MESSAGE_TRAILER = "X-Generate-Changelog-End-Of-Message"
+"""A trailer added after the trailers of each message when git parses many messages in one command."""
 BREAKING_CHANGE_PATTERN = r"(?:^|\n)BREAKING[-_ ]CHANGE\s*:\s*(?P<description>[^\n]*(?:\n\s+[^\n]*)*)"
 CONV_COMMIT_PATTERN = r"(?i)^(?P<type>[\w]+)(\((?P<scope>[\\,/\w\-]+)\))?(?P<breaking>!)?: (?P<description>.*)"
 
 
 @dataclass
 class MetadataCollector:
-    """Creates a callable to collect key-value metadata."""
+    """
+    Creates a callable to collect key-value metadata.
+
+    Values are merged into the metadata in place: scalars are replaced, lists get the new items they don't have yet
+    in the order they were saved, and dicts are merged recursively.
+    """
 
     metadata: dict = field(default_factory=dict)
 
+    _merger: OrderedMerger = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.metadata = copy_value(self.metadata)
+        self._merger = OrderedMerger(self.metadata)
+
     def __call__(self, **kwargs: dict):
         """Put keyword arguments into metadata storage."""
-        self.metadata = comprehensive_merge(self.metadata, kwargs)
+        self._merger.merge(kwargs)
+
+
+def _line_kind(line: str) -> str:
+    """Return how `git interpret-trailers` counts a line of a possible trailer block."""
+    if line.startswith("#"):
+        return "comment"
+    if line.startswith(GIT_GENERATED_PREFIXES):
+        return "git"
+    if line[:1] in (" ", "\t"):
+        return "continuation"
+    return "trailer" if TRAILER_PATTERN.match(line) else "other"
+
+
+def find_trailer_block(message: str) -> Tuple[int, List[str]]:
+    """
+    Find the trailer block at the end of a commit message body, with the rules of `git interpret-trailers`.
+
+    The last paragraph is scanned backwards, so the rest of the message is never read. It is a trailer block if
+    all its lines are trailers, or if a quarter of them are and one was added by git, like `Signed-off-by`. Indented
+    lines continue the line before them. Since the summary isn't part of the body, the first paragraph can be a
+    trailer block.
+
+    Args:
+        message: The commit message body
+
+    Returns:
+        The position where the paragraph before the trailer block ends, and the lines of the trailer block. If there
+        is no trailer block, the length of the message and no lines.
+    """
+    trailer_lines = non_trailer_lines = continuation_lines = 0
+    recognized_prefix = False
+    lines: List[str] = []
+    line_end = len(message)
+    while line_end >= 0:
+        line_start = message.rfind("\n", 0, line_end) + 1
+        line = message[line_start:line_end]
+        line_end = line_start - 1
+        if not line.strip():
+            if not lines:
+                continue
+            non_trailer_lines += continuation_lines
+            break
+        lines.append(line)
+        kind = _line_kind(line)
+        if kind == "continuation":
+            continuation_lines += 1
+            continue
+        if kind in ("trailer", "git"):
+            trailer_lines += 1
+            recognized_prefix = recognized_prefix or kind == "git"
+        elif kind == "other":
+            non_trailer_lines += 1 + continuation_lines
+        else:
+            non_trailer_lines += continuation_lines
+        continuation_lines = 0
+    else:
+        non_trailer_lines += continuation_lines
+        line_start = 0
+
+    if (trailer_lines and not non_trailer_lines) or (recognized_prefix and trailer_lines * 3 >= non_trailer_lines):
+        return line_start, lines[::-1]
+    return len(message), []
+
+
+def _end_of_paragraph_before_last(message: str) -> int:
+    """
+    Return the position where the paragraph before the last one ends, like `find_trailer_block`.
+
+    Trailing blank lines are ignored. If the message has one paragraph, it is 0.
+    """
+    line_end = len(message.rstrip())
+    while line_end > 0:
+        line_start = message.rfind("\n", 0, line_end) + 1
+        if not message[line_start:line_end].strip():
+            return line_start
+        line_end = line_start - 1
+    return 0
+
+
+def _trailer_lines(lines: Sequence[str]) -> List[str]:
+    """Return the lines of a trailer block that are parsed: the trailers and the indented lines continuing them."""
+    trailer_lines = []
+    in_trailer = False
+    for line in lines:
+        if line[:1] not in (" ", "\t"):
+            in_trailer = bool(TRAILER_PATTERN.match(line))
+        if in_trailer:
+            trailer_lines.append(line)
+    return trailer_lines
+
+
+def _normalize_trailer_line(line: str) -> str:
+    """Return a trailer line spaced the way `git interpret-trailers` prints it."""
+    match = TRAILER_PATTERN.match(line)
+    if match is None:
+        return line.rstrip()
+    return f"{match.group('key')}: {match.group('value')}".rstrip()
+
+
+def remove_trailer_lines(message: str, position: int, trailer_lines: Sequence[str]) -> str:
+    """
+    Remove the parsed trailer lines from the trailer block of a message, keeping its other lines.
+
+    The lines of the block are matched with the trailer lines in order. The spacing around the separator is ignored,
+    since git normalizes it.
+
+    Args:
+        message: The commit message body
+        position: The position where the paragraph before the trailer block ends
+        trailer_lines: The trailer lines parsed from the block
+
+    Returns:
+        The message without the trailer lines
+    """
+    remaining = [_normalize_trailer_line(line) for line in trailer_lines][::-1]
+    kept = []
+    for line in message[position:].split("\n"):
+        if remaining and _normalize_trailer_line(line) == remaining[-1]:
+            remaining.pop()
+        else:
+            kept.append(line)
+    if not any(line.strip() for line in kept):
+        return message[:position]
+    return message[:position] + "\n".join(kept)
+
+
+def parse_trailer_lines(lines: Sequence[str]) -> Dict[str, List[str]]:
+    """
+    Parse the lines of a trailer block into the values of each lower-case key.
+
+    Indented lines continue the value of the trailer before them, and are dedented. Other lines are ignored.
+
+    Args:
+        lines: The lines of the trailer block
+
+    Returns:
+        The values of each key, in order
+    """
+    trailers = defaultdict(list)
+    key = None
+    value_lines: List[str] = []
+    for line in [*lines, ""]:
+        if key and line[:1] in (" ", "\t"):
+            value_lines.append(line)
+            continue
+        if key:
+            # Convert a multiline value to a first line and a dedented rest.
+            value = value_lines[0]
+            if len(value_lines) > 1:
+                value += "\n" + textwrap.dedent("\n".join(value_lines[1:]))
+            trailers[key].append(value)
+        match = TRAILER_PATTERN.match(line)
+        key = match.group("key").lower() if match else None
+        value_lines = [match.group("value").rstrip()] if match else []
+    return trailers
+
+
+def git_trailer_blocks(messages: Sequence[str]) -> List[List[str]]:
+    """
+    Find the trailers of commit message bodies with one `git interpret-trailers` command.
+
+    The messages are written to a temporary directory and parsed without the user's git configuration.
+
+    Args:
+        messages: The commit message bodies
+
+    Returns:
+        The trailer lines of each message, in order
+
+    Raises:
+        GitCommandError: If git fails.
+    """
+    from git import GitCommandError
+
+    if not messages:
+        return []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for index, message in enumerate(messages):
+            with open(os.path.join(tmp_dir, str(index)), "w", encoding="utf-8") as f:
+                # git treats the first paragraph as the summary
+                f.write(f"Summary\n\n{message}\n")
+        command = [
+            "git",
+            "interpret-trailers",
+            "--only-trailers",
+            "--no-divider",
+            "--where=end",
+            "--if-exists=add",
+            f"--trailer={END_OF_MESSAGE_TRAILER}: end",
+            *map(str, range(len(messages))),
+        ]
+        env = {**os.environ, "GIT_CONFIG_NOSYSTEM": "1", "GIT_CONFIG_GLOBAL": os.devnull}
+        result = subprocess.run(  # noqa: S603
+            command, cwd=tmp_dir, env=env, capture_output=True, encoding="utf-8", errors="replace", check=False
+        )
+    blocks: List[List[str]] = [[]]
+    for line in result.stdout.splitlines():
+        if line.startswith(f"{END_OF_MESSAGE_TRAILER}:"):
+            blocks.append([])
+        else:
+            blocks[-1].append(line)
+    if result.returncode != 0 or len(blocks) != len(messages) + 1:
+        raise GitCommandError(command, result.returncode, result.stderr)
+    return blocks[:-1]
 
 
 @register_builtin
 class ParseTrailers:
-    """Parse and extract trailers from a commit message."""
+    """
+    Parse and extract trailers from a commit message.
 
-    def __init__(self, commit_metadata: Callable):
+    Only the trailer block at the end of the message is parsed, found with the rules of `git interpret-trailers`.
+    The message is returned without the parsed trailer lines. Other lines of the trailer block, such as a
+    `BREAKING CHANGE: ...` footer next to a `Signed-off-by` trailer, are kept for later actions.
+
+    Args:
+        commit_metadata: The callable that saves the trailers to the commit metadata
+        use_git: Let `git interpret-trailers` find the trailers, so git's parsing is followed exactly. A batch of
+            messages is parsed with one git command.
+    """
+
+    def __init__(self, commit_metadata: Callable, use_git: bool = False):
         self.commit_metadata = commit_metadata
+        self.use_git = use_git
 
     def __call__(self, message: str) -> str:
         """Parse and extract trailers from a commit message."""
-        pos = len(message)
-        trailers = defaultdict(list)
-        for match in re.finditer(RFC822_KEY_VALUE_PATTERN, message, re.MULTILINE | re.IGNORECASE):
-            pos = min(pos, match.start())
-            dct = match.groupdict()
-            key = dct["key"].lower()
-            value = dct["value"]
-
-            # Convert a multiline description to a single line.
-            if "\n" in value:
-                first_line, remaining = value.split("\n", 1)
-                value = f"{first_line}\n{textwrap.dedent(remaining)}"
-
-            trailers[key].append(value)
-        self.commit_metadata(trailers=trailers)
-        return message[:pos]
+        return self.__call_batch__([message])[0]
+
+    def __call_batch__(  # noqa: PLW3201
+        self, messages: List[str], commit_metadata_funcs: Optional[Sequence[Callable]] = None
+    ) -> List[str]:
+        """Parse and extract the trailers of many commit messages, saving each message's trailers with its callable."""
+        if self.use_git:
+            # git only finds trailers in the last paragraph
+            trailer_lines = git_trailer_blocks(messages)
+            positions = [
+                _end_of_paragraph_before_last(message) if lines else len(message)
+                for message, lines in zip(messages, trailer_lines)
+            ]
+        else:
+            blocks = [find_trailer_block(message) for message in messages]
+            trailer_lines = [_trailer_lines(lines) for _, lines in blocks]
+            positions = [position for position, _ in blocks]
+        commit_metadata_funcs = commit_metadata_funcs or [self.commit_metadata] * len(messages)
+        for commit_metadata, lines in zip(commit_metadata_funcs, trailer_lines):
+            commit_metadata(trailers=parse_trailer_lines(lines))
+        return [
+            remove_trailer_lines(message, position, lines)
+            for message, position, lines in zip(messages, positions, trailer_lines)
+        ]
 
 
 @register_builtin
@@ -1,16 +1,162 @@
 """Shell commands for processing."""
 
+import atexit
 import os
+import shutil
 import subprocess
 import tempfile
-from typing import Optional
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 from generate_changelog.actions import register_builtin
 
+WORKER_PROGRAM = r"""
+__gc_script=
+while IFS= read -r __gc_line; do
+  if [[ $__gc_line == "$3" ]]; then
+    ( eval "unset __gc_line __gc_script; set -eo pipefail --"$'\n'"$__gc_script" ) >"$1" 2>"$2" </dev/null
+    printf '%d\n' "$?"
+    __gc_script=
+  else
+    __gc_script+="$__gc_line"$'\n'
+  fi
+done
+"""
+"""The bash program run by a [`BashWorker`][generate_changelog.actions.shell.BashWorker].
+
+Each request is the script's lines followed by a delimiter line. The script runs in a subshell with
+`-eo pipefail` and without the worker's variables, so nothing it changes survives to the next request. Its stdout
+and stderr go to files, and the exit status is written back as a single line.
+"""
+
+
+class BashWorker:
+    """
+    A long-lived bash process that runs scripts sent to it, one at a time.
+
+    Starting bash for every script means a fork and exec per call. A worker pays that once and runs each script
+    in a forked subshell instead.
+
+    Args:
+        environment: The environment variables for the bash process. If `None`, the current environment is used.
+    """
+
+    def __init__(self, environment: Optional[dict] = None):
+        self._lock = threading.Lock()
+        self._output_dir = tempfile.mkdtemp(prefix="generate-changelog-bash-")
+        self._stdout_path = Path(self._output_dir, "stdout")
+        self._stderr_path = Path(self._output_dir, "stderr")
+        self.delimiter = f"__generate_changelog_end_{uuid.uuid4().hex}__"
+        self.command = ["bash", "--noprofile", "--norc", "-c", WORKER_PROGRAM]
+        self._process = subprocess.Popen(  # NOQA: S603
+            [*self.command, "bash", str(self._stdout_path), str(self._stderr_path), self.delimiter],
+            env=environment,
+            encoding="utf-8",
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    @property
+    def is_running(self) -> bool:
+        """Is the bash process still running?"""
+        return self._process.poll() is None
+
+    def run(self, script: str) -> subprocess.CompletedProcess:
+        """
+        Run a script in the worker.
+
+        Args:
+            script: The bash script to run.
+
+        Returns:
+            The exit status, stdout and stderr of the script.
+
+        Raises:
+            ValueError: If the script contains the worker's request delimiter.
+            RuntimeError: If the worker process is no longer running.
+        """
+        if self.delimiter in script:
+            raise ValueError("The script contains the bash worker's request delimiter.")
+
+        payload = script if script.endswith("\n") else f"{script}\n"
+        with self._lock:
+            if not self.is_running:
+                raise RuntimeError(f"The bash worker exited with status {self._process.returncode}.")
+            self._process.stdin.write(f"{payload}{self.delimiter}\n")
+            self._process.stdin.flush()
+            status = self._process.stdout.readline()
+            if not status:
+                raise RuntimeError("The bash worker exited before returning a result.")
+            stdout = self._stdout_path.read_text(encoding="utf-8")
+            stderr = self._stderr_path.read_text(encoding="utf-8")
+
+        return subprocess.CompletedProcess(self.command, int(status), stdout, stderr)
+
+    def close(self) -> None:
+        """Stop the bash process and remove its output files."""
+        if self.is_running:
+            self._process.stdin.close()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+        self._process.stdout.close()
+        shutil.rmtree(self._output_dir, ignore_errors=True)
+
+
+_WORKERS: Dict[Optional[Tuple[Tuple[str, str], ...]], BashWorker] = {}
+"""The running bash workers, keyed by their environment."""
+
+
+def get_bash_worker(environment: Optional[dict] = None) -> BashWorker:
+    """
+    Return the bash worker for an environment, starting it if necessary.
+
+    Args:
+        environment: The environment variables for the bash process. If `None`, the current environment is used.
+
+    Returns:
+        The running worker.
+    """
+    key = tuple(sorted(environment.items())) if environment is not None else None
+    worker = _WORKERS.get(key)
+    if worker is None or not worker.is_running:
+        worker = _WORKERS[key] = BashWorker(environment)
+    return worker
+
+
+@atexit.register
+def close_bash_workers() -> None:
+    """Stop all the running bash workers."""
+    for worker in _WORKERS.values():
+        worker.close()
+    _WORKERS.clear()
+
 
 @register_builtin
-def bash(script: str, environment: Optional[dict] = None) -> str:
-    """Runs command-line programs using the bash's shell."""
+def bash(script: str, environment: Optional[dict] = None, persistent: bool = False) -> str:
+    """
+    Runs command-line programs using the bash's shell.
+
+    Args:
+        script: The bash script to run.
+        environment: The environment variables for the script. If `None`, the current environment is used.
+        persistent: Run the script in a long-lived bash process that is reused by later calls.
+
+    Returns:
+        The script's stdout.
+
+    Raises:
+        CalledProcessError: If the script exits with a non-zero status.
+    """
+    if persistent:
+        result = get_bash_worker(environment).run(script)
+        result.check_returncode()
+        return result.stdout
+
     handle, script_path = tempfile.mkstemp(suffix=".sh")
     try:
         with os.fdopen(handle, "w") as f:
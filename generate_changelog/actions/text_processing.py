@@ -3,7 +3,7 @@
 import re
 import textwrap
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 
 from generate_changelog.actions import register_builtin
 from generate_changelog.configuration import IntOrCallable, StrOrCallable
@@ -23,6 +23,11 @@ class SetDefault:
         text = eval_if_callable(input_text)
         return text or default
 
+    def __call_batch__(self, input_texts: List[StrOrCallable]) -> List[str]:  # noqa: PLW3201
+        """Return the default value for each empty value, evaluating the default once."""
+        default = eval_if_callable(self.default)
+        return [eval_if_callable(input_text) or default for input_text in input_texts]
+
 
 @register_builtin
 @dataclass(frozen=True)
@@ -38,6 +43,11 @@ class PrefixString:
         prefix = eval_if_callable(self.prefix) or ""
         return f"{prefix}{text}"
 
+    def __call_batch__(self, input_texts: List[StrOrCallable]) -> List[str]:  # noqa: PLW3201
+        """Prefix each input text, evaluating the prefix once."""
+        prefix = eval_if_callable(self.prefix) or ""
+        return [f"{prefix}{eval_if_callable(input_text) or ''}" for input_text in input_texts]
+
 
 @register_builtin
 @dataclass(frozen=True)
@@ -54,6 +64,11 @@ class AppendString:
 
         return f"{text}{postfix}"
 
+    def __call_batch__(self, input_texts: List[StrOrCallable]) -> List[str]:  # noqa: PLW3201
+        """Append a string to each input text, evaluating the string once."""
+        postfix = eval_if_callable(self.postfix) or ""
+        return [f"{eval_if_callable(input_text) or ''}{postfix}" for input_text in input_texts]
+
 
 @register_builtin
 @dataclass(frozen=True)
@@ -69,6 +84,11 @@ class Strip:
 
         return text.strip(chars)
 
+    def __call_batch__(self, input_texts: List[StrOrCallable]) -> List[str]:  # noqa: PLW3201
+        """Strip characters from the ends of each input, evaluating the characters once."""
+        chars = eval_if_callable(self.chars) or " "
+        return [(eval_if_callable(input_text) or "").strip(chars) for input_text in input_texts]
+
 
 @register_builtin
 @dataclass(frozen=True)
@@ -100,6 +120,10 @@ class RegExCommand:
         ]
         return reduce(lambda x, y: x | y, [value for use, value in flags if use], re.RegexFlag(0))
 
+    def compile(self) -> re.Pattern:
+        """Compile the pattern with the flags."""
+        return re.compile(eval_if_callable(self.pattern), self.flags)
+
 
 @register_builtin
 @dataclass(frozen=True)
@@ -114,9 +138,16 @@ class FirstRegExMatch(RegExCommand):
 
     def __call__(self, input_text: StrOrCallable) -> str:
         """Search the input_text for the predefined pattern and return it."""
-        text = eval_if_callable(input_text)
-        pattern = eval_if_callable(self.pattern)
-        match = re.search(pattern, text, self.flags)
+        return self._first_match(self.compile(), eval_if_callable(input_text))
+
+    def __call_batch__(self, input_texts: List[StrOrCallable]) -> List[str]:  # noqa: PLW3201
+        """Return the first match in each input text, compiling the pattern once."""
+        pattern = self.compile()
+        return [self._first_match(pattern, eval_if_callable(input_text)) for input_text in input_texts]
+
+    def _first_match(self, pattern: re.Pattern, text: str) -> str:
+        """Return the first match of a compiled pattern in the text."""
+        match = pattern.search(text)
         if match is None:
             return eval_if_callable(self.default_value)
 
@@ -139,6 +170,12 @@ class FirstRegExMatchPosition(RegExCommand):
         match = re.search(pattern, text, self.flags)
         return match.start() if match else 0
 
+    def __call_batch__(self, input_texts: List[StrOrCallable]) -> List[int]:  # noqa: PLW3201
+        """Return the position of the first match in each input text, compiling the pattern once."""
+        pattern = self.compile()
+        matches = [pattern.search(eval_if_callable(input_text)) for input_text in input_texts]
+        return [match.start() if match else 0 for match in matches]
+
 
 @register_builtin
 @dataclass(frozen=True)
@@ -152,10 +189,19 @@ class RegexSub(RegExCommand):
         """Do the substitution on the input_text."""
         text = eval_if_callable(input_text)
         pattern = eval_if_callable(self.pattern)
-        replacement = eval_if_callable(self.replacement)
-        replacement = re.sub(r"\\([\d+])", r"\\g<\1>", replacement)  # Replace back-references of type '\1' to '\g<1>'
 
-        return re.sub(pattern, replacement, text, flags=self.flags)
+        return re.sub(pattern, self._replacement(), text, flags=self.flags)
+
+    def __call_batch__(self, input_texts: List[StrOrCallable]) -> List[str]:  # noqa: PLW3201
+        """Do the substitution on each input text, compiling the pattern and replacement once."""
+        pattern = self.compile()
+        replacement = self._replacement()
+        return [pattern.sub(replacement, eval_if_callable(input_text)) for input_text in input_texts]
+
+    def _replacement(self) -> str:
+        r"""The replacement string, with back-references like `\1` changed to `\g<1>`."""
+        replacement = eval_if_callable(self.replacement)
+        return re.sub(r"\\([\d+])", r"\\g<\1>", replacement)
 
 
 @register_builtin
@@ -0,0 +1,220 @@
+"""
+Generate the changelogs of many repositories concurrently.
+
+`generate-changelog batch <manifest>` reads a manifest of repositories and processes them in a pool of worker
+processes. Each worker imports the modules, loads the built-in actions, and builds the base configuration and its
+pipelines once, and keeps its per-process caches, such as parsed configuration files, between the repositories it
+processes.
+
+Each repository is processed independently: an error in one is reported in its result and doesn't stop the others.
+"""
+
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import rich_click as click
+
+if TYPE_CHECKING:
+    from generate_changelog.configuration import Configuration
+
+_WORKER_CONFIG: Optional[Tuple[Optional[str], "Configuration"]] = None
+"""The base configuration file of this worker and the configuration built from it."""
+
+
+def read_manifest(manifest_path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """
+    Read the repositories to process from a YAML or JSON manifest.
+
+    The manifest is a list. Each item is either the path to a repository, or a mapping with a `path` and optional
+    `config`, `overrides`, `starting_tag` and `branch` keys. Relative paths are relative to the manifest.
+
+    Args:
+        manifest_path: The path to the manifest file.
+
+    Returns:
+        A mapping for each repository, with absolute paths.
+
+    Raises:
+        click.UsageError: If the manifest isn't a list, or an item doesn't have a path.
+    """
+    from generate_changelog.configuration import get_yaml
+
+    manifest_path = Path(manifest_path)
+    items = get_yaml().load(manifest_path.read_text(encoding="utf-8"))
+    if not isinstance(items, list):
+        raise click.UsageError(f"The manifest '{manifest_path}' must be a list of repositories.")
+
+    base_dir = manifest_path.resolve().parent
+    entries = []
+    for item in items:
+        entry = {"path": item} if isinstance(item, str) else dict(item)
+        if not entry.get("path"):
+            raise click.UsageError(f"Each repository in the manifest '{manifest_path}' needs a `path`.")
+
+        entry["path"] = str(base_dir / Path(entry["path"]).expanduser())
+        if entry.get("config"):
+            entry["config"] = str(base_dir / Path(entry["config"]).expanduser())
+        entries.append(entry)
+    return entries
+
+
+def init_worker(verbosity: int = 0, base_config: Optional[str] = None) -> None:
+    """
+    Prepare a worker process.
+
+    It sets up logging, imports the modules, loads the built-in actions, and builds the base configuration and the
+    actions of its pipelines.
+
+    Args:
+        verbosity: The level of verbose logging output.
+        base_config: The path to a configuration file shared by all repositories.
+    """
+    from generate_changelog import commits, git_ops, monorepo, release_hint, runner, templating  # noqa: F401
+    from generate_changelog.actions import BUILT_INS
+    from generate_changelog.indented_logger import setup_logging
+    from generate_changelog.pipeline import enable_pipeline_cache
+
+    setup_logging(verbosity)
+    BUILT_INS.load_builtins()
+    enable_pipeline_cache()
+    _worker_config(base_config)
+
+
+def _worker_config(base_config: Optional[str]) -> "Configuration":
+    """
+    Return the default configuration updated with the base configuration file, building it on first use.
+
+    Building it also creates the actions of its pipelines, which the pipeline cache keeps for the repositories that
+    don't change them.
+    """
+    global _WORKER_CONFIG  # noqa: PLW0603
+    from generate_changelog.configuration import get_default_config
+    from generate_changelog.pipeline import pipeline_factory
+
+    if _WORKER_CONFIG is None or _WORKER_CONFIG[0] != base_config:
+        configuration = get_default_config()
+        if base_config:
+            configuration.update_from_file(Path(base_config))
+        for action_list in (
+            configuration.summary_pipeline,
+            configuration.body_pipeline,
+            configuration.starting_tag_pipeline,
+            configuration.output_pipeline,
+        ):
+            pipeline_factory(action_list)
+        _WORKER_CONFIG = (base_config, configuration)
+    return _WORKER_CONFIG[1]
+
+
+def _empty_result(path: str) -> Dict[str, Any]:
+    """Return the result of a repository before anything is generated."""
+    return {"path": path, "release_hint": None, "notes": None, "starting_tag": None, "timings": {}, "error": None}
+
+
+def process_repository(
+    entry: Dict[str, Any], base_config: Optional[str] = None, run_output_pipeline: bool = True
+) -> Dict[str, Any]:
+    """
+    Generate the changelog and release hint of one repository.
+
+    The configuration is a copy of the worker's base configuration: the default configuration updated with the base
+    configuration file. It is updated with the repository's configuration file and the entry's `overrides`. The
+    output pipeline runs in the repository's directory.
+
+    Args:
+        entry: The manifest entry of the repository.
+        base_config: The path to a configuration file shared by all repositories.
+        run_output_pipeline: Run the output pipeline with the rendered changelog.
+
+    Returns:
+        The result with the `path`, `release_hint`, `notes`, `starting_tag`, `timings` and `error` of the repository.
+    """
+    started = time.perf_counter()
+    result = _empty_result(entry["path"])
+    original_cwd = os.getcwd()
+    try:
+        os.chdir(entry["path"])
+        _generate(entry, base_config, run_output_pipeline, result)
+    except Exception as e:  # noqa: BLE001
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        os.chdir(original_cwd)
+        result["timings"]["total"] = round(time.perf_counter() - started, 6)
+    return result
+
+
+def _generate(entry: Dict[str, Any], base_config: Optional[str], run_output_pipeline: bool, result: dict) -> None:
+    """Generate the changelog of a repository from the current directory and record it in `result`."""
+    from generate_changelog.configuration import DEFAULT_CONFIG_FILE_NAMES, reset_config
+    from generate_changelog.git_ops import current_branch_name, open_repo
+    from generate_changelog.monorepo import generate_project_changelogs
+    from generate_changelog.runner import run_changelog
+
+    started = time.perf_counter()
+    configuration = reset_config(_worker_config(base_config))
+    repo_config = entry.get("config") or next(
+        (name for name in DEFAULT_CONFIG_FILE_NAMES if Path(name).exists()), None
+    )
+    if repo_config:
+        configuration.update_from_file(Path(repo_config))
+    configuration.update_from_dict(entry.get("overrides") or {})
+
+    repository = open_repo(entry["path"])
+    branch_name = entry.get("branch") or current_branch_name(repository)
+    result["timings"]["setup"] = round(time.perf_counter() - started, 6)
+
+    started = time.perf_counter()
+    if configuration.projects:
+        changelogs = generate_project_changelogs(repository, configuration, branch_name, run_output_pipeline)
+        result["projects"] = {
+            changelog.name: {
+                "release_hint": changelog.release_hint,
+                "notes": changelog.rendered.notes or changelog.rendered.full,
+            }
+            for changelog in changelogs
+        }
+    else:
+        changelog = run_changelog(
+            repository, configuration, branch_name, entry.get("starting_tag"), run_output_pipeline
+        )
+        result["release_hint"] = changelog.release_hint
+        result["notes"] = changelog.rendered.notes or changelog.rendered.full
+        result["starting_tag"] = changelog.starting_tag
+    result["timings"]["generate"] = round(time.perf_counter() - started, 6)
+
+
+def run_batch(
+    entries: List[Dict[str, Any]],
+    jobs: Optional[int] = None,
+    base_config: Optional[str] = None,
+    run_output_pipeline: bool = True,
+    verbosity: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Process repositories in a pool of worker processes.
+
+    Args:
+        entries: The manifest entries of the repositories.
+        jobs: The number of worker processes. Defaults to the number of CPUs.
+        base_config: The path to a configuration file shared by all repositories.
+        run_output_pipeline: Run each repository's output pipeline with its rendered changelog.
+        verbosity: The level of verbose logging output of the workers.
+
+    Yields:
+        The result of each repository, in the order they finish.
+    """
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(verbosity, base_config)) as executor:
+        futures: Dict[Future, Dict[str, Any]] = {
+            executor.submit(process_repository, entry, base_config, run_output_pipeline): entry for entry in entries
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:  # noqa: BLE001, PERF203
+                # The worker process died, so the repository has no result of its own
+                result = _empty_result(futures[future]["path"])
+                result["error"] = f"{type(e).__name__}: {e}"
+                yield result
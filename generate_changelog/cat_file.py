@@ -0,0 +1,176 @@
+"""
+Read git objects through long-lived `git cat-file` processes.
+
+A [`CatFile`][generate_changelog.cat_file.CatFile] keeps one `git cat-file --batch` and one `--batch-check` process
+open for a repository. Requests are pipelined: a chunk of object names is written before any response is read, so
+reading many objects costs a few pipe round trips instead of a process or a round trip per object.
+
+The processes are pooled by repository with [`get_cat_file`][generate_changelog.cat_file.get_cat_file] and stay open
+until [`close_cat_files`][generate_changelog.cat_file.close_cat_files] is called or the program exits.
+"""
+
+import atexit
+import contextlib
+import subprocess
+import threading
+from dataclasses import dataclass
+from typing import IO, Dict, List, Optional, Sequence
+
+from git import GitCommandError
+
+PIPELINE_DEPTH = 256
+"""The number of requests written before reading their responses. Their names must fit in the pipe's buffer."""
+
+
+@dataclass(frozen=True)
+class GitObject:
+    """An object read from the repository."""
+
+    sha: str
+    """The full hex SHA of the object."""
+
+    type: str
+    """The object type: `commit`, `tag`, `tree`, or `blob`."""
+
+    size: int
+    """The size of the object's content in bytes."""
+
+    content: Optional[bytes] = None
+    """The raw content of the object, or `None` if only its header was read."""
+
+
+class CatFile:
+    """
+    Long-lived `git cat-file` processes for one repository.
+
+    The processes start on first use. The object is thread-safe; concurrent requests are served one at a time.
+
+    Args:
+        git_dir: The path to the repository's git directory.
+    """
+
+    def __init__(self, git_dir: str):
+        self.git_dir = git_dir
+        self._processes: Dict[str, subprocess.Popen] = {}
+        self._lock = threading.Lock()
+
+    def _process(self, mode: str) -> subprocess.Popen:
+        """Return the running process for a mode, starting it if needed."""
+        process = self._processes.get(mode)
+        if process is None or process.poll() is not None:
+            command = ["git", f"--git-dir={self.git_dir}", "cat-file", mode]
+            process = subprocess.Popen(  # noqa: S603
+                command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+            self._processes[mode] = process
+        return process
+
+    def _request(self, mode: str, revs: Sequence[str]) -> List[Optional[GitObject]]:
+        """Send pipelined requests to a process and parse the responses."""
+        with self._lock:
+            process = self._process(mode)
+            stdin: IO[bytes] = process.stdin  # type: ignore[assignment]
+            stdout: IO[bytes] = process.stdout  # type: ignore[assignment]
+            results: List[Optional[GitObject]] = []
+            try:
+                for start in range(0, len(revs), PIPELINE_DEPTH):
+                    chunk = revs[start : start + PIPELINE_DEPTH]
+                    stdin.write("".join(f"{rev}\n" for rev in chunk).encode("utf-8"))
+                    stdin.flush()
+                    results.extend(_read_response(stdout, with_content=mode == "--batch") for _ in chunk)
+            except (OSError, ValueError) as e:
+                self._close_process(mode)
+                raise GitCommandError(process.args, process.poll() or 1, str(e)) from e
+            return results
+
+    def read(self, revs: Sequence[str]) -> List[Optional[GitObject]]:
+        """
+        Read the headers and content of objects.
+
+        Args:
+            revs: The SHAs or other revisions of the objects.
+
+        Returns:
+            The object for each revision, in the same order, or `None` for revisions that don't exist.
+        """
+        return self._request("--batch", revs)
+
+    def check(self, revs: Sequence[str]) -> List[Optional[GitObject]]:
+        """
+        Read the headers of objects without their content.
+
+        Args:
+            revs: The SHAs or other revisions of the objects.
+
+        Returns:
+            The object for each revision, in the same order, or `None` for revisions that don't exist.
+        """
+        return self._request("--batch-check", revs)
+
+    def _close_process(self, mode: str) -> None:
+        """Stop the process of a mode."""
+        process = self._processes.pop(mode, None)
+        if process is None:
+            return
+        if process.stdin:
+            # If the process already exited, the buffered requests can't be flushed
+            with contextlib.suppress(OSError):
+                process.stdin.close()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        if process.stdout:
+            process.stdout.close()
+
+    def close(self) -> None:
+        """Stop the processes."""
+        with self._lock:
+            for mode in list(self._processes):
+                self._close_process(mode)
+
+
+def _read_response(stdout: IO[bytes], with_content: bool) -> Optional[GitObject]:
+    """Read the response to one request."""
+    header = stdout.readline()
+    if not header:
+        raise ValueError("git cat-file exited unexpectedly")
+    fields = header.decode("utf-8").split()
+    if len(fields) != 3:  # `<rev> missing` or `<rev> ambiguous`
+        return None
+
+    sha, object_type, size = fields[0], fields[1], int(fields[2])
+    if not with_content:
+        return GitObject(sha, object_type, size)
+    content = stdout.read(size)
+    stdout.read(1)  # The newline after the content
+    return GitObject(sha, object_type, size, content)
+
+
+_CAT_FILES: Dict[str, CatFile] = {}
+"""The open `cat-file` processes by git directory."""
+
+
+def get_cat_file(git_dir: str) -> CatFile:
+    """
+    Return the pooled `cat-file` processes of a repository.
+
+    Args:
+        git_dir: The path to the repository's git directory.
+
+    Returns:
+        The shared `CatFile` for the repository.
+    """
+    cat_file = _CAT_FILES.get(git_dir)
+    if cat_file is None:
+        cat_file = _CAT_FILES.setdefault(git_dir, CatFile(git_dir))
+    return cat_file
+
+
+@atexit.register
+def close_cat_files() -> None:
+    """Stop all the pooled `cat-file` processes."""
+    while _CAT_FILES:
+        _, cat_file = _CAT_FILES.popitem()
+        cat_file.close()
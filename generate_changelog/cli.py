@@ -1,25 +1,32 @@
-"""Command line interface for generate_changelog."""
+"""
+Command line interface for generate_changelog.
+
+Only `rich_click` is imported when this module loads. Everything else, such as GitPython, Jinja and
+`ruamel.yaml`, is imported by the code paths that need it, so `--version` and `--help` stay fast.
+"""
 
 import functools
-import json
 from pathlib import Path
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Callable, List, Optional
 
 import rich_click as click
 from click.core import Context, Parameter
-from git import Repo
 
 from generate_changelog import __version__
-from generate_changelog.commits import get_context_from_tags
-from generate_changelog.configuration import DEFAULT_CONFIG_FILE_NAMES, Configuration, write_default_config
-from generate_changelog.indented_logger import get_indented_logger, setup_logging
-from generate_changelog.release_hint import suggest_release_type
+
+if TYPE_CHECKING:
+    from generate_changelog.configuration import Configuration
+    from generate_changelog.monorepo import ProjectChangelog
+    from generate_changelog.templating import RenderedChangelog
 
 
 def generate_config_callback(ctx: Context, param: Parameter, value: bool) -> None:
     """Generate a default configuration file."""
     if not value:  # pragma: no cover
         return
+
+    from generate_changelog.configuration import DEFAULT_CONFIG_FILE_NAMES, write_default_config
+
     f = Path.cwd() / Path(DEFAULT_CONFIG_FILE_NAMES[0])
     file_path = f.expanduser().resolve()
     if file_path.exists():
@@ -32,7 +39,40 @@ def generate_config_callback(ctx: Context, param: Parameter, value: bool) -> Non
     ctx.exit()
 
 
-@click.command(
+class DefaultCommandGroup(click.RichGroup):
+    """A command group that runs its default command when the arguments don't start with a sub-command."""
+
+    default_command_name = "generate"
+    """The name of the command to run when no sub-command is given."""
+
+    def parse_args(self, ctx: Context, args: List[str]) -> List[str]:
+        """
+        Insert the default command name unless the arguments start with a sub-command or a group option.
+
+        The help options are left out of the group options, so `--help` without a sub-command shows the
+        options of the default command.
+        """
+        group_options = {opt for param in self.get_params(ctx) for opt in param.opts + param.secondary_opts}
+        group_options.difference_update(ctx.help_option_names)
+        if not args or (args[0] not in self.commands and args[0] not in group_options):
+            args.insert(0, self.default_command_name)
+        return super().parse_args(ctx, args)
+
+
+@click.group(
+    cls=DefaultCommandGroup,
+    context_settings={
+        "help_option_names": ["-h", "--help"],
+    },
+    add_help_option=True,
+)
+@click.version_option(version=__version__)
+def cli() -> None:
+    """Generate a change log from git commits. Runs the `generate` command when no command is given."""
+    pass
+
+
+@cli.command(
     context_settings={
         "help_option_names": ["-h", "--help"],
     },
@@ -55,6 +95,9 @@ def generate_config_callback(ctx: Context, param: Parameter, value: bool) -> Non
 )
 @click.option("--repo-path", "-r", help="Path to the repository, if not within the current directory")
 @click.option("--starting-tag", "-t", help="Tag to generate a changelog from.")
+@click.option("--since", help="Only include commits more recent than this date, like `90 days ago`.")
+@click.option("--until", help="Only include commits older than this date.")
+@click.option("--max-commits", type=click.IntRange(min=1), help="Only include this many of the most recent commits.")
 @click.option("--output", "-o", type=click.Choice(["release-hint", "notes", "all"]), help="What output to generate.")
 @click.option("--skip-output-pipeline", is_flag=True, help="Do not execute the output pipeline in the configuration.")
 @click.option("--branch-override", "-b", help="Override the current branch for release hint decisions.")
@@ -66,21 +109,55 @@ def generate_config_callback(ctx: Context, param: Parameter, value: bool) -> Non
     help="Output a debug report to a file.",
     envvar="CHANGELOG_REPORT_FILE",
 )
+@click.option(
+    "--profile",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    help="Write the time spent in each stage to a JSON file, and add it to the debug report.",
+)
+@click.option(
+    "--cprofile",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    help="Run with cProfile and save the statistics to a `.prof` file.",
+)
+@click.option(
+    "--trace",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    help="Append an OpenTelemetry-style span for each action run to a file of JSON lines.",
+)
 @click.option("--verbose", "-v", count=True, help="Increase verbosity.")
-@click.version_option(version=__version__)
-def cli(
+@click.option(
+    "--server",
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    help="Send the request to a `generate-changelog serve` process listening on this socket.",
+    envvar="CHANGELOG_SERVER_SOCKET",
+)
+def generate(
     config: Optional[Path],
     repo_path: Optional[Path],
     starting_tag: Optional[str],
+    since: Optional[str],
+    until: Optional[str],
+    max_commits: Optional[int],
     output: Optional[str],
     skip_output_pipeline: bool,
     branch_override: Optional[str],
     debug_report: Optional[Path],
+    profile: Optional[Path],
+    cprofile: Optional[Path],
+    trace: Optional[Path],
     verbose: int,
+    server: Optional[Path],
 ) -> None:
     """Generate a change log from git commits."""
-    from generate_changelog import templating
-    from generate_changelog.pipeline import pipeline_factory
+    if server:
+        forward_to_server(server)
+        return
+
+    from generate_changelog.git_ops import cached_history_index, current_branch_name, open_repo
+    from generate_changelog.indented_logger import get_indented_logger, setup_logging
+    from generate_changelog.pipeline_hooks import trace_to_file
+    from generate_changelog.profiling import profile_run
+    from generate_changelog.runner import run_changelog
 
     echo_func = functools.partial(echo, quiet=bool(output))
     configuration = get_user_config(config, echo_func)
@@ -88,37 +165,50 @@ def cli(
         configuration.verbosity = verbose
     if debug_report:
         configuration.report_path = debug_report
+    for option, value in {"since": since, "until": until, "max_commits": max_commits}.items():
+        if value:
+            setattr(configuration, option, value)
 
     setup_logging(configuration.verbosity)
     logger = get_indented_logger(__name__)
 
-    repository = Repo(repo_path) if repo_path else Repo(search_parent_directories=True)
+    with profile_run(profile, configuration.report_path, cprofile), trace_to_file(trace):
+        repository = open_repo(repo_path)
+        branch_name = branch_override or current_branch_name(repository)
 
-    current_branch = repository.head if repository.head.is_detached else repository.active_branch
+        if configuration.projects:
+            from generate_changelog.monorepo import generate_project_changelogs
 
-    # get starting tag based on configuration if not passed in
-    if not starting_tag and configuration.starting_tag_pipeline:
-        start_tag_pipeline = pipeline_factory(configuration.starting_tag_pipeline, **configuration.variables)
-        starting_tag = start_tag_pipeline.run()
+            if starting_tag:
+                logger.warning("The starting tag is ignored when projects are configured.")
+            changelogs = generate_project_changelogs(repository, configuration, branch_name, not skip_output_pipeline)
+            echo_projects_output(output, changelogs)
+            return
 
-    if not starting_tag:
-        logger.info("No starting tag found. Generating entire change log.")
-    else:
-        logger.info(f"Generating change log from tag: '{starting_tag}'.")
+        if not skip_output_pipeline:
+            echo_func("Executing output pipeline.")
+        result = run_changelog(
+            repository,
+            configuration,
+            branch_name,
+            starting_tag,
+            not skip_output_pipeline,
+            history=cached_history_index(repository, configuration),
+        )
 
-    version_contexts = get_context_from_tags(repository, configuration, starting_tag)
+    echo_output(output, result.release_hint, result.rendered)
 
-    branch_name = branch_override or current_branch.name
-    release_hint = suggest_release_type(branch_name, version_contexts, configuration)
 
-    # use the output pipeline to deal with the rendered change log.
-    has_starting_tag = bool(starting_tag)
-    rendered_chglog = templating.render_changelog(version_contexts, configuration, has_starting_tag)
+def echo_output(output: Optional[str], release_hint: str, rendered_chglog: "RenderedChangelog") -> None:
+    """
+    Display the requested output.
 
-    if not skip_output_pipeline:
-        echo_func("Executing output pipeline.")
-        output_pipeline = pipeline_factory(configuration.output_pipeline, **configuration.variables)
-        output_pipeline.run(rendered_chglog.full)
+    Args:
+        output: The kind of output requested: `release-hint`, `notes`, `all` or `None`.
+        release_hint: The suggested release type.
+        rendered_chglog: The rendered changelog.
+    """
+    import json
 
     if output == "release-hint":
         click.echo(release_hint)
@@ -135,7 +225,188 @@ def cli(
         click.echo("Done.")
 
 
-def get_user_config(config_file: Optional[Path], echo_func: Callable) -> Configuration:
+def echo_projects_output(output: Optional[str], changelogs: List["ProjectChangelog"]) -> None:
+    """
+    Display the requested output of each project as a JSON object keyed by project name.
+
+    Args:
+        output: The kind of output requested: `release-hint`, `notes`, `all` or `None`.
+        changelogs: The changelogs of the projects.
+    """
+    import json
+
+    if output is None:
+        click.echo("Done.")
+        return
+
+    out = {}
+    for changelog in changelogs:
+        notes = changelog.rendered.notes or changelog.rendered.full
+        if output == "release-hint":
+            out[changelog.name] = changelog.release_hint
+        elif output == "notes":
+            out[changelog.name] = notes
+        else:
+            out[changelog.name] = {"release_hint": changelog.release_hint, "notes": notes}
+    click.echo(json.dumps(out))
+
+
+@cli.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    required=True,
+    type=click.Path(file_okay=True, dir_okay=False, path_type=Path),
+    help="The path of the Unix socket to listen on.",
+    envvar="CHANGELOG_SERVER_SOCKET",
+)
+@click.option("--verbose", "-v", count=True, help="Increase verbosity.")
+def serve(socket_path: Path, verbose: int) -> None:
+    """
+    Run a server that generates changelogs with warm caches.
+
+    Use `generate-changelog --server <socket> ...` to send requests to it. Requests are handled one at a time.
+    """
+    from generate_changelog.indented_logger import setup_logging
+    from generate_changelog.server import serve as run_server
+
+    setup_logging(verbose)
+    run_server(socket_path)
+
+
+@cli.command()
+@click.argument("manifest", type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    help="Path to a config file applied to every repository before its own.",
+)
+@click.option(
+    "--jobs", "-j", type=click.IntRange(min=1), help="Number of worker processes. Defaults to the number of CPUs."
+)
+@click.option("--skip-output-pipeline", is_flag=True, help="Do not execute the output pipeline in the configuration.")
+@click.option("--verbose", "-v", count=True, help="Increase verbosity.")
+@click.pass_context
+def batch(
+    ctx: Context, manifest: Path, config: Optional[Path], jobs: Optional[int], skip_output_pipeline: bool, verbose: int
+) -> None:
+    """
+    Generate the changelogs of the repositories in a manifest concurrently.
+
+    The manifest is a YAML or JSON list of repository paths, or of mappings with a `path` and optional `config`,
+    `overrides`, `starting_tag` and `branch` keys. One JSON result is output per line as each repository finishes.
+    Exits with 1 if any repository failed.
+    """
+    import json
+
+    from generate_changelog.batch import read_manifest, run_batch
+
+    base_config = str(config) if config else None
+    failed = False
+    for result in run_batch(read_manifest(manifest), jobs, base_config, not skip_output_pipeline, verbose):
+        failed = failed or bool(result["error"])
+        click.echo(json.dumps(result))
+
+    if failed:
+        ctx.exit(1)
+
+
+@cli.command("plan-fetch")
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    help="Path to the config file.",
+    envvar="CHANGELOG_CONFIG_FILE",
+)
+@click.option("--repo-path", "-r", help="Path to the repository, if not within the current directory")
+@click.option("--starting-tag", "-t", help="Tag to generate a changelog from. Defaults to the starting tag pipeline.")
+@click.option("--mirror", "-m", help="Path to a repository with the full history, such as a local bare mirror.")
+@click.option("--deepen", is_flag=True, help="Fetch the needed history and tags from the mirror.")
+@click.option("--verbose", "-v", count=True, help="Increase verbosity.")
+def plan_fetch(
+    config: Optional[Path],
+    repo_path: Optional[str],
+    starting_tag: Optional[str],
+    mirror: Optional[str],
+    deepen: bool,
+    verbose: int,
+) -> None:
+    """
+    Report how much history a shallow clone needs to generate the changelog.
+
+    Outputs a JSON object with the `depth` for `git fetch --depth` and the date for `git fetch --shallow-since`. The
+    history is measured in the mirror, or in the repository itself if it has the full history. With `--deepen`, just
+    that much history and the tags of the needed commits are fetched from the mirror.
+    """
+    import json
+
+    from generate_changelog.git_ops import open_repo
+    from generate_changelog.indented_logger import setup_logging
+    from generate_changelog.runner import find_starting_tag
+    from generate_changelog.shallow import deepen as deepen_repo
+    from generate_changelog.shallow import needs_deepening, plan_shallow_fetch
+
+    if deepen and not mirror:
+        raise click.UsageError("--deepen needs a --mirror to fetch from.")
+
+    configuration = get_user_config(config, functools.partial(echo, quiet=True))
+    setup_logging(verbose or configuration.verbosity)
+    repository = open_repo(repo_path)
+    source = open_repo(mirror) if mirror else repository
+    plan = plan_shallow_fetch(source, starting_tag or find_starting_tag(configuration), repository.head.commit.hexsha)
+
+    result = plan.as_dict()
+    result["needs_deepening"] = needs_deepening(repository, plan)
+    if deepen and mirror:
+        result["deepened"] = deepen_repo(repository, mirror, plan)
+    click.echo(json.dumps(result))
+
+
+def forward_to_server(socket_path: Path) -> None:
+    """
+    Run the current command on a `generate-changelog serve` process and echo its output.
+
+    Args:
+        socket_path: The path of the Unix socket the server listens on.
+    """
+    from generate_changelog.server import send_request
+
+    ctx = click.get_current_context()
+    params = {key: val for key, val in ctx.params.items() if key != "server"}
+    response = send_request(socket_path, params_to_args(ctx.command, params))
+    click.echo(response["stdout"], nl=False)
+    click.echo(response["stderr"], nl=False, err=True)
+    ctx.exit(response["exit_code"])
+
+
+def params_to_args(command: click.Command, params: dict) -> List[str]:
+    """
+    Convert parsed parameter values back into command line arguments.
+
+    Args:
+        command: The command the parameters belong to.
+        params: The parameter values by name.
+
+    Returns:
+        Command line arguments that parse to the same values.
+    """
+    args: List[str] = []
+    for param in command.params:
+        value = params.get(param.name)
+        if not isinstance(param, click.Option) or value is None or value is False:
+            continue
+        if param.count:
+            args.extend([param.opts[0]] * value)
+        elif param.is_flag:
+            args.append(param.opts[0])
+        else:
+            args.extend([param.opts[0], str(value)])
+    return args
+
+
+def get_user_config(config_file: Optional[Path], echo_func: Callable) -> "Configuration":
     """
     Get the default configuration and update it with the user's config file.
 
@@ -146,7 +417,7 @@ def get_user_config(config_file: Optional[Path], echo_func: Callable) -> Configu
     Returns:
         The configuration object
     """
-    from generate_changelog.configuration import get_config
+    from generate_changelog.configuration import DEFAULT_CONFIG_FILE_NAMES, get_config
 
     config = get_config()
     if user_config := config_file or next(
@@ -1,22 +1,31 @@
 """Filter and process commits into contexts."""
 
 import collections
+import dataclasses
 import re
-from typing import Callable, List, Optional
+from functools import lru_cache
+from typing import AbstractSet, Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from git import Actor, Commit, Repo
+import click
+from git import Actor, Repo
 
 from generate_changelog import git_ops
 from generate_changelog.actions.metadata import MetadataCollector
 from generate_changelog.configuration import Configuration
-from generate_changelog.context import CommitContext, GroupingContext, VersionContext
-from generate_changelog.git_ops import GitTag
+from generate_changelog.context import CommitContext, GroupingContext, LazySet, VersionContext
+from generate_changelog.git_ops import CommitRecord, GitTag, HistoryIndex
+from generate_changelog.identity import IdentityResolver, format_contact, has_mailmap
 from generate_changelog.pipeline import Action, pipeline_factory
-from generate_changelog.utilities import resolve_name
+from generate_changelog.profiling import profile_stage
+from generate_changelog.utilities import compile_name, path_matches
 
 
 def get_context_from_tags(
-    repository: Repo, config: Configuration, starting_tag: Optional[str] = None
+    repository: Repo,
+    config: Configuration,
+    starting_tag: Optional[str] = None,
+    history: Optional[HistoryIndex] = None,
+    paths: Optional[Sequence[str]] = None,
 ) -> List[VersionContext]:
     """
     Generate the template context from git tags.
@@ -25,15 +34,25 @@ def get_context_from_tags(
         repository: The git repository to evaluate.
         config: The current configuration object.
         starting_tag: Optional starting tag for generating incremental changelogs.
+        history: Reuse the tags, commits, and changed files in this index.
+        paths: Only include commits that change files matching these glob patterns.
 
     Returns:
         A list of VersionContext objects.
     """
-    tags = git_ops.get_commits_by_tags(repository, config.tag_pattern, starting_tag, config)
+    group_by_accessors(tuple(config.group_by))
+    tags = git_ops.get_commits_by_tags(repository, config.tag_pattern, starting_tag, config, history)
+    changed_files = history.changed_files if history is not None else None
     output: List[VersionContext] = []
 
+    identities = IdentityResolver(repository if config.mailmap and has_mailmap(repository) else None)
+    identities.resolve_all(
+        format_contact(commit.committer.name or "", commit.committer.email or "")
+        for tag in tags
+        for commit in tag.commits
+    )
     for tag in tags:
-        version_context = create_version_context(config, tag)
+        version_context = create_version_context(config, tag, changed_files, paths, identities)
 
         if output:
             output[-1].previous_tag = version_context.tag
@@ -43,16 +62,32 @@ def get_context_from_tags(
     if starting_tag and output and output[-1].previous_tag is None:
         output[-1].previous_tag = starting_tag
 
+    identities.resolve_all(
+        author
+        for version_context in output
+        for group in version_context.grouped_commits
+        for commit_ctx in group.commits
+        for author in commit_ctx.trailer_authors
+    )
     return output
 
 
-def create_version_context(config: Configuration, tag: GitTag) -> VersionContext:
+def create_version_context(
+    config: Configuration,
+    tag: GitTag,
+    changed_files: Optional[Dict[str, List[str]]] = None,
+    paths: Optional[Sequence[str]] = None,
+    identities: Optional[IdentityResolver] = None,
+) -> VersionContext:
     """
     Generate a [`VersionContext`][generate_changelog.context.VersionContext] from a tag dictionary.
 
     Args:
         config: The current configuration object.
         tag: A GitTag used as the basis for a VersionContext
+        changed_files: The files changed by each commit, by SHA. Commits not in it use their record's files.
+        paths: Only include commits that change files matching these glob patterns.
+        identities: Maps the committers and authors to their canonical names and emails.
 
     Returns:
         The finished version context.
@@ -60,11 +95,20 @@ def create_version_context(config: Configuration, tag: GitTag) -> VersionContext
     version_metadata_func = MetadataCollector()
     version_commit_groups = collections.defaultdict(list)
 
+    commits = []
+    commit_files = []
     for commit in tag.commits:
         if any(re.search(ignore_pat, commit.summary) is not None for ignore_pat in config.ignore_patterns):
             continue
 
-        commit_ctx = generate_commit_context(commit, config, version_metadata_func)
+        files = changed_files.get(commit.hexsha) if changed_files is not None else None
+        if paths and not path_matches(paths, commit.files or [] if files is None else files):
+            continue
+
+        commits.append(commit)
+        commit_files.append(files)
+
+    for commit_ctx in generate_commit_contexts(commits, config, version_metadata_func, commit_files, identities):
         version_commit_groups[commit_ctx.grouping].append(commit_ctx)
 
     tag_label = tag.tag_name if tag.tag_name != "HEAD" else config.unreleased_label
@@ -81,7 +125,8 @@ def create_version_context(config: Configuration, tag: GitTag) -> VersionContext
         tag_datetime = None
         tagger = None
 
-    version_commits = sort_group_commits(version_commit_groups)
+    with profile_stage("grouping"):
+        version_commits = sort_group_commits(version_commit_groups)
 
     return VersionContext(
         label=tag_label,
@@ -94,7 +139,11 @@ def create_version_context(config: Configuration, tag: GitTag) -> VersionContext
 
 
 def generate_commit_context(
-    commit: Commit, config: Configuration, version_metadata_func: Optional[Callable]
+    commit: CommitRecord,
+    config: Configuration,
+    version_metadata_func: Optional[Callable],
+    files: Optional[Iterable[str]] = None,
+    identities: Optional[IdentityResolver] = None,
 ) -> CommitContext:
     """
     Create the renderable context for this commit.
@@ -105,44 +154,134 @@ def generate_commit_context(
         commit: The original commit data
         config: The configuration to use
         version_metadata_func: An optional callable to set version metadata while processing
+        files: The files changed by the commit. If ``None``, the files of the commit record are used.
+        identities: Maps the committer and authors to their canonical names and emails.
 
     Returns:
         The render-able commit context
     """
-    commit_metadata_func = MetadataCollector()
+    return generate_commit_contexts([commit], config, version_metadata_func, [files], identities)[0]
+
+
+def generate_commit_contexts(
+    commits: Sequence[CommitRecord],
+    config: Configuration,
+    version_metadata_func: Optional[Callable],
+    files: Optional[Sequence[Optional[Iterable[str]]]] = None,
+    identities: Optional[IdentityResolver] = None,
+) -> List[CommitContext]:
+    """
+    Create the renderable contexts for many commits.
+
+    All the summaries go through the summary pipeline together, then all the bodies through the body pipeline, so
+    actions can process them in one batch. The version metadata of each commit is saved after both pipelines, in the
+    order of the commits, as if they were processed one at a time. Then the commits are classified and grouped.
+
+    Args:
+        commits: The original commit data
+        config: The configuration to use
+        version_metadata_func: An optional callable to set version metadata while processing
+        files: The files changed by each commit. If ``None``, or ``None`` for a commit, the commit record's are used.
+        identities: Maps the committers and authors to their canonical names and emails.
+
+    Returns:
+        The render-able commit contexts, in the order of the commits
+    """
+    commit_metadata_funcs = [MetadataCollector() for _ in commits]
+    version_metadata_calls: List[List[dict]] = [[] for _ in commits]
+    version_metadata_funcs = [_call_recorder(calls) for calls in version_metadata_calls]
     summary_pipeline = pipeline_factory(
         action_list=config.summary_pipeline,
-        commit_metadata_func=commit_metadata_func,
         version_metadata_func=version_metadata_func,
     )
-    summary = summary_pipeline.run(commit.summary)
+    summaries = summary_pipeline.run_batch(
+        [commit.summary for commit in commits], commit_metadata_funcs, version_metadata_funcs
+    )
     body_pipeline = pipeline_factory(
         action_list=config.body_pipeline,
-        commit_metadata_func=commit_metadata_func,
         version_metadata_func=version_metadata_func,
     )
-    body_text = "\n".join(commit.message.splitlines()[1:])
-    body = body_pipeline.run(body_text)
-
-    commit_ctx = CommitContext(
-        sha=commit.hexsha,
-        commit_datetime=commit.committed_datetime,
-        committer=f"{commit.committer.name} <{commit.committer.email}>",
-        summary=summary,
-        body=body,
-        grouping=(),
-        metadata=commit_metadata_func.metadata.copy(),
-        files=set(commit.stats.files.keys()),
-        valid_author_tokens=config.valid_author_tokens,
-    )
-    category = first_matching(config.commit_classifiers, commit_ctx)
-    commit_ctx.metadata["category"] = category
+    body_texts = ["\n".join(commit.message.splitlines()[1:]) for commit in commits]
+    bodies = body_pipeline.run_batch(body_texts, commit_metadata_funcs, version_metadata_funcs)
+    if version_metadata_func is not None:
+        for calls in version_metadata_calls:
+            for kwargs in calls:
+                version_metadata_func(**kwargs)
+
+    commit_ctxs = []
+    for commit, summary, body, commit_metadata_func, commit_files in zip(
+        commits, summaries, bodies, commit_metadata_funcs, files or [None] * len(commits)
+    ):
+        committer = format_contact(commit.committer.name or "", commit.committer.email or "")
+        commit_ctxs.append(
+            CommitContext(
+                sha=commit.hexsha,
+                commit_datetime=commit.committed_datetime,
+                committer=identities.resolve(committer) if identities is not None else committer,
+                summary=summary,
+                body=body,
+                grouping=(),
+                metadata=commit_metadata_func.metadata.copy(),
+                files=_commit_files(commit, commit_files),
+                valid_author_tokens=config.valid_author_tokens,
+                identities=identities,
+            )
+        )
+
+    with profile_stage("classification"):
+        categories = classify_commits(config.commit_classifiers, commit_ctxs)
 
     # The grouping is a tuple of the appropriate values according to the group_by configuration
     # We can sort commits later and grouped by this.
-    grouping = tuple(resolve_name(commit_ctx, group) for group in config.group_by)
-    commit_ctx.grouping = grouping
-    return commit_ctx
+    accessors = group_by_accessors(tuple(config.group_by))
+    with profile_stage("grouping"):
+        for commit_ctx, category in zip(commit_ctxs, categories):
+            commit_ctx.metadata["category"] = category
+            commit_ctx.grouping = tuple(accessor(commit_ctx) for accessor in accessors)
+    return commit_ctxs
+
+
+def _call_recorder(calls: List[dict]) -> Callable:
+    """Return a metadata callable that appends the keyword arguments of each call to `calls`."""
+
+    def record(**kwargs: Any) -> None:
+        calls.append(kwargs)
+
+    return record
+
+
+@lru_cache(maxsize=32)
+def group_by_accessors(group_by: Tuple[str, ...]) -> Tuple[Callable[[CommitContext], Any], ...]:
+    """
+    Compile the `group_by` names into functions that get their values from a commit context.
+
+    Args:
+        group_by: The dotted names of the commit context values to group by
+
+    Returns:
+        A function for each name, in order
+
+    Raises:
+        click.UsageError: If a name isn't a string that starts with an attribute of the commit context.
+    """
+    attributes = {field.name for field in dataclasses.fields(CommitContext)}
+    attributes.update(name for name in dir(CommitContext) if not name.startswith("_"))
+    for name in group_by:
+        if not isinstance(name, str) or name.split(".")[0] not in attributes:
+            raise click.UsageError(
+                f"Can't group commits by '{name}'. Each group_by value must start with one of: "
+                f"{', '.join(sorted(attributes))}."
+            )
+    return tuple(compile_name(name) for name in group_by)
+
+
+def _commit_files(commit: CommitRecord, files: Optional[Iterable[str]]) -> AbstractSet[str]:
+    """Return the files changed by a commit, deferring the read until first use if they aren't loaded."""
+    if files is not None:
+        return set(files)
+    if commit.files_loaded:
+        return set(commit.files or ())
+    return LazySet(lambda: commit.files or ())
 
 
 def sort_group_commits(commit_groups: dict) -> list[GroupingContext]:
@@ -177,9 +316,31 @@ def first_matching(actions: list, commit: CommitContext) -> Optional[str]:
     Returns:
         The name of the section.
     """
+    return classify_commits(actions, [commit])[0]
+
+
+def classify_commits(actions: list, commits: Sequence[CommitContext]) -> List[Optional[str]]:
+    """
+    Return the first section that matches each commit.
+
+    Each classifier runs on all the commits no earlier classifier matched, in one batch.
+
+    Args:
+        actions: The commit classifiers, in the order they are tried.
+        commits: The commit contexts to evaluate
+
+    Returns:
+        The name of the section of each commit, in the order of the commits.
+    """
+    categories: List[Optional[str]] = [None] * len(commits)
+    unmatched = list(range(len(commits)))
     for action in actions:
+        if not unmatched:
+            break
         if action.get("action", None) is None:
-            return action.get("category", None)
+            for index in unmatched:
+                categories[index] = action.get("category", None)
+            break
 
         act = Action(
             action=action["action"],
@@ -187,6 +348,9 @@ def first_matching(actions: list, commit: CommitContext) -> Optional[str]:
             args=action.get("args"),
             kwargs=action.get("kwargs"),
         )
-        if act.run(context={}, input_value=commit):
-            return action.get("category", None)
-    return None
+        results = act.run_batch([{} for _ in unmatched], [commits[index] for index in unmatched])
+        for index, result in zip(unmatched, results):
+            if result:
+                categories[index] = action.get("category", None)
+        unmatched = [index for index, result in zip(unmatched, results) if not result]
+    return categories
@@ -1,6 +1,6 @@
 """Configuration management for generate_changelog."""
 
-from typing import Any, Callable, Dict, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Union
 
 try:
     from functools import cached_property
@@ -12,14 +12,26 @@ try:
 except ImportError:
     from typing_extensions import TypeAlias
 
+import copy
 from dataclasses import asdict, dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
 import rich_click as click
-from ruamel.yaml import YAML
 
-yaml = YAML()
-yaml.indent(mapping=2, sequence=4, offset=2)
+if TYPE_CHECKING:
+    from ruamel.yaml import YAML
+
+
+@lru_cache(maxsize=None)
+def get_yaml() -> "YAML":
+    """Return the YAML parser and emitter for configuration files, importing `ruamel.yaml` on first use."""
+    from ruamel.yaml import YAML
+
+    yaml = YAML()
+    yaml.indent(mapping=2, sequence=4, offset=2)
+    return yaml
+
 
 StrOrCallable: TypeAlias = Union[str, Callable[[], str]]
 """The type should be either a string or a callable that returns a string."""
@@ -207,6 +219,14 @@ class Configuration:
     report_path: Optional[Path] = None
     """Path to write a report of the changelog to."""
 
+    action_cache_path: Optional[str] = None
+    """Path to a file that keeps the results of actions with `cache: true` between runs.
+    Leave empty to only cache results during a run."""
+
+    git_backend: str = "gitpython"
+    """How the repository is read: `gitpython` uses GitPython objects, and `subprocess` parses the output of a few bulk
+    `git` commands."""
+
     #
     # Commit filtering
     #
@@ -216,6 +236,24 @@ class Configuration:
     include_merges: bool = False
     """Tells `git-log` whether to include merge commits in the log."""
 
+    commit_graph: str = "off"
+    """How commits are grouped into versions. `off` sorts the tags by date and lists the commits between each pair of
+    tags. `use` orders the tags by ancestry and assigns each commit to the oldest tag containing it, with one
+    topological walk. `write` does the same, and first writes the repository's commit-graph file if it is missing."""
+
+    since: Optional[str] = None
+    """Only include commits more recent than this date, in any format `git log --since` accepts, like `90 days ago`."""
+
+    until: Optional[str] = None
+    """Only include commits older than this date, in any format `git log --until` accepts."""
+
+    max_commits: Optional[int] = None
+    """Only include this many of the most recent commits."""
+
+    paths: list = field(default_factory=list)
+    """Only include commits that change files matching these git pathspecs, relative to the repository root, like
+    `src/` or `:(glob)docs/**/*.md`. Git filters the history, so other commits are never read."""
+
     ignore_patterns: list = field(default_factory=list)
     """Ignore commits whose summary line matches any of these regular expression patterns."""
 
@@ -225,12 +263,21 @@ class Configuration:
     valid_author_tokens: list = field(default_factory=list)
     """Tokens in git commit trailers that indicate authorship."""
 
+    mailmap: bool = True
+    """Map the names and emails of committers and authors through the repository's `.mailmap`, like `git log`."""
+
     #
     # Release Hinting
     #
     release_hint_rules: list = field(default_factory=list)
     """Rules applied to commits to determine the type of release to suggest."""
 
+    #
+    # Monorepos
+    #
+    projects: list = field(default_factory=list)
+    """Generate a changelog for each of these projects within the repository from one walk of the history."""
+
     @cached_property
     def rendered_variables(self) -> dict:
         """Render each variable value using the previous variables as the context."""
@@ -260,9 +307,18 @@ class Configuration:
         if not file_path.is_file():
             raise click.UsageError(f"'{filename}' is not a file.")
 
-        content = file_path.read_text()
-        values = yaml.load(content)
+        stat = file_path.stat()
+        self.update_from_dict(copy.deepcopy(_load_config_file(file_path, stat.st_mtime_ns, stat.st_size)))
 
+    def update_from_dict(self, values: Dict[str, Any]) -> None:
+        """
+        Updates this configuration instance in place from a mapping of option names to values.
+
+        The `variables` are merged into the current variables. Unknown options are ignored.
+
+        Args:
+            values: The option values
+        """
         for key, val in values.items():
             if key == "variables" and isinstance(val, dict):
                 self.variables.update(val)
@@ -270,6 +326,16 @@ class Configuration:
                 setattr(self, key, val)
 
 
+@lru_cache(maxsize=64)
+def _load_config_file(file_path: Path, mtime_ns: int, size: int) -> Any:
+    """
+    Parse a YAML configuration file.
+
+    The modification time and size are part of the cache key, so a long-running process re-reads changed files.
+    """
+    return get_yaml().load(file_path.read_text(encoding="utf-8"))
+
+
 def get_default_config() -> Configuration:
     """
     Create a new [`Configuration`][generate_changelog.configuration.Configuration] object with default values.
@@ -277,19 +343,23 @@ def get_default_config() -> Configuration:
     Returns:
         A new Configuration object
     """
-    return Configuration(
-        variables=DEFAULT_VARIABLES,
-        ignore_patterns=DEFAULT_IGNORE_PATTERNS,
-        commit_classifiers=DEFAULT_COMMIT_CLASSIFIERS,
-        body_pipeline=DEFAULT_BODY_PIPELINE,
-        summary_pipeline=DEFAULT_SUMMARY_PIPELINE,
-        starting_tag_pipeline=DEFAULT_STARTING_TAG_PIPELINE,
-        output_pipeline=DEFAULT_OUTPUT_PIPELINE,
-        valid_author_tokens=DEFAULT_VALID_AUTHOR_TOKENS,
-        group_by=DEFAULT_GROUP_BY,
-        template_dirs=DEFAULT_TEMPLATE_DIRS,
-        release_hint_rules=DEFAULT_RELEASE_RULES,
+    defaults = copy.deepcopy(
+        {
+            "variables": DEFAULT_VARIABLES,
+            "ignore_patterns": DEFAULT_IGNORE_PATTERNS,
+            "commit_classifiers": DEFAULT_COMMIT_CLASSIFIERS,
+            "body_pipeline": DEFAULT_BODY_PIPELINE,
+            "summary_pipeline": DEFAULT_SUMMARY_PIPELINE,
+            "starting_tag_pipeline": DEFAULT_STARTING_TAG_PIPELINE,
+            "output_pipeline": DEFAULT_OUTPUT_PIPELINE,
+            "valid_author_tokens": DEFAULT_VALID_AUTHOR_TOKENS,
+            "group_by": DEFAULT_GROUP_BY,
+            "template_dirs": DEFAULT_TEMPLATE_DIRS,
+            "release_hint_rules": DEFAULT_RELEASE_RULES,
+        }
     )
+    # The defaults are copied so updating a configuration never changes the defaults of the next one.
+    return Configuration(**defaults)
 
 
 def write_default_config(filename: Path) -> None:
@@ -315,7 +385,7 @@ def write_default_config(filename: Path) -> None:
     for attr, doc in config_docstrings.items():
         yaml_config.yaml_set_comment_before_after_key(key=attr, before="")
         yaml_config.yaml_set_comment_before_after_key(key=attr, before=doc)
-    yaml.dump(yaml_config, file_path)
+    get_yaml().dump(yaml_config, file_path)
 
 
 _CONFIG: Configuration = get_default_config()
@@ -340,8 +410,16 @@ def get_config() -> Configuration:
     return _CONFIG
 
 
-def reset_config() -> Configuration:
-    """Reset the global config to defaults. Use in tests only."""
+def reset_config(base: Optional[Configuration] = None) -> Configuration:
+    """
+    Reset the global config to defaults, or to a copy of another configuration.
+
+    Args:
+        base: The configuration to copy. If ``None``, the defaults are used.
+
+    Returns:
+        The new global configuration object.
+    """
     global _CONFIG  # noqa: PLW0603
-    _CONFIG = get_default_config()
+    _CONFIG = get_default_config() if base is None else copy.deepcopy(base)
     return _CONFIG
@@ -2,14 +2,48 @@
 
 import collections
 import datetime
-import re
+from collections.abc import Set
 from dataclasses import dataclass, field
-from typing import Callable, List, Optional, Tuple
+from typing import AbstractSet, Callable, Iterable, Iterator, List, Optional, Tuple
 
 from generate_changelog.configuration import Configuration
+from generate_changelog.identity import IdentityResolver, parse_contact
 from generate_changelog.utilities import diff_index
 
 
+class LazySet(Set):
+    """
+    A read-only set whose items are loaded on first use.
+
+    Args:
+        load: Returns the items of the set.
+    """
+
+    def __init__(self, load: Callable[[], Iterable]):
+        self._load: Optional[Callable[[], Iterable]] = load
+        self._items: AbstractSet = frozenset()
+
+    @property
+    def items(self) -> AbstractSet:
+        """The items of the set, loaded if needed."""
+        if self._load is not None:
+            self._items = set(self._load())
+            self._load = None
+        return self._items
+
+    def __contains__(self, item: object) -> bool:
+        return item in self.items
+
+    def __iter__(self) -> Iterator:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __repr__(self) -> str:
+        return repr(self.items)
+
+
 @dataclass
 class CommitContext:
     """Commit information for the template context."""
@@ -35,12 +69,15 @@ class CommitContext:
     metadata: dict = field(default_factory=dict)
     """Metadata for this commit parsed from the commit message."""
 
-    files: set = field(default_factory=set)
-    """The file paths (relative to the repository root) modified by this commit."""
+    files: AbstractSet[str] = field(default_factory=set)
+    """The file paths (relative to the repository root) modified by this commit. They may be read on first use."""
 
     valid_author_tokens: List[str] = field(default_factory=list)
     """The configured tokens in git commit trailers that indicate authorship."""
 
+    identities: Optional[IdentityResolver] = field(default=None, repr=False, compare=False)
+    """Maps the authors in trailers to their canonical names and emails."""
+
     _authors: Optional[list] = field(init=False)  # list of dicts with name and email keys
     _author_names: Optional[list] = field(init=False)  # list of just the names
 
@@ -65,22 +102,24 @@ class CommitContext:
         if self._authors is not None:
             return self._authors
 
-        raw_authors = [self.committer]
-        trailers = self.metadata.get("trailers", collections.defaultdict(list))
-        for token in self.valid_author_tokens:
-            raw_authors.extend(trailers.get(token, []))
-        author_regex = re.compile(r"^(?P<name>[^<]+)\s+(?:<(?P<email>[^>]+)>)?$")
+        raw_authors = [self.committer, *self.trailer_authors]
+        if self.identities is not None:
+            raw_authors = [self.identities.resolve(author) for author in raw_authors]
 
         self._authors = []
         for author in raw_authors:
-            if match := author_regex.match(author):
-                self._authors.append(match.groupdict())
-            else:
-                self._authors.append({"name": author, "email": ""})
+            name, email = parse_contact(author)
+            self._authors.append({"name": name, "email": email})
 
         self._authors.sort(key=lambda x: x["name"])
         return self._authors
 
+    @property
+    def trailer_authors(self) -> list:
+        """The contacts in the commit trailers that indicate authorship, as written."""
+        trailers = self.metadata.get("trailers", collections.defaultdict(list))
+        return [author for token in self.valid_author_tokens for author in trailers.get(token, [])]
+
     @property
     def author_names(self) -> list:
         """A list of the authors' names."""
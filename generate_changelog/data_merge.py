@@ -1,8 +1,13 @@
 """Tools for merging data."""
 
+import contextlib
 import copy
 from functools import reduce
-from typing import Any, Iterable
+from itertools import chain
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+IMMUTABLE_TYPES = (str, bytes, int, float, complex, bool, type(None), frozenset, range)
+"""Types whose values are shared instead of copied when merged."""
 
 
 def deep_merge(*dicts: dict) -> dict:
@@ -85,3 +90,111 @@ def comprehensive_merge(*args: Any) -> Any:  # NOQA: C901
         return reduce(merge_into, args, {})
     else:
         return reduce(merge_into, args)
+
+
+def copy_value(value: Any) -> Any:
+    """
+    Copy a value for merging, sharing immutable scalars instead of copying them.
+
+    Args:
+        value: The value to copy
+
+    Returns:
+        The value itself if it is immutable, or a deep copy. Copied dicts keep their type.
+    """
+    if isinstance(value, IMMUTABLE_TYPES):
+        return value
+    if isinstance(value, list):
+        return [copy_value(item) for item in value]
+    if isinstance(value, dict):
+        copied = copy.copy(value)
+        for key, val in value.items():
+            copied[key] = copy_value(val)
+        return copied
+    return copy.deepcopy(value)
+
+
+def _hashable_items(items: Iterable) -> Set[Any]:
+    """Return the items that can be put in a set."""
+    hashable = set()
+    for item in items:
+        with contextlib.suppress(TypeError):
+            hashable.add(item)
+    return hashable
+
+
+class OrderedMerger:
+    """
+    Merges dicts into a target dict in place, keeping the order of keys and items.
+
+    It merges like [`comprehensive_merge`][generate_changelog.data_merge.comprehensive_merge], but:
+
+    - lists get the new items they don't have yet, appended in order
+    - tuples are rebuilt the same way, and sets are updated
+    - immutable scalars are shared instead of copied
+
+    The items of each list are remembered, so merging takes time proportional to the size of the new data, not of
+    the data merged so far.
+
+    Args:
+        target: The dict to merge into. If ``None``, a new dict is used.
+    """
+
+    def __init__(self, target: Optional[dict] = None):
+        self.target = {} if target is None else target
+        self._seen: Dict[int, Tuple[list, Set[Any]]] = {}
+
+    def merge(self, source: dict) -> dict:
+        """
+        Merge a dict into the target.
+
+        Args:
+            source: The data to merge
+
+        Returns:
+            The target
+
+        Raises:
+            ValueError: If a value can't be merged into a value of another type
+        """
+        self._merge_dict(self.target, source)
+        return self.target
+
+    def _merge_dict(self, target: dict, source: dict) -> None:
+        """Merge the values of a dict into another, recursively."""
+        for key, value in source.items():
+            target[key] = self._merge_value(target[key], value) if key in target else copy_value(value)
+
+    def _merge_value(self, current: Any, new: Any) -> Any:
+        """Return the merged value, changing the current value in place if it is a container."""
+        if type(current) is not type(new):
+            raise ValueError(f"Cannot merge {type(new)} into {type(current)}.")
+
+        if isinstance(current, list):
+            self._extend_unique(current, new)
+        elif isinstance(current, dict):
+            self._merge_dict(current, new)
+        elif isinstance(current, set):
+            current.update(new)
+        elif isinstance(current, tuple):
+            return tuple(dict.fromkeys(chain(current, new)))
+        else:
+            return copy_value(new)
+        return current
+
+    def _extend_unique(self, items: list, new_items: Iterable) -> None:
+        """Append the new items that aren't in the list yet."""
+        entry = self._seen.get(id(items))
+        if entry is None or entry[0] is not items:
+            entry = self._seen[id(items)] = (items, _hashable_items(items))
+        seen = entry[1]
+
+        for item in new_items:
+            try:
+                if item in seen:
+                    continue
+                seen.add(item)
+            except TypeError:
+                if item in items:
+                    continue
+            items.append(copy_value(item))
@@ -3,12 +3,19 @@
 import datetime
 import os
 import re
-from dataclasses import dataclass
-from typing import List, Optional, Union
+import subprocess
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 
-from git import Actor, Commit, Repo
+import click
+from git import Actor, Commit, GitCommandError, Repo
 
+from generate_changelog.cat_file import GitObject, get_cat_file
 from generate_changelog.configuration import Configuration, get_config
+from generate_changelog.indented_logger import get_indented_logger
+from generate_changelog.profiling import profile_stage
+
+logger = get_indented_logger(__name__)
 
 GIT_FORMAT_KEYS = {
     "sha1": "%H",
@@ -40,6 +47,81 @@ class TagInfo:
         return self.tagged_datetime.strftime("%Y-%m-%d")
 
 
+@dataclass
+class CommitRecord:
+    """The information about a commit used to generate a changelog, independent of how it was read."""
+
+    hexsha: str
+    """The full hex SHA of the commit."""
+
+    message: str
+    """The full commit message."""
+
+    author: Actor
+    """The author of the commit."""
+
+    committer: Actor
+    """The committer of the commit."""
+
+    committed_datetime: datetime.datetime
+    """The commit date, in the committer's time zone."""
+
+    _files: Optional[List[str]] = field(default=None, repr=False)
+    """The paths of the files changed by the commit, once they are read."""
+
+    files_loader: Optional[Callable[[str], List[str]]] = field(default=None, repr=False, compare=False)
+    """Reads the files changed by a commit from its SHA, the first time they are needed."""
+
+    @property
+    def summary(self) -> str:
+        """The first line of the commit message."""
+        return self.message.split("\n", 1)[0]
+
+    @property
+    def files(self) -> Optional[List[str]]:
+        """The paths of the files changed by the commit, read on first access if they weren't prefetched."""
+        if self._files is None and self.files_loader is not None:
+            self._files = self.files_loader(self.hexsha)
+        return self._files
+
+    @files.setter
+    def files(self, value: Optional[List[str]]) -> None:
+        self._files = value
+
+    @property
+    def files_loaded(self) -> bool:
+        """Whether the changed files were read, so accessing them is free."""
+        return self._files is not None or self.files_loader is None
+
+
+class RangeFiles:
+    """
+    The files changed by the commits of a revision range, read with one `git log` the first time any are needed.
+
+    Args:
+        backend: The backend that reads the repository.
+        revs: The revision range, like `1.0.0..HEAD`.
+        include_merges: Include merge commits.
+    """
+
+    def __init__(self, backend: "GitBackend", revs: str, include_merges: bool):
+        self.backend = backend
+        self.revs = revs
+        self.include_merges = include_merges
+        self._files: Optional[Dict[str, List[str]]] = None
+
+    def load(self) -> Dict[str, List[str]]:
+        """Read the files changed by every commit in the range, if they weren't already."""
+        if self._files is None:
+            with profile_stage("changed files"):
+                self._files = self.backend.changed_files(self.revs, self.include_merges)
+        return self._files
+
+    def __call__(self, sha: str) -> List[str]:
+        """Return the files changed by a commit in the range."""
+        return self.load().get(sha, [])
+
+
 @dataclass(frozen=True)
 class GitTag:
     """
@@ -60,7 +142,78 @@ class GitTag:
 
     tag_name: str
     tag_info: TagInfo
-    commits: List[Commit]
+    commits: List[CommitRecord]
+
+
+@dataclass
+class HistoryIndex:
+    """
+    Repository data collected once and shared by several changelogs of the same repository.
+
+    Attributes:
+        tags: All the tags in the repository, most recent first.
+        changed_files: The files changed by each commit reachable from `HEAD`, by commit SHA.
+        commits: The commit records read so far, by commit SHA.
+        versions: The commits grouped by version, by the tag pattern, starting tag and history options used.
+    """
+
+    tags: List[TagInfo]
+    changed_files: Dict[str, List[str]]
+    commits: Dict[str, CommitRecord] = field(default_factory=dict)
+    versions: Dict[tuple, List[GitTag]] = field(default_factory=dict)
+
+
+_REPO_CACHE: Optional[Dict[str, Repo]] = None
+"""Open repositories by path, when caching is enabled."""
+
+
+_HISTORY_CACHE: Optional[Dict[Tuple[str, str, bool], Tuple[str, HistoryIndex]]] = None
+"""History indexes and the refs they were read at, by repository, backend and merge handling, when caching is on."""
+
+
+def enable_repo_cache() -> None:
+    """
+    Reuse repository objects opened by [`open_repo`][generate_changelog.git_ops.open_repo].
+
+    Long-running processes use this to keep GitPython's object database and `git cat-file` processes warm
+    between requests.
+    """
+    global _REPO_CACHE  # noqa: PLW0603
+    if _REPO_CACHE is None:
+        _REPO_CACHE = {}
+
+
+def open_repo(repo_path: Optional[str] = None) -> Repo:
+    """
+    Open the git repo at a path, or the one containing the current working directory.
+
+    Args:
+        repo_path: The path to the repository. If None, the current working directory and its parents are searched.
+
+    Returns:
+        Repository object
+    """
+    if _REPO_CACHE is None:
+        return Repo(repo_path) if repo_path else Repo(search_parent_directories=True)
+
+    key = os.path.abspath(repo_path or os.getcwd())
+    if key not in _REPO_CACHE:
+        _REPO_CACHE[key] = Repo(key) if repo_path else Repo(key, search_parent_directories=True)
+    return _REPO_CACHE[key]
+
+
+def current_branch_name(repository: Repo) -> str:
+    """
+    Return the name of the checked out branch, or `HEAD` if the head is detached.
+
+    Args:
+        repository: The repository object.
+
+    Returns:
+        The name of the current branch.
+    """
+    current_branch = repository.head if repository.head.is_detached else repository.active_branch
+    return current_branch.name
 
 
 def get_repo(repo_path: Optional[str] = None) -> Repo:
@@ -76,12 +229,387 @@ def get_repo(repo_path: Optional[str] = None) -> Repo:
     return Repo(repo_path or os.getcwd())
 
 
+def _log_args(revs: str, include_merges: bool, limits: Sequence[str] = (), paths: Sequence[str] = ()) -> List[str]:
+    """Return the `git log` arguments that list the SHAs of a range in topological order."""
+    args = ["-z", "--topo-order", "--pretty=tformat:%H", *limits]
+    if not include_merges:
+        args.append("--no-merges")
+    args.append(revs)
+    if paths:
+        args.extend(["--", *paths])
+    return args
+
+
+def window_limits(config: Configuration) -> List[str]:
+    """
+    Return the `git log` arguments that limit the history to the configured window.
+
+    Args:
+        config: The configuration with the `since`, `until` and `max_commits` options.
+
+    Returns:
+        The arguments, or an empty list if the history isn't limited.
+    """
+    limits = []
+    if config.since:
+        limits.append(f"--since={config.since}")
+    if config.until:
+        limits.append(f"--until={config.until}")
+    if config.max_commits:
+        limits.append(f"--max-count={config.max_commits}")
+    return limits
+
+
+def _changed_files_args(revs: str, include_merges: bool) -> List[str]:
+    """Return the `git log` arguments that list the files changed by each commit of a range."""
+    # %x1E (ASCII record separator) starts each commit; -z separates the SHA and the file names with nulls.
+    args = ["-z", "--name-only", "--pretty=tformat:%x1E%H"]
+    if not include_merges:
+        args.append("--no-merges")
+    args.append(revs)
+    return args
+
+
+def _parse_changed_files(out: str) -> Dict[str, List[str]]:
+    """Parse the output of `git log` called with the changed files arguments."""
+    changed_files = {}
+    for record in out.split("\x1e"):
+        sha, _, files = record.partition("\x00")
+        if sha:
+            changed_files[sha] = [path for path in files.lstrip("\n").split("\x00") if path]
+    return changed_files
+
+
+_TOPOLOGY_ARGS = ["--topo-order", "--parents"]
+"""The `git rev-list` arguments that list each commit with its parents, children first."""
+
+
+def _parse_parents(out: str) -> List[Tuple[str, List[str]]]:
+    """Parse the output of `git rev-list --parents`."""
+    commits = []
+    for line in out.splitlines():
+        sha, *parents = line.split()
+        commits.append((sha, parents))
+    return commits
+
+
+class GitBackend:
+    """
+    The interface the rest of the package uses to read a repository.
+
+    Subclasses implement the methods for one way of reading git data.
+
+    Args:
+        repository: The repository to read.
+    """
+
+    def __init__(self, repository: Repo):
+        self.repository = repository
+
+    def list_tags(self) -> List[TagInfo]:
+        """Return all the tags in the repository, in no particular order."""
+        raise NotImplementedError
+
+    def walk(
+        self, revs: str, include_merges: bool = False, limits: Sequence[str] = (), paths: Sequence[str] = ()
+    ) -> List[str]:
+        """
+        Return the SHAs of the commits in a revision range, in topological order.
+
+        Args:
+            revs: The revision range, like `1.0.0..HEAD`.
+            include_merges: Include merge commits.
+            limits: Extra `git log` arguments that limit the commits, like `--since=2024-01-01`.
+            paths: Only include commits that change files matching these pathspecs, relative to the repository root.
+
+        Returns:
+            The SHAs of the commits, most recent first.
+        """
+        raise NotImplementedError
+
+    def walk_with_parents(self, revs: str, limits: Sequence[str] = ()) -> List[Tuple[str, List[str]]]:
+        """
+        Return the commits in a revision range with their parents, in topological order, including merges.
+
+        Args:
+            revs: The revision range, like `1.0.0..HEAD`.
+            limits: Extra `git rev-list` arguments that limit the commits, like `--since=2024-01-01`.
+
+        Returns:
+            The SHA and parent SHAs of each commit. Every commit comes before its parents.
+        """
+        raise NotImplementedError
+
+    def get_commits(self, revs: Sequence[str]) -> List[CommitRecord]:
+        """
+        Read the messages and metadata of commits.
+
+        Args:
+            revs: The SHAs or other revisions of the commits.
+
+        Returns:
+            A record for each revision, in the same order.
+        """
+        raise NotImplementedError
+
+    def changed_files(self, revs: str, include_merges: bool = False) -> Dict[str, List[str]]:
+        """
+        Return the files changed by each commit in a revision range.
+
+        Args:
+            revs: The revision range, like `1.0.0..HEAD`.
+            include_merges: Include merge commits.
+
+        Returns:
+            The paths of the changed files by commit SHA.
+        """
+        raise NotImplementedError
+
+
+class GitPythonBackend(GitBackend):
+    """Reads the repository through GitPython objects."""
+
+    def list_tags(self) -> List[TagInfo]:
+        """Return all the tags in the repository, in no particular order."""
+        tags_list = []
+        for tag in self.repository.tags:
+            commit = tag.commit
+            # Tags written without a tagger line get an empty tagger from GitPython
+            tagger = getattr(tag.tag, "tagger", None)
+            if tagger is not None and (tagger.name or tagger.email):
+                tzoffset = datetime.timedelta(seconds=-tag.tag.tagger_tz_offset)
+                tzone = datetime.timezone(tzoffset)
+                tag_datetime = datetime.datetime.fromtimestamp(tag.tag.tagged_date, tzone)
+                tagger = tag.tag.tagger
+            else:
+                tag_datetime = commit.committed_datetime
+                tagger = commit.committer
+
+            tags_list.append(TagInfo(name=tag.name, commit=commit.hexsha, tagger=tagger, tagged_datetime=tag_datetime))
+        return tags_list
+
+    def walk(
+        self, revs: str, include_merges: bool = False, limits: Sequence[str] = (), paths: Sequence[str] = ()
+    ) -> List[str]:
+        """Return the SHAs of the commits in a revision range, in topological order."""
+        out: str = self.repository.git.log(*_log_args(revs, include_merges, limits, paths))
+        return [sha for sha in out.split("\x00") if sha]
+
+    def walk_with_parents(self, revs: str, limits: Sequence[str] = ()) -> List[Tuple[str, List[str]]]:
+        """Return the commits in a revision range with their parents, in topological order."""
+        return _parse_parents(self.repository.git.rev_list(*_TOPOLOGY_ARGS, *limits, revs))
+
+    def get_commits(self, revs: Sequence[str]) -> List[CommitRecord]:
+        """Read the messages and metadata of commits."""
+        return [self._record(self.repository.commit(rev)) for rev in revs]
+
+    def changed_files(self, revs: str, include_merges: bool = False) -> Dict[str, List[str]]:
+        """Return the files changed by each commit in a revision range."""
+        return _parse_changed_files(self.repository.git.log(*_changed_files_args(revs, include_merges)))
+
+    @staticmethod
+    def _record(commit: Commit) -> CommitRecord:
+        """Convert a GitPython commit."""
+        message = commit.message
+        return CommitRecord(
+            hexsha=commit.hexsha,
+            message=message if isinstance(message, str) else message.decode("utf-8", "replace"),
+            author=commit.author,
+            committer=commit.committer,
+            committed_datetime=commit.committed_datetime,
+        )
+
+
+_TAG_FORMAT = "%00".join(
+    [
+        "%(refname:strip=2)",
+        "%(objectname)",
+        "%(*objectname)",
+        "%(*objecttype)",
+        "%(taggername)",
+        "%(taggeremail)",
+        "%(taggerdate:raw)",
+        "%(committername)",
+        "%(committeremail)",
+        "%(committerdate:raw)",
+        "%(*committername)",
+        "%(*committeremail)",
+        "%(*committerdate:raw)",
+    ]
+)
+
+
+def _parse_raw_date(raw: str) -> datetime.datetime:
+    """Convert a raw git date like `1641340800 +0100` into a datetime in its time zone."""
+    timestamp, _, offset = raw.partition(" ")
+    minutes = int(offset[1:3] or 0) * 60 + int(offset[3:5] or 0)
+    tzone = datetime.timezone(datetime.timedelta(minutes=-minutes if offset.startswith("-") else minutes))
+    return datetime.datetime.fromtimestamp(int(timestamp), tzone)
+
+
+def _actor(name: str, email: str) -> Actor:
+    """Return an actor from a name and an email that may be wrapped in angle brackets."""
+    return Actor(name, email.strip("<>"))
+
+
+def _parse_ident(value: str) -> Tuple[Actor, datetime.datetime]:
+    """Parse the value of an `author` or `committer` header, like `Name <email> 1641340800 +0100`."""
+    ident, _, raw_date = value.rpartition("> ")
+    name, _, email = ident.rpartition("<")
+    return Actor(name.strip(), email), _parse_raw_date(raw_date)
+
+
+def _parse_commit_object(git_object: GitObject) -> CommitRecord:
+    """Convert the raw content of a commit object into a record."""
+    raw_headers, _, raw_message = (git_object.content or b"").partition(b"\n\n")
+    headers = {}
+    for line in raw_headers.decode("utf-8", "replace").splitlines():
+        key, _, value = line.partition(" ")
+        if key:  # Continuation lines of multi-line headers, like signatures, start with a space
+            headers.setdefault(key, value)
+
+    author, _ = _parse_ident(headers["author"])
+    committer, committed_datetime = _parse_ident(headers["committer"])
+    try:
+        message = raw_message.decode(headers.get("encoding", "utf-8"), "replace")
+    except LookupError:
+        message = raw_message.decode("utf-8", "replace")
+    return CommitRecord(
+        hexsha=git_object.sha,
+        message=message,
+        author=author,
+        committer=committer,
+        committed_datetime=committed_datetime,
+    )
+
+
+class SubprocessBackend(GitBackend):
+    """
+    Reads the repository with a few bulk `git` commands and parses their output.
+
+    Commit objects are read through the repository's pooled `git cat-file --batch` process, so looking up a few
+    commits, like `HEAD`, doesn't start a process.
+    """
+
+    def __init__(self, repository: Repo):
+        super().__init__(repository)
+        self.git_dir = repository.git_dir
+
+    def run_git(self, *args: str, stdin: Optional[str] = None) -> str:
+        """
+        Run a git command in the repository.
+
+        Args:
+            *args: The git command and its arguments.
+            stdin: The text to send to the command's standard input.
+
+        Returns:
+            The standard output of the command.
+
+        Raises:
+            GitCommandError: If the command fails.
+        """
+        command = ["git", f"--git-dir={self.git_dir}", *args]
+        result = subprocess.run(  # noqa: S603
+            command, input=stdin, capture_output=True, encoding="utf-8", errors="replace", check=False
+        )
+        if result.returncode != 0:
+            raise GitCommandError(command, result.returncode, result.stderr)
+        return result.stdout
+
+    def list_tags(self) -> List[TagInfo]:
+        """
+        Return all the tags in the repository, in no particular order.
+
+        Annotated tags are peeled to their commit, through any tags they point to. Tags without a tagger use the
+        commit's committer and date.
+        """
+        tags_list = []
+        nested = []
+        for line in self.run_git("for-each-ref", f"--format={_TAG_FORMAT}", "refs/tags").splitlines():
+            name, sha, target_sha, target_type, *tagger, name2, email2, date2, name3, email3, date3 = line.split(
+                "\x00"
+            )
+            if not target_sha:  # A lightweight tag
+                tags_list.append(TagInfo(name, sha, _actor(name2, email2), _parse_raw_date(date2)))
+            elif target_type != "commit":  # A tag of a tag
+                nested.append((name, tagger))
+            elif tagger[2]:
+                tags_list.append(TagInfo(name, target_sha, _actor(*tagger[:2]), _parse_raw_date(tagger[2])))
+            else:
+                tags_list.append(TagInfo(name, target_sha, _actor(name3, email3), _parse_raw_date(date3)))
+
+        commits = self.get_commits([f"refs/tags/{name}^{{commit}}" for name, _ in nested])
+        for (name, (tagger_name, tagger_email, tagger_date)), commit in zip(nested, commits):
+            if tagger_date:
+                tags_list.append(
+                    TagInfo(name, commit.hexsha, _actor(tagger_name, tagger_email), _parse_raw_date(tagger_date))
+                )
+            else:
+                tags_list.append(TagInfo(name, commit.hexsha, commit.committer, commit.committed_datetime))
+        return tags_list
+
+    def walk(
+        self, revs: str, include_merges: bool = False, limits: Sequence[str] = (), paths: Sequence[str] = ()
+    ) -> List[str]:
+        """Return the SHAs of the commits in a revision range, in topological order."""
+        out = self.run_git("log", *_log_args(revs, include_merges, limits, paths))
+        return [sha for sha in out.split("\x00") if sha]
+
+    def walk_with_parents(self, revs: str, limits: Sequence[str] = ()) -> List[Tuple[str, List[str]]]:
+        """Return the commits in a revision range with their parents, in topological order."""
+        return _parse_parents(self.run_git("rev-list", *_TOPOLOGY_ARGS, *limits, revs))
+
+    def get_commits(self, revs: Sequence[str]) -> List[CommitRecord]:
+        """Read the messages and metadata of commits through the repository's pooled `git cat-file` process."""
+        records = []
+        for rev, git_object in zip(revs, get_cat_file(self.git_dir).read(revs)):
+            if git_object is None or git_object.type != "commit":
+                raise GitCommandError(["git", "cat-file", "--batch"], 128, f"'{rev}' is not a commit")
+            records.append(_parse_commit_object(git_object))
+        return records
+
+    def changed_files(self, revs: str, include_merges: bool = False) -> Dict[str, List[str]]:
+        """Return the files changed by each commit in a revision range."""
+        return _parse_changed_files(self.run_git("log", *_changed_files_args(revs, include_merges)))
+
+
+GIT_BACKENDS = {"gitpython": GitPythonBackend, "subprocess": SubprocessBackend}
+"""The backends selectable with the `git_backend` configuration option."""
+
+
+def get_backend(repository: Repo, config: Optional[Configuration] = None) -> GitBackend:
+    """
+    Return the backend configured to read a repository.
+
+    Args:
+        repository: The repository to read.
+        config: The configuration to use. If ``None``, the global config is used.
+
+    Returns:
+        The backend for the repository.
+
+    Raises:
+        UsageError: If the configured backend doesn't exist.
+    """
+    if config is None:
+        config = get_config()
+
+    backend_class = GIT_BACKENDS.get(config.git_backend)
+    if backend_class is None:
+        choices = ", ".join(GIT_BACKENDS)
+        raise click.UsageError(f"Unknown git_backend '{config.git_backend}'. Choose one of: {choices}.")
+    return backend_class(repository)
+
+
 def parse_commits(
     repository: Repo,
     starting_rev: Optional[str] = None,
     ending_rev: Optional[str] = None,
     config: Optional[Configuration] = None,
-) -> list:
+    history: Optional[HistoryIndex] = None,
+    window: Optional[Set[str]] = None,
+) -> List[CommitRecord]:
     """
     Parse the commits for later processing.
 
@@ -90,9 +618,12 @@ def parse_commits(
         starting_rev: Include all commits after this revision.
         ending_rev: include all commmits before and including this revision.
         config: The configuration to use. If ``None``, the global config is used.
+        history: Reuse the commit records and changed files in this index, and add new records to it.
+        window: Only include these commits, such as those returned by
+            [`get_window`][generate_changelog.git_ops.get_window].
 
     Returns:
-        A list of CommitInfo objects.
+        A list of CommitRecord objects. Their changed files are prefetched if the configuration uses them.
     """
     if config is None:
         config = get_config()
@@ -106,49 +637,212 @@ def parse_commits(
     else:
         revs = "HEAD"
 
-    log_opts = ["-z", "--topo-order", "--pretty=tformat:%H"]
+    backend = get_backend(repository, config)
+    with profile_stage("range parsing"):
+        shas = backend.walk(revs, config.include_merges, paths=config.paths)
+        warn_if_truncated(repository, shas, revs)
+        if window is not None:
+            shas = [sha for sha in shas if sha in window]
+        return _load_records(backend, shas, revs, config, history)
 
-    if not config.include_merges:
-        log_opts.append("--no-merges")
 
-    log_opts.append(revs)
-    out: str = repository.git.log(*log_opts)
-    commits = out.split("\x00")
-    return [repository.commit(commit) for commit in commits if commit]
+def get_window(repository: Repo, config: Configuration) -> Optional[List[str]]:
+    """
+    Return the commits in the configured window of recent history.
 
+    Args:
+        repository: The repository object.
+        config: The configuration with the `since`, `until` and `max_commits` options.
 
-def get_tags(repository: Repo) -> List[TagInfo]:
+    Returns:
+        The SHAs of the commits reachable from `HEAD` in the window, most recent first, or `None` if the history
+        isn't limited.
     """
-    Get all the tags in a repository.
+    limits = window_limits(config)
+    if not limits:
+        return None
+    with profile_stage("range parsing"):
+        return get_backend(repository, config).walk("HEAD", config.include_merges, limits, config.paths)
+
+
+def _window_start(
+    backend: GitBackend, tags: List[TagInfo], window: List[str], starting_tag: Optional[str]
+) -> Optional[str]:
+    """Return the most recent tag outside the window and older than it, or the starting tag if it comes first."""
+    if not window:
+        return tags[0].name if tags else starting_tag
+    (oldest,) = backend.get_commits(window[-1:])
+    in_window = set(window)
+    for tag in tags:
+        if tag.name == starting_tag:
+            return starting_tag
+        if tag.commit not in in_window and tag.tagged_datetime < oldest.committed_datetime:
+            return tag.name
+    return starting_tag
+
+
+def shallow_commits(repository: Repo) -> Set[str]:
+    """
+    Return the commits at the boundary of a shallow repository, whose parents are missing.
 
     Args:
-        repository: The repository object containing the tags
+        repository: The repository object.
 
     Returns:
-        A list of TagInfo objects with the most recent first
+        The SHAs of the boundary commits, or an empty set if the repository has its full history.
     """
-    tags = repository.tags
-    tags_list = []
+    shallow_path = os.path.join(repository.common_dir, "shallow")
+    if not os.path.exists(shallow_path):
+        return set()
+    with open(shallow_path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
 
-    for tag in tags:
-        commit = tag.commit
-        if tag.tag:
-            tzoffset = datetime.timedelta(seconds=-tag.tag.tagger_tz_offset)
-            tzone = datetime.timezone(tzoffset)
-            tag_datetime = datetime.datetime.fromtimestamp(tag.tag.tagged_date, tzone)
-            tagger = tag.tag.tagger
-        else:
-            tag_datetime = tag.commit.committed_datetime
-            tagger = tag.commit.committer
-
-        tag_info = TagInfo(
-            name=tag.name,
-            commit=commit.hexsha,
-            tagger=tagger,
-            tagged_datetime=tag_datetime,
+
+def warn_if_truncated(repository: Repo, shas: Iterable[str], revs: str) -> bool:
+    """
+    Warn if the commits of a range reach the boundary of a shallow repository, so older commits may be missing.
+
+    Args:
+        repository: The repository object.
+        shas: The SHAs of the commits in the range.
+        revs: The revision range, for the warning.
+
+    Returns:
+        `True` if the range reaches the boundary.
+    """
+    boundary = shallow_commits(repository) if shas else set()
+    reached = boundary.intersection(shas)
+    if reached:
+        logger.warning(
+            f"The repository is a shallow clone, and '{revs}' reaches its boundary at {len(reached)} commit(s), so "
+            "older commits may be missing. Use `generate-changelog plan-fetch` to deepen it."
         )
-        tags_list.append(tag_info)
+    return bool(reached)
+
+
+def _load_records(
+    backend: GitBackend, shas: List[str], revs: str, config: Configuration, history: Optional[HistoryIndex]
+) -> List[CommitRecord]:
+    """
+    Return the records of commits in a range, reusing those in the history index.
+
+    The changed files come from the history index. Without one, they are read for the whole range at once: now if the
+    configuration uses them, or when a record's files are first accessed.
+    """
+    from generate_changelog.prefetch import commit_fields_used
+
+    records = history.commits if history is not None else {}
+    new_shas = [sha for sha in shas if sha not in records]
+    if not new_shas:
+        return [records[sha] for sha in shas]
+
+    changed_files = history.changed_files if history is not None else None
+    range_files = RangeFiles(backend, revs, config.include_merges)
+    if changed_files is None and "files" in commit_fields_used(config):
+        changed_files = range_files.load()
+    for record in backend.get_commits(new_shas):
+        if changed_files is not None:
+            record.files = changed_files.get(record.hexsha, [])
+        else:
+            record.files_loader = range_files
+        records[record.hexsha] = record
+    return [records[sha] for sha in shas]
 
+
+def get_changed_files(repository: Repo, config: Optional[Configuration] = None) -> Dict[str, List[str]]:
+    """
+    Get the files changed by every commit reachable from `HEAD` with a single `git log`.
+
+    Args:
+        repository: The repository object.
+        config: The configuration to use. If ``None``, the global config is used.
+
+    Returns:
+        The paths of the changed files by commit SHA.
+    """
+    if config is None:
+        config = get_config()
+
+    with profile_stage("changed files"):
+        return get_backend(repository, config).changed_files("HEAD", config.include_merges)
+
+
+def get_history_index(repository: Repo, config: Optional[Configuration] = None) -> HistoryIndex:
+    """
+    Collect the tags and changed files of a repository in one pass.
+
+    Args:
+        repository: The repository object.
+        config: The configuration to use. If ``None``, the global config is used.
+
+    Returns:
+        The history index to share between changelogs.
+    """
+    with profile_stage("tag discovery"):
+        tags = get_tags(repository, config)
+    return HistoryIndex(tags=tags, changed_files=get_changed_files(repository, config))
+
+
+def enable_history_cache() -> None:
+    """
+    Reuse the history index of a repository while its `HEAD` and refs don't change.
+
+    Long-running processes use this so the tags, commit records and changed files are read once, and read again
+    only after a commit, checkout, fetch or tag.
+    """
+    global _HISTORY_CACHE  # noqa: PLW0603
+    if _HISTORY_CACHE is None:
+        _HISTORY_CACHE = {}
+
+
+def _refs_state(repository: Repo) -> str:
+    """Return the commits `HEAD` and the refs point to, which change whenever the history does."""
+    try:
+        return repository.git.show_ref("--head")
+    except GitCommandError:
+        # A repository without any refs
+        return ""
+
+
+def cached_history_index(repository: Repo, config: Optional[Configuration] = None) -> Optional[HistoryIndex]:
+    """
+    Return the shared history index of a repository, if the history cache is enabled.
+
+    The index is read again when `HEAD` or any ref points somewhere else.
+
+    Args:
+        repository: The repository object.
+        config: The configuration to use. If ``None``, the global config is used.
+
+    Returns:
+        The history index, or ``None`` if the history cache isn't enabled.
+    """
+    if _HISTORY_CACHE is None:
+        return None
+    if config is None:
+        config = get_config()
+
+    key = (os.path.abspath(repository.git_dir), config.git_backend, config.include_merges)
+    state = _refs_state(repository)
+    cached = _HISTORY_CACHE.get(key)
+    if cached is None or cached[0] != state:
+        logger.debug(f"Reading the history index of {repository.git_dir}.")
+        cached = _HISTORY_CACHE[key] = (state, get_history_index(repository, config))
+    return cached[1]
+
+
+def get_tags(repository: Repo, config: Optional[Configuration] = None) -> List[TagInfo]:
+    """
+    Get all the tags in a repository.
+
+    Args:
+        repository: The repository object containing the tags
+        config: The configuration to use. If ``None``, the global config is used.
+
+    Returns:
+        A list of TagInfo objects with the most recent first
+    """
+    tags_list = get_backend(repository, config).list_tags()
     tags_list.sort(key=lambda t: t.tagged_datetime, reverse=True)
 
     return tags_list
@@ -159,6 +853,7 @@ def get_commits_by_tags(
     tag_filter_pattern: str,
     starting_tag: Optional[str] = None,
     config: Optional[Configuration] = None,
+    history: Optional[HistoryIndex] = None,
 ) -> List[GitTag]:
     """
     Group commits by the tags they belong to.
@@ -168,14 +863,45 @@ def get_commits_by_tags(
         tag_filter_pattern: A regular expression pattern that matches valid tags as versions
         starting_tag: Only include tags after this one
         config: The configuration to use. If ``None``, the global config is used.
+        history: Use the tags and commit objects in this index instead of reading them again. The groups are kept in
+            the index and reused by later calls with the same tag pattern, starting tag and history options.
 
     Returns:
         A list of dictionaries with tag information with most recent first
     """
-    from generate_changelog.utilities import pairs
+    if config is None:
+        config = get_config()
+    if history is None:
+        return _group_commits_by_tags(repository, tag_filter_pattern, starting_tag, config, history)
+
+    key = (
+        tag_filter_pattern,
+        starting_tag,
+        config.git_backend,
+        config.include_merges,
+        tuple(config.paths),
+        config.commit_graph,
+        config.since,
+        config.until,
+        config.max_commits,
+    )
+    if key not in history.versions:
+        history.versions[key] = _group_commits_by_tags(repository, tag_filter_pattern, starting_tag, config, history)
+    return list(history.versions[key])
+
 
-    tags = [tag for tag in get_tags(repository) if re.match(tag_filter_pattern, tag.name)]
-    head_commit = repository.commit("HEAD")
+def _group_commits_by_tags(
+    repository: Repo,
+    tag_filter_pattern: str,
+    starting_tag: Optional[str],
+    config: Configuration,
+    history: Optional[HistoryIndex],
+) -> List[GitTag]:
+    """Group commits by the tags they belong to, reading the tags from the history index if there is one."""
+    with profile_stage("tag discovery"):
+        all_tags = history.tags if history is not None else get_tags(repository, config)
+        tags = [tag for tag in all_tags if re.match(tag_filter_pattern, tag.name)]
+    (head_commit,) = get_backend(repository, config).get_commits(["HEAD"])
     head_tagger = head_commit.committer.name
     if head_commit.committer.email:
         head_tagger += f" <{head_commit.committer.email}>"
@@ -186,7 +912,33 @@ def get_commits_by_tags(
         tagger=head_tagger,
         tagged_datetime=head_commit.committed_datetime,
     )
-    tags.insert(0, head)
+    window_shas = get_window(repository, config)
+    window = set(window_shas) if window_shas is not None else None
+    if config.commit_graph != "off":
+        groups = get_commits_by_topology(repository, head, tags, starting_tag, config, history, window)
+    else:
+        # Tags older than the window are pruned by starting at the most recent one
+        if window_shas is not None:
+            starting_tag = _window_start(get_backend(repository, config), tags, window_shas, starting_tag)
+        groups = _get_commits_by_ranges(repository, [head, *tags], starting_tag, config, history, window)
+
+    if window is not None:
+        # Leave out the versions newer than the window
+        groups[1:] = [group for group in groups[1:] if group.commits or group.tag_info.commit in window]
+    return groups
+
+
+def _get_commits_by_ranges(
+    repository: Repo,
+    tags: List[TagInfo],
+    starting_tag: Optional[str],
+    config: Configuration,
+    history: Optional[HistoryIndex],
+    window: Optional[Set[str]],
+) -> List[GitTag]:
+    """Group commits by the range between each pair of consecutive tags, most recent first, with a `git log` each."""
+    from generate_changelog.utilities import pairs
+
     groups = []
     for end_tag, start_tag in pairs(tags):
         start_tag_name = getattr(start_tag, "name", None)
@@ -194,10 +946,134 @@ def get_commits_by_tags(
             GitTag(
                 tag_name=end_tag.name,
                 tag_info=end_tag,
-                commits=parse_commits(repository, start_tag_name, end_tag.name, config),
+                commits=parse_commits(repository, start_tag_name, end_tag.name, config, history, window),
             )
         )
         if starting_tag and start_tag_name == starting_tag:
             break
+    return groups
 
+
+COMMIT_GRAPH_MODES = ("off", "use", "write")
+"""The values of the `commit_graph` configuration option."""
+
+
+def ensure_commit_graph(repository: Repo) -> bool:
+    """
+    Write the repository's commit-graph file if it doesn't have one.
+
+    Git stores the generation number of each commit in the commit-graph, which makes topological walks much faster.
+
+    Args:
+        repository: The repository object.
+
+    Returns:
+        `True` if the commit-graph was written.
+    """
+    info_dir = os.path.join(repository.git_dir, "objects", "info")
+    if os.path.exists(os.path.join(info_dir, "commit-graph")) or os.path.exists(
+        os.path.join(info_dir, "commit-graphs")
+    ):
+        return False
+    with profile_stage("commit-graph"):
+        repository.git.commit_graph("write", "--reachable")
+    return True
+
+
+def get_commits_by_topology(
+    repository: Repo,
+    head: TagInfo,
+    tags: List[TagInfo],
+    starting_tag: Optional[str],
+    config: Configuration,
+    history: Optional[HistoryIndex] = None,
+    window: Optional[Set[str]] = None,
+) -> List[GitTag]:
+    """
+    Group commits by the tags they belong to, with one topological walk of the history.
+
+    Tags are ordered by ancestry instead of date, so clock skew doesn't reorder them. Each commit belongs to the oldest
+    tag that contains it, so commits merged from other branches appear in exactly one version. Tags that aren't
+    ancestors of `HEAD`, or are older than the configured `since` date, are left out.
+
+    Args:
+        repository: The git repository object
+        head: The tag information for `HEAD`.
+        tags: The version tags, most recent first.
+        starting_tag: Only include tags after this one
+        config: The configuration to use.
+        history: Reuse the commit records and changed files in this index.
+        window: Only include these commits, such as those returned by
+            [`get_window`][generate_changelog.git_ops.get_window].
+
+    Returns:
+        The `HEAD` group followed by the tag groups, most recent first.
+
+    Raises:
+        UsageError: If the `commit_graph` option is not valid.
+    """
+    if config.commit_graph not in COMMIT_GRAPH_MODES:
+        choices = ", ".join(COMMIT_GRAPH_MODES)
+        raise click.UsageError(f"Unknown commit_graph '{config.commit_graph}'. Choose one of: {choices}.")
+    if config.commit_graph == "write":
+        ensure_commit_graph(repository)
+
+    backend = get_backend(repository, config)
+    revs = f"{starting_tag}..HEAD" if starting_tag else "HEAD"
+    with profile_stage("range parsing"):
+        # Only `--since` prunes the walk. The newer commits are needed to find the tags of the commits in the window.
+        walk = backend.walk_with_parents(revs, [f"--since={config.since}"] if config.since else [])
+        position = {sha: index for index, (sha, _) in enumerate(walk)}
+        warn_if_truncated(repository, position, revs)
+
+        # The tags of each commit, most recent first. The commit's ancestors are assigned to the last one.
+        tags_by_commit: Dict[str, List[TagInfo]] = {}
+        for tag in tags:
+            if tag.commit in position:
+                tags_by_commit.setdefault(tag.commit, []).append(tag)
+
+        members = _assign_versions(walk, {sha: position[sha] for sha in tags_by_commit}, config.include_merges)
+        if config.paths:
+            # The walk needs every commit to find the tags, so the paths are applied separately
+            in_paths = set(backend.walk(revs, config.include_merges, paths=config.paths))
+            window = in_paths if window is None else window & in_paths
+        if window is not None:
+            members = {label: [sha for sha in shas if sha in window] for label, shas in members.items()}
+        member_shas = [sha for shas in members.values() for sha in shas]
+        records = dict(zip(member_shas, _load_records(backend, member_shas, revs, config, history)))
+
+    def group(tag: TagInfo, label: Optional[int]) -> GitTag:
+        """Return the version of a tag with the commits of a label."""
+        return GitTag(tag.name, tag, [records[sha] for sha in members.get(label, [])])
+
+    groups = [group(head, -1)]
+    for commit_sha in sorted(tags_by_commit, key=position.__getitem__):
+        *newer_tags, owner = tags_by_commit[commit_sha]
+        groups.extend(group(tag, None) for tag in newer_tags)
+        groups.append(group(owner, position[commit_sha]))
     return groups
+
+
+def _assign_versions(
+    walk: List[Tuple[str, List[str]]], tag_positions: Dict[str, int], include_merges: bool
+) -> Dict[int, List[str]]:
+    """
+    Assign each commit of a topological walk to the oldest tagged commit that contains it.
+
+    The walk lists children before parents, so a tagged commit's position grows with its age. A commit's label is the
+    largest position of the tagged commits it is an ancestor of, or -1 if only `HEAD` contains it. Each commit passes
+    its label on to its parents, so one pass over the walk labels every commit.
+
+    Returns:
+        The SHAs of the commits by label, in topological order.
+    """
+    labels: Dict[str, int] = {}
+    members: Dict[int, List[str]] = {}
+    for sha, parents in walk:
+        label = max(labels.pop(sha, -1), tag_positions.get(sha, -1))
+        if include_merges or len(parents) <= 1:
+            members.setdefault(label, []).append(sha)
+        for parent in parents:
+            if labels.get(parent, -1) < label:
+                labels[parent] = label
+    return members
@@ -0,0 +1,136 @@
+"""
+Parse, format and map the identities of committers and authors.
+
+Identities are `Name <email>` contacts. Parsing and formatting are cached for the whole process, so the work grows with
+the number of people instead of the number of commits and trailers. An
+[`IdentityResolver`][generate_changelog.identity.IdentityResolver] maps contacts through the repository's `.mailmap`,
+reading the new contacts of a batch with a single `git check-mailmap --stdin`.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+from git import GitCommandError, Repo
+
+CONTACT_PATTERN = re.compile(r"^(?P<name>[^<]+)\s+(?:<(?P<email>[^>]+)>)?$")
+"""Splits a `Name <email>` contact. The email is optional."""
+
+MAILMAP_CONTACT_PATTERN = re.compile(r"^[^<>\n]+ <[^<>\n]*>$")
+"""Contacts `git check-mailmap` can parse. Others are left as they are."""
+
+
+@lru_cache(maxsize=4096)
+def parse_contact(contact: str) -> Tuple[str, str]:
+    """
+    Split a contact into a name and an email.
+
+    Args:
+        contact: A contact like `Name <email>`.
+
+    Returns:
+        The name and email. If the contact has no email, the name is the whole contact and the email is empty.
+    """
+    if match := CONTACT_PATTERN.match(contact):
+        return match.group("name"), match.group("email") or ""
+    return contact, ""
+
+
+@lru_cache(maxsize=4096)
+def format_contact(name: str, email: str) -> str:
+    """
+    Format a name and email as an interned `Name <email>` contact.
+
+    Args:
+        name: The person's name.
+        email: The person's email.
+
+    Returns:
+        The contact. Equal contacts share one string.
+    """
+    return sys.intern(f"{name} <{email}>")
+
+
+def has_mailmap(repository: Repo) -> bool:
+    """
+    Return whether git would find a mailmap for a repository.
+
+    Args:
+        repository: The repository to check.
+
+    Returns:
+        `True` if the repository has a `.mailmap` or configures a mailmap file or blob.
+    """
+    from generate_changelog.cat_file import get_cat_file
+
+    config_reader = repository.config_reader()
+    if config_reader.has_option("mailmap", "file") or config_reader.has_option("mailmap", "blob"):
+        return True
+    if repository.working_tree_dir:
+        return os.path.exists(os.path.join(repository.working_tree_dir, ".mailmap"))
+    # Bare repositories read the mailmap from `HEAD` by default
+    return get_cat_file(repository.git_dir).check(["HEAD:.mailmap"])[0] is not None
+
+
+class IdentityResolver:
+    """
+    Maps contacts to the canonical names and emails in a repository's `.mailmap`.
+
+    Mapped contacts are cached, so each contact is only sent to git once.
+
+    Args:
+        repository: The repository whose mailmap is used. If `None`, contacts are not mapped.
+    """
+
+    def __init__(self, repository: Optional[Repo] = None):
+        self.repository = repository
+        self._mapped: Dict[str, str] = {}
+
+    def resolve_all(self, contacts: Iterable[str]) -> None:
+        """
+        Map the new contacts among these with one `git check-mailmap` command.
+
+        Args:
+            contacts: The contacts to map.
+        """
+        new_contacts = [contact for contact in dict.fromkeys(contacts) if contact not in self._mapped]
+        valid = [contact for contact in new_contacts if MAILMAP_CONTACT_PATTERN.match(contact)]
+        mapped = self._check_mailmap(valid) if valid and self.repository is not None else valid
+        self._mapped.update(zip(valid, map(sys.intern, mapped)))
+        for contact in new_contacts:
+            self._mapped.setdefault(contact, sys.intern(contact))
+
+    def resolve(self, contact: str) -> str:
+        """
+        Return the canonical form of a contact.
+
+        Args:
+            contact: A contact like `Name <email>`.
+
+        Returns:
+            The mapped contact, or the contact itself if the mailmap doesn't change it.
+        """
+        if contact not in self._mapped:
+            self.resolve_all([contact])
+        return self._mapped[contact]
+
+    def _check_mailmap(self, contacts: list) -> list:
+        """Map contacts with `git check-mailmap`, raising a `GitCommandError` if it fails."""
+        repository: Repo = self.repository  # type: ignore[assignment]
+        command = ["git", "check-mailmap", "--stdin"]
+        result = subprocess.run(  # noqa: S603
+            command,
+            cwd=repository.working_tree_dir or repository.git_dir,
+            input="".join(f"{contact}\n" for contact in contacts),
+            capture_output=True,
+            encoding="utf-8",
+            errors="replace",
+            check=False,
+        )
+        lines = result.stdout.splitlines()
+        if result.returncode != 0 or len(lines) != len(contacts):
+            raise GitCommandError(command, result.returncode, result.stderr)
+        return lines
@@ -0,0 +1,146 @@
+"""
+Generate the changelogs of several projects in one repository.
+
+Each project in the [`projects`][generate_changelog.configuration.Configuration.projects] configuration owns the
+files matching its `path` patterns. The repository's tags and changed files are read once and shared by all projects.
+Projects with the same tag pattern, starting tag and history options also share one grouping of the commits by
+version. Each project gets the commits that change its files, and its own configuration, release hint and changelog.
+"""
+
+import copy
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import rich_click as click
+from git import Repo
+
+from generate_changelog import git_ops
+from generate_changelog.configuration import Configuration
+from generate_changelog.indented_logger import get_indented_logger
+from generate_changelog.runner import run_changelog
+from generate_changelog.templating import RenderedChangelog
+
+logger = get_indented_logger(__name__)
+
+PROJECT_KEYS = ("name", "path")
+"""Project keys that are not configuration options."""
+
+GLOB_CHARACTERS = re.compile(r"[*?\[]")
+"""Characters that make a project path a glob pattern instead of a directory."""
+
+
+@dataclass
+class ProjectChangelog:
+    """The results of generating the changelog of one project."""
+
+    name: str
+    """The name of the project."""
+
+    configuration: Configuration
+    """The configuration used for the project."""
+
+    starting_tag: Optional[str]
+    """The tag the changelog was generated from, if any."""
+
+    release_hint: str
+    """The suggested release type of the project."""
+
+    rendered: RenderedChangelog
+    """The rendered changelog of the project."""
+
+
+def project_paths(project: dict) -> List[str]:
+    """
+    Return the glob patterns that match the files of a project.
+
+    A path without glob characters is a directory, and matches every file below it.
+
+    Args:
+        project: The project configuration.
+
+    Returns:
+        The glob patterns for the project's files.
+
+    Raises:
+        click.UsageError: If the project doesn't have a name or a path.
+    """
+    name = project.get("name")
+    if not name:
+        raise click.UsageError("Each project in the `projects` configuration needs a `name`.")
+
+    paths = project.get("path")
+    if not paths:
+        raise click.UsageError(f"The project '{name}' needs a `path`.")
+
+    if isinstance(paths, str):
+        paths = [paths]
+    return [path if GLOB_CHARACTERS.search(path) else f"{path.rstrip('/')}/*" for path in paths]
+
+
+def project_configuration(config: Configuration, project: dict) -> Configuration:
+    """
+    Create the configuration of a project from the repository configuration and the project's options.
+
+    Args:
+        config: The repository configuration.
+        project: The project configuration. Keys other than `name` and `path` override configuration options.
+
+    Returns:
+        A new configuration for the project.
+    """
+    project_config = copy.deepcopy(config)
+    project_config.__dict__.pop("rendered_variables", None)  # Clear the cached property so it is re-rendered
+    project_config.projects = []
+    project_config.update_from_dict({key: val for key, val in project.items() if key not in PROJECT_KEYS})
+
+    if config.report_path:
+        report_path = Path(config.report_path)
+        project_config.report_path = report_path.with_name(f"{report_path.stem}-{project['name']}{report_path.suffix}")
+    return project_config
+
+
+def generate_project_changelogs(
+    repository: Repo,
+    config: Configuration,
+    branch_name: str,
+    run_output_pipeline: bool = True,
+) -> List[ProjectChangelog]:
+    """
+    Generate the changelog and release hint of every configured project.
+
+    Args:
+        repository: The git repository to evaluate.
+        config: The repository configuration with the `projects`.
+        branch_name: The name of the branch for release hint decisions.
+        run_output_pipeline: Run each project's output pipeline with its rendered changelog.
+
+    Returns:
+        The results for each project, in configuration order.
+    """
+    history = git_ops.cached_history_index(repository, config) or git_ops.get_history_index(repository, config)
+    logger.info(f"Read {len(history.tags)} tags and {len(history.changed_files)} commits.")
+
+    results = []
+    for project in config.projects:
+        paths = project_paths(project)
+        project_config = project_configuration(config, project)
+        logger.info(f"Generating the change log of project '{project['name']}'.")
+        logger.indent()
+
+        result = run_changelog(
+            repository, project_config, branch_name, None, run_output_pipeline, history=history, paths=paths
+        )
+
+        logger.dedent()
+        results.append(
+            ProjectChangelog(
+                name=project["name"],
+                configuration=project_config,
+                starting_tag=result.starting_tag,
+                release_hint=result.release_hint,
+                rendered=result.rendered,
+            )
+        )
+    return results
@@ -1,9 +1,12 @@
 """Parse the changelog and return the release notes."""
 
+import mmap
+import os
 import re
+from dataclasses import dataclass
 from itertools import islice, tee, zip_longest
 from pathlib import Path
-from typing import Any, Iterable, Iterator, List, Optional, Tuple
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
 
 from generate_changelog.configuration import Configuration, get_config
 
@@ -14,6 +17,23 @@ class MissingConfigurationError(Exception):
     pass
 
 
+@dataclass(frozen=True)
+class ChangelogSection:
+    """The location of a version section within a changelog file."""
+
+    version: str
+    """The version captured by the section pattern."""
+
+    heading_start: int
+    """The byte offset of the start of the section heading."""
+
+    start: int
+    """The byte offset just after the section heading, where the notes begin."""
+
+    end: int
+    """The byte offset where the notes end: the start of the next heading or the end of the file."""
+
+
 def pairs(iterable: Iterable) -> Iterator[Tuple[Any, Any]]:
     """
     Return successive non-overlapping pairs taken from the input iterable.
@@ -62,6 +82,69 @@ def split_changelog(
     return list(pairs(parts))
 
 
+def iter_changelog_sections(
+    path: Union[str, Path], section_pattern: Optional[str] = None, config: Optional[Configuration] = None
+) -> Iterator[ChangelogSection]:
+    """
+    Lazily scan a changelog file for version sections.
+
+    The file is memory-mapped and searched as bytes, so only the pages up to the last requested section are read.
+    Stop iterating as soon as you have what you need.
+
+    Args:
+        path: The path to the changelog file.
+        section_pattern: A regex pattern that matches version headings.
+            If `None`, the pattern is derived from the [`starting_tag_pipeline`]
+            [generate_changelog.configuration.Configuration.starting_tag_pipeline] configuration option.
+        config: The configuration to use. If ``None``, the global config is used.
+
+    Yields:
+        The location of each version section, most recent first.
+    """
+    section_pattern = section_pattern or get_section_pattern(config)
+    regex = re.compile(section_pattern.encode("utf-8"))
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as contents:
+            previous: Optional[re.Match] = None
+            for match in regex.finditer(contents):
+                if previous is not None:
+                    yield _make_section(previous, match.start())
+                previous = match
+            if previous is not None:
+                yield _make_section(previous, len(contents))
+
+
+def _make_section(match: re.Match, end: int) -> ChangelogSection:
+    """Convert a heading match and the end of its notes into a `ChangelogSection`."""
+    version = match.group(1) if match.re.groups else match.group(0)
+    return ChangelogSection(
+        version=(version or b"").decode("utf-8"),
+        heading_start=match.start(),
+        start=match.end(),
+        end=end,
+    )
+
+
+def read_section(path: Union[str, Path], section: ChangelogSection) -> str:
+    """
+    Read the notes of a section from a changelog file.
+
+    Args:
+        path: The path to the changelog file.
+        section: The section location returned by [`iter_changelog_sections`]
+            [generate_changelog.notes.iter_changelog_sections].
+
+    Returns:
+        The decoded notes of the section.
+    """
+    with open(path, "rb") as f:
+        f.seek(section.start)
+        return f.read(section.end - section.start).decode("utf-8")
+
+
 def get_section_pattern(config: Optional[Configuration] = None) -> str:
     """
     Get the version section pattern for the changelog.
@@ -152,13 +235,7 @@ def get_version_notes(version: str, config: Optional[Configuration] = None) -> s
     if config is None:
         config = get_config()
     changelog_path = get_changelog_path(config)
-    changelog_contents = changelog_path.read_text()
 
-    return next(
-        (
-            notes.strip()
-            for vrsn, notes in split_changelog(changelog_contents, config=config)
-            if vrsn.startswith(version)
-        ),
-        "",
-    )
+    sections = iter_changelog_sections(changelog_path, config=config)
+    section = next((section for section in sections if section.version.startswith(version)), None)
+    return read_section(changelog_path, section).strip() if section else ""
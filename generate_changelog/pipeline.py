@@ -1,12 +1,26 @@
 """Simple pipeline workflow processing."""
 
-from typing import Any, Callable, Optional, Union
+import copy
+import inspect
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 from generate_changelog.actions import BUILT_INS
 from generate_changelog.indented_logger import get_indented_logger
+from generate_changelog.pipeline_hooks import PipelineHook, active_hooks, run_batch_with_hooks, run_with_hooks
+from generate_changelog.utilities import parse_duration
 
 logger = get_indented_logger(__name__)
 
+METADATA_FUNC_NAMES = {"save_commit_metadata", "save_version_metadata"}
+"""Keyword argument values that are replaced with metadata callbacks."""
+
+TEMPLATE_MARKERS = ("{{", "{%", "{#")
+"""Strings that start Jinja syntax. Arguments without them render the same in every context."""
+
+_PIPELINE_CACHE: Optional[Dict[str, List["Action"]]] = None
+"""Actions built by `pipeline_factory`, by their JSON-encoded action list, when caching is enabled."""
+
 
 def noop_func(*args, **kwargs) -> None:
     """A function that does nothing when called."""
@@ -22,12 +36,17 @@ class Pipeline:
     context: dict
     """The current state of the pipeline initialized by keyword arguments."""
 
+    hooks: tuple
+    """Hooks notified of each action run, in addition to the globally registered hooks."""
+
     def __init__(
         self,
         actions: Union[list, tuple],
+        hooks: Optional[Iterable[PipelineHook]] = None,
         **kwargs,
     ):
         self.actions = tuple(actions)
+        self.hooks = tuple(hooks or ())
         self.context = kwargs.copy()
 
     def run(self, input_value: Optional[str] = None) -> str:
@@ -41,12 +60,49 @@ class Pipeline:
             The processed result of the pipeline.
         """
         result = current_input = input_value or ""
+        hooks = active_hooks(self.hooks)
         for step, action in enumerate(self.actions):
-            result = action.run(self.context.copy(), current_input)
+            if hooks:
+                result = run_with_hooks(hooks, action, self.context.copy(), current_input)
+            else:
+                result = action.run(self.context.copy(), current_input)
             step_key = action.id or f"result_{step}"
             self.context[step_key] = current_input = result
         return result or ""
 
+    def run_batch(
+        self,
+        input_values: Sequence[Optional[str]],
+        commit_metadata_funcs: Optional[Sequence[Callable]] = None,
+        version_metadata_funcs: Optional[Sequence[Callable]] = None,
+    ) -> List[str]:
+        """
+        Run the pipeline on many inputs, passing all of them through each action in turn.
+
+        Each input gets its own copy of the context. Actions that can process all the inputs at once, using
+        [`Action.run_batch`][generate_changelog.pipeline.Action.run_batch], do so. The context of the pipeline
+        isn't changed.
+
+        Args:
+            input_values: The values to start the pipeline with.
+            commit_metadata_funcs: The callables that actions use to set the commit metadata of each input. If
+                ``None``, all the inputs share the callable the actions were created with.
+            version_metadata_funcs: The callables that actions use to set version metadata for each input. If
+                ``None``, all the inputs share the callable the actions were created with.
+
+        Returns:
+            The processed results, in the order of the inputs.
+        """
+        results = [input_value or "" for input_value in input_values]
+        contexts = [self.context.copy() for _ in results]
+        hooks = active_hooks(self.hooks)
+        for step, action in enumerate(self.actions):
+            results = action.run_batch(contexts, results, commit_metadata_funcs, hooks, version_metadata_funcs)
+            step_key = action.id or f"result_{step}"
+            for context, result in zip(contexts, results):
+                context[step_key] = result
+        return [result or "" for result in results]
+
 
 class Action:
     """An action to perform in a pipeline."""
@@ -69,6 +125,15 @@ class Action:
     version_metadata_func: Optional[Callable]
     """Function the action can call to set metadata about the version a commit belongs to."""
 
+    cache: bool = False
+    """Reuse the result of a previous call with the same arguments and input."""
+
+    cache_ttl: Optional[float] = None
+    """The number of seconds a cached result is valid. `None` means it doesn't expire."""
+
+    _static_arguments: Dict[str, Tuple[list, dict]]
+    """The arguments rendered once for batches, shared with the copies of the action."""
+
     def __init__(
         self,
         action: str,
@@ -77,6 +142,8 @@ class Action:
         kwargs: Optional[dict] = None,
         commit_metadata_func: Optional[Callable] = None,
         version_metadata_func: Optional[Callable] = None,
+        cache: bool = False,
+        cache_ttl: Union[str, int, float, None] = None,
     ):
         self._action_str = action
         self.id = id_
@@ -84,6 +151,13 @@ class Action:
         self._kwargs = kwargs or {}
         self.commit_metadata_func = commit_metadata_func or noop_func
         self.version_metadata_func = version_metadata_func or noop_func
+        self.cache_ttl = parse_duration(cache_ttl)
+        self.cache = cache
+        self._static_arguments = {}
+
+        if cache and any(isinstance(val, str) and val in METADATA_FUNC_NAMES for val in self._kwargs.values()):
+            logger.warning(f"Action '{action}' saves metadata, so its results can't be cached.")
+            self.cache = False
 
         if action in BUILT_INS:
             self.action_function = BUILT_INS[action]
@@ -94,6 +168,11 @@ class Action:
                 logger.warning(f"Action '{action}' not found. Using noop function.")
                 self.action_function = noop_func
 
+    @property
+    def name(self) -> str:
+        """The identifier of the action, or the name of the action function if it doesn't have one."""
+        return self.id or self._action_str
+
     def run(self, context: dict, input_value: Any) -> str:
         """
         Perform the action on the input.
@@ -105,9 +184,141 @@ class Action:
         Returns:
             The processed string
         """
+        new_args, new_kwargs = self._render(context)
+
+        if self.cache:
+            from generate_changelog.action_cache import MISSING, get_action_cache, make_key
+
+            cache = get_action_cache()
+            cache_key = make_key(self._action_str, new_args, new_kwargs, input_value)
+            result = cache.get(cache_key)
+            if result is MISSING:
+                result = self._call(new_args, new_kwargs, input_value)
+                cache.set(cache_key, result, self.cache_ttl)
+            return result
+
+        return self._call(new_args, new_kwargs, input_value)
+
+    def run_batch(
+        self,
+        contexts: Sequence[dict],
+        input_values: Sequence[Any],
+        commit_metadata_funcs: Optional[Sequence[Callable]] = None,
+        hooks: Tuple[PipelineHook, ...] = (),
+        version_metadata_funcs: Optional[Sequence[Callable]] = None,
+    ) -> List[str]:
+        """
+        Perform the action on many inputs.
+
+        If the arguments don't use the context, they are rendered once and the action function is called for all the
+        inputs at once: action functions with a `__call_batch__(input_values)` method get a list of the inputs and
+        return a list of results. If each input saves commit metadata with its own callable, `__call_batch__` also
+        needs a `commit_metadata_funcs` keyword argument to get them. Inputs that save version metadata with their
+        own callables get their own instances. Otherwise, the action runs once per input.
+
+        Args:
+            contexts: The pipeline context of each input for rendering ``args`` and ``kwargs``
+            input_values: The values to process
+            commit_metadata_funcs: The callables that set the commit metadata of each input. If ``None``, the
+                action's ``commit_metadata_func`` is used for all of them.
+            hooks: Hooks notified of the run. A batch run is one run for the hooks.
+            version_metadata_funcs: The callables that set version metadata for each input. If ``None``, the
+                action's ``version_metadata_func`` is used for all of them.
+
+        Returns:
+            The processed strings, in the order of the inputs
+        """
+        if self.cache or not self._is_static():
+            if commit_metadata_funcs is None and version_metadata_funcs is None:
+                actions = [self] * len(input_values)
+            else:
+                actions = [
+                    self._with_metadata_funcs(commit_func, version_func)
+                    for commit_func, version_func in zip(
+                        commit_metadata_funcs or [None] * len(input_values),
+                        version_metadata_funcs or [None] * len(input_values),
+                    )
+                ]
+            if hooks:
+                return [
+                    run_with_hooks(hooks, action, context.copy(), input_value)
+                    for action, context, input_value in zip(actions, contexts, input_values)
+                ]
+            return [
+                action.run(context.copy(), input_value)
+                for action, context, input_value in zip(actions, contexts, input_values)
+            ]
+
+        if hooks:
+            return run_batch_with_hooks(
+                hooks,
+                self,
+                input_values,
+                lambda: self._call_static_batch(input_values, commit_metadata_funcs, version_metadata_funcs),
+            )
+        return self._call_static_batch(input_values, commit_metadata_funcs, version_metadata_funcs)
+
+    def _call_static_batch(
+        self,
+        input_values: Sequence[Any],
+        commit_metadata_funcs: Optional[Sequence[Callable]],
+        version_metadata_funcs: Optional[Sequence[Callable]],
+    ) -> List[str]:
+        """Render the arguments once and call the action function with all the inputs."""
+        if "rendered" not in self._static_arguments:
+            self._static_arguments["rendered"] = self._render({})
+        new_args, new_kwargs = self._static_arguments["rendered"]
+        action_function = self._instantiate(new_args, new_kwargs)
+        call_batch = getattr(action_function, "__call_batch__", None)
+        saves_commit_metadata = commit_metadata_funcs is not None and "save_commit_metadata" in new_kwargs.values()
+        saves_version_metadata = version_metadata_funcs is not None and "save_version_metadata" in new_kwargs.values()
+        batches_commit_metadata = (
+            call_batch is not None and "commit_metadata_funcs" in inspect.signature(call_batch).parameters
+        )
+        if saves_version_metadata or (saves_commit_metadata and not batches_commit_metadata):
+            # Each input saves metadata to its own callables, so each needs its own instance.
+            results = [
+                self._instantiate(new_args, new_kwargs, commit_func, version_func)(input_value)
+                for commit_func, version_func, input_value in zip(
+                    commit_metadata_funcs or [None] * len(input_values),
+                    version_metadata_funcs or [None] * len(input_values),
+                    input_values,
+                )
+            ]
+        elif saves_commit_metadata:
+            results = call_batch(list(input_values), commit_metadata_funcs=list(commit_metadata_funcs))
+        elif call_batch is not None:
+            results = call_batch(list(input_values))
+        else:
+            results = [action_function(input_value) for input_value in input_values]
+        return [result or "" for result in results]
+
+    def _is_static(self) -> bool:
+        """Return whether the arguments render the same in any context."""
+        values = [*self._args, *self._kwargs.values()]
+        return not any(isinstance(val, str) and any(mark in val for mark in TEMPLATE_MARKERS) for val in values)
+
+    def _with_metadata_funcs(
+        self, commit_metadata_func: Optional[Callable], version_metadata_func: Optional[Callable]
+    ) -> "Action":
+        """Return a copy of this action that sets metadata with other callables. ``None`` keeps the action's own."""
+        action = copy.copy(self)
+        action.commit_metadata_func = commit_metadata_func or self.commit_metadata_func
+        action.version_metadata_func = version_metadata_func or self.version_metadata_func
+        return action
+
+    def _render(self, context: dict) -> Tuple[list, dict]:
+        """
+        Render the string arguments and keyword argument values using Jinja.
+
+        Args:
+            context: The current pipeline context
+
+        Returns:
+            The rendered positional and keyword arguments
+        """
         from generate_changelog.templating import get_pipeline_env
 
-        # render string args, and kwarg-values using jinja2
         new_args = [
             get_pipeline_env().from_string(arg, globals=context).render() if isinstance(arg, str) else arg
             for arg in self._args
@@ -117,21 +328,54 @@ class Action:
             key: get_pipeline_env().from_string(val, globals=context).render() if isinstance(val, str) else val
             for key, val in self._kwargs.items()
         }
+        return new_args, new_kwargs
+
+    def _call(self, new_args: list, new_kwargs: dict, input_value: Any) -> str:
+        """
+        Call the action function with the rendered arguments.
+
+        Args:
+            new_args: The rendered positional arguments
+            new_kwargs: The rendered keyword arguments
+            input_value: The value to processes
+
+        Returns:
+            The processed string
+        """
+        return self._instantiate(new_args, new_kwargs)(input_value) or ""
+
+    def _instantiate(
+        self,
+        new_args: list,
+        new_kwargs: dict,
+        commit_metadata_func: Optional[Callable] = None,
+        version_metadata_func: Optional[Callable] = None,
+    ) -> Callable:
+        """
+        Return the action function to call with the input, instantiated with the rendered arguments if there are any.
+
+        Args:
+            new_args: The rendered positional arguments
+            new_kwargs: The rendered keyword arguments
+            commit_metadata_func: The callable to set commit metadata. If ``None``, ``commit_metadata_func`` is used.
+            version_metadata_func: The callable to set version metadata. If ``None``, ``version_metadata_func`` is
+                used.
 
+        Returns:
+            The callable action
+        """
         # replace any kwarg values requesting a metadata function with the real thing
+        new_kwargs = new_kwargs.copy()
         for key, val in new_kwargs.items():
             if val == "save_commit_metadata":
-                new_kwargs[key] = self.commit_metadata_func
+                new_kwargs[key] = commit_metadata_func or self.commit_metadata_func
             elif val == "save_version_metadata":
-                new_kwargs[key] = self.version_metadata_func
+                new_kwargs[key] = version_metadata_func or self.version_metadata_func
 
         # passed in arguments or keyword arguments indicate we must instantiate the action_function
         if new_args or new_kwargs:
-            action_function = self.action_function(*new_args, **new_kwargs)
-        else:
-            action_function = self.action_function
-
-        return action_function(input_value) or ""
+            return self.action_function(*new_args, **new_kwargs)
+        return self.action_function
 
 
 def import_function(function_path: str) -> Callable:
@@ -160,6 +404,7 @@ def pipeline_factory(
     action_list: list,
     commit_metadata_func: Optional[Callable] = None,
     version_metadata_func: Optional[Callable] = None,
+    hooks: Optional[Iterable[PipelineHook]] = None,
     **kwargs: Any,
 ) -> Pipeline:
     """
@@ -169,11 +414,30 @@ def pipeline_factory(
         action_list: A `list` of `dict` that specify [`Action`][generate_changelog.pipeline.Action] attributes
         commit_metadata_func: Optional callable that actions can use to set commit metadata
         version_metadata_func: Optional callable that actions can use to set version metadata
+        hooks: Optional hooks notified of each action run by the pipeline
 
     Returns:
         The instantiated Pipeline
     """
-    actions = [
+    if _PIPELINE_CACHE is None:
+        actions = _build_actions(action_list, commit_metadata_func, version_metadata_func)
+    else:
+        key = json.dumps(action_list, sort_keys=True, default=repr)
+        if key not in _PIPELINE_CACHE:
+            _PIPELINE_CACHE[key] = _build_actions(action_list)
+        actions = [
+            action._with_metadata_funcs(commit_metadata_func, version_metadata_func) for action in _PIPELINE_CACHE[key]
+        ]
+    return Pipeline(actions=actions, hooks=hooks, **kwargs)
+
+
+def _build_actions(
+    action_list: list,
+    commit_metadata_func: Optional[Callable] = None,
+    version_metadata_func: Optional[Callable] = None,
+) -> List[Action]:
+    """Create the actions specified by a list of dictionaries."""
+    return [
         Action(
             action=a["action"],
             id_=a.get("id"),
@@ -181,7 +445,20 @@ def pipeline_factory(
             kwargs=a.get("kwargs"),
             commit_metadata_func=commit_metadata_func,
             version_metadata_func=version_metadata_func,
+            cache=a.get("cache", False),
+            cache_ttl=a.get("cache_ttl"),
         )
         for a in action_list
     ]
-    return Pipeline(actions=actions, **kwargs)
+
+
+def enable_pipeline_cache() -> None:
+    """
+    Reuse the actions created by [`pipeline_factory`][generate_changelog.pipeline.pipeline_factory].
+
+    Long-running processes use this so the action functions are looked up, and the arguments without Jinja syntax
+    are rendered, once per action list instead of once per pipeline.
+    """
+    global _PIPELINE_CACHE  # noqa: PLW0603
+    if _PIPELINE_CACHE is None:
+        _PIPELINE_CACHE = {}
@@ -0,0 +1,382 @@
+"""
+Observe the actions run by pipelines.
+
+A [`PipelineHook`][generate_changelog.pipeline_hooks.PipelineHook] is told when each action starts and ends, how long
+it took, the sizes of its input and output, and the exception it raised, if any. Hooks are passed to a
+[`Pipeline`][generate_changelog.pipeline.Pipeline] or registered globally with
+[`register_hook`][generate_changelog.pipeline_hooks.register_hook].
+
+When no hooks are registered, pipelines run their actions directly, so the hooks cost nothing.
+"""
+
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    from generate_changelog.pipeline import Action
+
+
+class PipelineHook:
+    """The base class of pipeline hooks. Subclasses override the methods they need."""
+
+    def on_action_start(self, action: "Action", input_value: Any) -> None:
+        """
+        Called before an action runs.
+
+        Args:
+            action: The action about to run.
+            input_value: The value passed to the action.
+        """
+
+    def on_action_end(
+        self,
+        action: "Action",
+        duration: float,
+        input_size: Optional[int],
+        output_size: Optional[int],
+        exception: Optional[BaseException],
+    ) -> None:
+        """
+        Called after an action runs, even if it raised an exception.
+
+        Args:
+            action: The action that ran.
+            duration: The wall time of the action in seconds.
+            input_size: The length of the input, if it is a string.
+            output_size: The length of the output, if it is a string.
+            exception: The exception the action raised, or `None` if it succeeded.
+        """
+
+    def on_batch_start(self, action: "Action", input_values: Sequence[Any]) -> None:
+        """
+        Called before an action runs on a batch of inputs. By default, it calls `on_action_start` with the list.
+
+        Args:
+            action: The action about to run.
+            input_values: The values passed to the action.
+        """
+        self.on_action_start(action, input_values)
+
+    def on_batch_end(
+        self,
+        action: "Action",
+        duration: float,
+        input_count: int,
+        input_size: Optional[int],
+        output_size: Optional[int],
+        exception: Optional[BaseException],
+    ) -> None:
+        """
+        Called after an action runs on a batch of inputs. By default, it calls `on_action_end`.
+
+        Args:
+            action: The action that ran.
+            duration: The wall time of the batch in seconds.
+            input_count: The number of inputs in the batch.
+            input_size: The total length of the string inputs, or `None` if there are none.
+            output_size: The total length of the string outputs, or `None` if there are none.
+            exception: The exception the action raised, or `None` if it succeeded.
+        """
+        self.on_action_end(action, duration, input_size, output_size, exception)
+
+
+_HOOKS: List[PipelineHook] = []
+"""The hooks notified by every pipeline."""
+
+
+def register_hook(hook: PipelineHook) -> None:
+    """
+    Notify a hook of the actions run by every pipeline.
+
+    Args:
+        hook: The hook to register.
+    """
+    _HOOKS.append(hook)
+
+
+def unregister_hook(hook: PipelineHook) -> None:
+    """
+    Stop notifying a globally registered hook.
+
+    Args:
+        hook: The hook to unregister.
+    """
+    if hook in _HOOKS:
+        _HOOKS.remove(hook)
+
+
+@contextmanager
+def registered_hooks(*hooks: PipelineHook) -> Iterator[None]:
+    """Register hooks for the duration of the context."""
+    for hook in hooks:
+        register_hook(hook)
+    try:
+        yield
+    finally:
+        for hook in hooks:
+            unregister_hook(hook)
+
+
+def active_hooks(pipeline_hooks: Tuple[PipelineHook, ...]) -> Tuple[PipelineHook, ...]:
+    """
+    Return the hooks to notify for a pipeline run.
+
+    Args:
+        pipeline_hooks: The hooks of the pipeline.
+
+    Returns:
+        The pipeline's hooks followed by the globally registered hooks.
+    """
+    return (*pipeline_hooks, *_HOOKS) if _HOOKS else pipeline_hooks
+
+
+def _size(value: Any) -> Optional[int]:
+    """Return the length of a string or bytes value, or `None` for other values."""
+    return len(value) if isinstance(value, (str, bytes)) else None
+
+
+def run_with_hooks(hooks: Tuple[PipelineHook, ...], action: "Action", context: dict, input_value: Any) -> Any:
+    """
+    Run an action and notify the hooks.
+
+    Args:
+        hooks: The hooks to notify.
+        action: The action to run.
+        context: The pipeline context for the action.
+        input_value: The value to pass to the action.
+
+    Returns:
+        The result of the action.
+    """
+    for hook in hooks:
+        hook.on_action_start(action, input_value)
+    started = time.perf_counter()
+    try:
+        result = action.run(context, input_value)
+    except Exception as e:
+        duration = time.perf_counter() - started
+        for hook in hooks:
+            hook.on_action_end(action, duration, _size(input_value), None, e)
+        raise
+
+    duration = time.perf_counter() - started
+    for hook in hooks:
+        hook.on_action_end(action, duration, _size(input_value), _size(result), None)
+    return result
+
+
+def _total_size(values: Sequence[Any]) -> Optional[int]:
+    """Return the total length of the string or bytes values, or `None` if there are none."""
+    sizes = [size for size in map(_size, values) if size is not None]
+    return sum(sizes) if sizes else None
+
+
+def run_batch_with_hooks(
+    hooks: Tuple[PipelineHook, ...], action: "Action", input_values: Sequence[Any], run: Callable[[], List[Any]]
+) -> List[Any]:
+    """
+    Run an action on a batch of inputs and notify the hooks once for the batch.
+
+    Args:
+        hooks: The hooks to notify.
+        action: The action to run.
+        input_values: The values passed to the action.
+        run: Runs the action on the batch and returns the results.
+
+    Returns:
+        The results of the action.
+    """
+    for hook in hooks:
+        hook.on_batch_start(action, input_values)
+    started = time.perf_counter()
+    try:
+        results = run()
+    except Exception as e:
+        duration = time.perf_counter() - started
+        for hook in hooks:
+            hook.on_batch_end(action, duration, len(input_values), _total_size(input_values), None, e)
+        raise
+
+    duration = time.perf_counter() - started
+    for hook in hooks:
+        hook.on_batch_end(action, duration, len(input_values), _total_size(input_values), _total_size(results), None)
+    return results
+
+
+@dataclass
+class ActionStats:
+    """Aggregated measurements of an action."""
+
+    calls: int = 0
+    """The number of times the action ran. A batch run counts once for each input."""
+
+    errors: int = 0
+    """The number of times the action raised an exception."""
+
+    total: float = 0.0
+    """The total wall time of the action in seconds."""
+
+    input_size: int = 0
+    """The total length of the string inputs of the action."""
+
+    output_size: int = 0
+    """The total length of the string outputs of the action."""
+
+    @property
+    def mean(self) -> float:
+        """The mean wall time of the action in seconds."""
+        return self.total / self.calls if self.calls else 0.0
+
+
+class ActionStatsCollector(PipelineHook):
+    """Aggregates the calls, errors, time and sizes of each action, by action name."""
+
+    def __init__(self):
+        self.stats: Dict[str, ActionStats] = {}
+
+    def on_action_end(
+        self,
+        action: "Action",
+        duration: float,
+        input_size: Optional[int],
+        output_size: Optional[int],
+        exception: Optional[BaseException],
+    ) -> None:
+        """Add the measurements of an action run to its statistics."""
+        self.on_batch_end(action, duration, 1, input_size, output_size, exception)
+
+    def on_batch_end(
+        self,
+        action: "Action",
+        duration: float,
+        input_count: int,
+        input_size: Optional[int],
+        output_size: Optional[int],
+        exception: Optional[BaseException],
+    ) -> None:
+        """Add the measurements of a batch run to the action's statistics."""
+        stats = self.stats.get(action.name)
+        if stats is None:
+            stats = self.stats[action.name] = ActionStats()
+        stats.calls += input_count
+        stats.total += duration
+        stats.input_size += input_size or 0
+        stats.output_size += output_size or 0
+        if exception is not None:
+            stats.errors += 1
+
+
+class SpanFileExporter(PipelineHook):
+    """
+    Writes a span for each action run to a file, one JSON object per line.
+
+    The spans use the field names of OpenTelemetry's JSON encoding, so they can be converted or loaded by tools that
+    understand it. All the spans written by an exporter share a trace ID. An action run by another action, such as an
+    action that evaluates a pipeline, has the span of the outer action as its parent.
+
+    Args:
+        path: The file to append the spans to.
+        service_name: The `service.name` resource attribute of the spans.
+    """
+
+    def __init__(self, path: Union[str, Path], service_name: str = "generate-changelog"):
+        self.path = Path(path)
+        self.service_name = service_name
+        self.trace_id = secrets.token_hex(16)
+        self._open_spans = threading.local()
+        self._lock = threading.Lock()
+        self._file = self.path.open("a", encoding="utf-8")
+
+    def _stack(self) -> List[Tuple[str, int]]:
+        """Return the IDs and start times of the spans open in this thread."""
+        if not hasattr(self._open_spans, "stack"):
+            self._open_spans.stack = []
+        return self._open_spans.stack
+
+    def on_action_start(self, action: "Action", input_value: Any) -> None:
+        """Open a span for the action."""
+        self._stack().append((secrets.token_hex(8), time.time_ns()))
+
+    def on_action_end(
+        self,
+        action: "Action",
+        duration: float,
+        input_size: Optional[int],
+        output_size: Optional[int],
+        exception: Optional[BaseException],
+    ) -> None:
+        """Close the action's span and write it."""
+        self.on_batch_end(action, duration, 1, input_size, output_size, exception)
+
+    def on_batch_end(
+        self,
+        action: "Action",
+        duration: float,
+        input_count: int,
+        input_size: Optional[int],
+        output_size: Optional[int],
+        exception: Optional[BaseException],
+    ) -> None:
+        """Close the span of the action's batch run and write it, with the number of inputs."""
+        stack = self._stack()
+        span_id, start_time = stack.pop()
+        attributes = {
+            "action.name": action.name,
+            "action.input_count": input_count,
+            "action.input_size": input_size,
+            "action.output_size": output_size,
+        }
+        if exception is None:
+            status = {"code": "STATUS_CODE_OK"}
+        else:
+            status = {"code": "STATUS_CODE_ERROR", "message": f"{type(exception).__name__}: {exception}"}
+
+        span = {
+            "traceId": self.trace_id,
+            "spanId": span_id,
+            "parentSpanId": stack[-1][0] if stack else "",
+            "name": f"action {action.name}",
+            "kind": "SPAN_KIND_INTERNAL",
+            "startTimeUnixNano": start_time,
+            "endTimeUnixNano": start_time + int(duration * 1e9),
+            "attributes": {key: val for key, val in attributes.items() if val is not None},
+            "status": status,
+            "resource": {"service.name": self.service_name, "process.pid": os.getpid()},
+        }
+        with self._lock:
+            self._file.write(json.dumps(span) + "\n")
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        with self._lock:
+            self._file.close()
+
+
+@contextmanager
+def trace_to_file(path: Optional[Path]) -> Iterator[Optional[SpanFileExporter]]:
+    """
+    Write a span for every action run within the context to a file, if a path is given.
+
+    Args:
+        path: The file to append the spans to. If `None`, nothing is traced.
+
+    Yields:
+        The exporter, or `None` if nothing is traced.
+    """
+    if path is None:
+        yield None
+        return
+
+    exporter = SpanFileExporter(path)
+    try:
+        with registered_hooks(exporter):
+            yield exporter
+    finally:
+        exporter.close()
@@ -0,0 +1,107 @@
+"""
+Find the commit fields a configuration uses, so they can be read in bulk before processing.
+
+Some commit fields, like the changed files, are expensive to read and are loaded lazily. Loading them lazily is
+always correct, but when the configuration is known to use them, they are prefetched for the whole revision range in
+the "range parsing" stage. The configuration's commit classifiers, `group_by` entries, release hint rules and
+templates are checked.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, FrozenSet, Iterable
+
+from jinja2 import Environment, TemplateError, nodes
+
+from generate_changelog.configuration import Configuration
+
+LAZY_FIELDS = frozenset({"files"})
+"""The commit fields that are read on first access unless prefetched."""
+
+COMMIT_MATCHERS = frozenset({"SummaryRegexMatch", "MetadataMatch"})
+"""The built-in commit classifier actions, which only read the summary and metadata."""
+
+
+def _mentioned(value: Any) -> FrozenSet[str]:
+    """Return the lazy fields named in a configuration value, searching nested lists and mappings."""
+    if isinstance(value, str):
+        return frozenset(name for name in LAZY_FIELDS if re.search(rf"\b{name}\b", value))
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        return frozenset().union(*(_mentioned(item) for item in value))
+    return frozenset()
+
+
+def _classifier_fields(classifiers: Iterable[dict]) -> FrozenSet[str]:
+    """Return the lazy fields the commit classifiers may use. Custom actions get the commit and may use any field."""
+    used: FrozenSet[str] = frozenset()
+    for classifier in classifiers:
+        action = classifier.get("action")
+        if action is None:
+            continue
+        if action not in COMMIT_MATCHERS:
+            return LAZY_FIELDS
+        used |= _mentioned([classifier.get("args"), classifier.get("kwargs")])
+    return used
+
+
+def _rule_fields(rules: Iterable[dict]) -> FrozenSet[str]:
+    """Return the lazy fields the release hint rules use."""
+    return frozenset({"files"}) if any(rule.get("path") not in (None, "*") for rule in rules) else frozenset()
+
+
+@lru_cache(maxsize=32)
+def template_fields(env: Environment) -> FrozenSet[str]:
+    """
+    Return the lazy fields the templates of an environment use.
+
+    Attribute and item lookups, like `commit.files` or `commit["files"]`, are found in the parsed templates. If a
+    template can't be parsed, all the lazy fields are assumed to be used.
+
+    Args:
+        env: The Jinja environment whose templates are checked.
+
+    Returns:
+        The names of the lazy fields used.
+    """
+    names = set()
+    try:
+        for template_name in env.list_templates(filter_func=lambda name: name.endswith(".jinja")):
+            source, _, _ = env.loader.get_source(env, template_name)  # type: ignore[union-attr]
+            tree = env.parse(source)
+            names.update(node.attr for node in tree.find_all(nodes.Getattr))
+            names.update(
+                node.arg.value
+                for node in tree.find_all(nodes.Getitem)
+                if isinstance(node.arg, nodes.Const) and isinstance(node.arg.value, str)
+            )
+            names.update(
+                arg.value
+                for node in tree.find_all(nodes.Filter)
+                if node.name == "attr"
+                for arg in node.args
+                if isinstance(arg, nodes.Const) and isinstance(arg.value, str)
+            )
+    except (TemplateError, OSError, TypeError):
+        return LAZY_FIELDS
+    return LAZY_FIELDS.intersection(names)
+
+
+def commit_fields_used(config: Configuration) -> FrozenSet[str]:
+    """
+    Return the lazy commit fields a configuration uses.
+
+    Args:
+        config: The configuration to check.
+
+    Returns:
+        The names of the lazy fields to prefetch.
+    """
+    from generate_changelog.templating import get_default_env
+
+    used = _classifier_fields(config.commit_classifiers) | _mentioned(config.group_by)
+    used |= _rule_fields(config.release_hint_rules)
+    if used == LAZY_FIELDS:
+        return used
+    return used | template_fields(get_default_env(config))
@@ -0,0 +1,218 @@
+"""
+Measure where the time goes while generating a changelog.
+
+Code marks its stages with [`profile_stage`][generate_changelog.profiling.profile_stage]. The stages are only timed
+while a [`Profiler`][generate_changelog.profiling.Profiler] is active, which
+[`profile_run`][generate_changelog.profiling.profile_run] does for the `--profile` and `--cprofile` options.
+The active profiler is also a [pipeline hook][generate_changelog.pipeline_hooks.PipelineHook] that times each action.
+"""
+
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, ContextManager, Dict, Iterator, Optional
+
+from generate_changelog.indented_logger import get_indented_logger
+from generate_changelog.pipeline_hooks import PipelineHook, registered_hooks
+
+if TYPE_CHECKING:
+    from rich.table import Table
+
+    from generate_changelog.pipeline import Action
+
+logger = get_indented_logger(__name__)
+
+
+@dataclass
+class StageStats:
+    """The time spent in a stage."""
+
+    calls: int = 0
+    """The number of times the stage ran."""
+
+    total: float = 0.0
+    """The total wall time of the stage in seconds."""
+
+    @property
+    def mean(self) -> float:
+        """The mean wall time of the stage in seconds."""
+        return self.total / self.calls if self.calls else 0.0
+
+
+class Profiler(PipelineHook):
+    """Records the wall time and number of calls of each stage, and of each action as an `action: <name>` stage."""
+
+    def __init__(self):
+        self.stages: Dict[str, StageStats] = {}
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    @property
+    def total(self) -> float:
+        """The wall time of the profiled run in seconds."""
+        return (self.finished or time.perf_counter()) - self.started
+
+    def record(self, stage: str, duration: float, calls: int = 1) -> None:
+        """
+        Add the time spent in a stage.
+
+        Args:
+            stage: The name of the stage.
+            duration: The wall time in seconds.
+            calls: The number of calls the time covers.
+        """
+        stats = self.stages.get(stage)
+        if stats is None:
+            stats = self.stages[stage] = StageStats()
+        stats.calls += calls
+        stats.total += duration
+
+    def on_action_end(
+        self,
+        action: "Action",
+        duration: float,
+        input_size: Optional[int],
+        output_size: Optional[int],
+        exception: Optional[BaseException],
+    ) -> None:
+        """Record the action run as a call of the action's stage."""
+        self.record(f"action: {action.name}", duration)
+
+    def on_batch_end(
+        self,
+        action: "Action",
+        duration: float,
+        input_count: int,
+        input_size: Optional[int],
+        output_size: Optional[int],
+        exception: Optional[BaseException],
+    ) -> None:
+        """Record the batch run as a call of the action's stage for each input."""
+        self.record(f"action: {action.name}", duration, calls=input_count)
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """Time the code within the context as a call of the stage."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def as_dict(self) -> dict:
+        """Return the total time and the statistics of each stage."""
+        return {
+            "total": self.total,
+            "stages": {
+                name: {"calls": stats.calls, "total": stats.total, "mean": stats.mean}
+                for name, stats in self.stages.items()
+            },
+        }
+
+    def write_json(self, path: Path) -> None:
+        """Write the statistics to a JSON file."""
+        logger.info(f"Writing the profile to {path}")
+        path.write_text(json.dumps(self.as_dict(), indent=2), encoding="utf-8")
+
+    def table(self) -> "Table":
+        """Return the statistics as a table, slowest stage first."""
+        from rich.table import Table
+
+        total = self.total or 1.0
+        table = Table(title=f"Profile: {self.total:.3f}s total")
+        table.add_column("Stage")
+        table.add_column("Calls", justify="right")
+        table.add_column("Total (s)", justify="right")
+        table.add_column("Mean (ms)", justify="right")
+        table.add_column("% of run", justify="right")
+        for name, stats in sorted(self.stages.items(), key=lambda item: item[1].total, reverse=True):
+            table.add_row(
+                name,
+                str(stats.calls),
+                f"{stats.total:.4f}",
+                f"{stats.mean * 1000:.3f}",
+                f"{stats.total / total * 100:.1f}",
+            )
+        return table
+
+    def append_to_report(self, path: Path) -> None:
+        """Append the statistics table to a debug report."""
+        from rich.console import Console
+
+        console = Console(force_terminal=True, width=120)
+        with console.capture() as capture:
+            console.print(self.table())
+        with path.open("a", encoding="utf-8") as report:
+            report.write(capture.get())
+
+
+_PROFILER: ContextVar[Optional[Profiler]] = ContextVar("profiler", default=None)
+"""The active profiler, if any."""
+
+_NOT_PROFILED = nullcontext()
+"""The context returned by `profile_stage` when no profiler is active."""
+
+
+def get_profiler() -> Optional[Profiler]:
+    """Return the active profiler, or `None` if the run isn't profiled."""
+    return _PROFILER.get()
+
+
+def profile_stage(stage: str) -> ContextManager:
+    """
+    Time the code within the context as a call of a stage, if a profiler is active.
+
+    Args:
+        stage: The name of the stage.
+
+    Returns:
+        A context manager.
+    """
+    profiler = _PROFILER.get()
+    return _NOT_PROFILED if profiler is None else profiler.stage(stage)
+
+
+@contextmanager
+def profile_run(
+    json_path: Optional[Path] = None,
+    report_path: Optional[Path] = None,
+    cprofile_path: Optional[Path] = None,
+) -> Iterator[Optional[Profiler]]:
+    """
+    Profile the code within the context if a JSON or cProfile output is requested.
+
+    Args:
+        json_path: Write the stage statistics to this JSON file.
+        report_path: Append the stage statistics table to this debug report.
+        cprofile_path: Run the code with `cProfile` and save the statistics to this `.prof` file.
+
+    Yields:
+        The active profiler, or `None` if no output is requested.
+    """
+    if not json_path and not cprofile_path:
+        yield None
+        return
+
+    import cProfile
+
+    profiler = Profiler()
+    python_profiler = cProfile.Profile() if cprofile_path else None
+    token = _PROFILER.set(profiler)
+    if python_profiler:
+        python_profiler.enable()
+    try:
+        with registered_hooks(profiler):
+            yield profiler
+    finally:
+        if python_profiler:
+            python_profiler.disable()
+            python_profiler.dump_stats(str(cprofile_path))
+        profiler.finished = time.perf_counter()
+        _PROFILER.reset(token)
+        if json_path:
+            profiler.write_json(json_path)
+        if report_path:
+            profiler.append_to_report(report_path)
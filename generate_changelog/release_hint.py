@@ -1,7 +1,6 @@
 """Methods for generating a release hint."""
 
 import copy
-import fnmatch
 import re
 from collections import defaultdict
 from dataclasses import dataclass
@@ -19,6 +18,7 @@ from rich.text import Text
 from generate_changelog.configuration import RELEASE_TYPE_ORDER, Configuration
 from generate_changelog.context import CommitContext, VersionContext
 from generate_changelog.indented_logger import get_indented_logger
+from generate_changelog.utilities import path_matches
 
 logger = get_indented_logger(__name__)
 
@@ -126,14 +126,7 @@ class ReleaseRule:
         Returns:
             `True` if any file in the commit context matches the pattern or if ``self.path`` is ``None``
         """
-        if not self.path:
-            return True
-
-        results = []
-        for path in self.path:
-            re_pattern = fnmatch.translate(path)
-            results.append(any(re.match(re_pattern, p) for p in commit.files))
-        return any(results)
+        return path_matches(self.path, commit.files) if self.path else True
 
     def matches_branch(self, current_branch: str) -> bool:
         """
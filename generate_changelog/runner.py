@@ -0,0 +1,97 @@
+"""Generate the changelog and release hint of a repository."""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from git import Repo
+
+from generate_changelog.commits import get_context_from_tags
+from generate_changelog.configuration import Configuration
+from generate_changelog.git_ops import HistoryIndex
+from generate_changelog.indented_logger import get_indented_logger
+from generate_changelog.pipeline import pipeline_factory
+from generate_changelog.profiling import profile_stage
+from generate_changelog.release_hint import suggest_release_type
+from generate_changelog.templating import RenderedChangelog, render_changelog
+
+logger = get_indented_logger(__name__)
+
+
+@dataclass
+class ChangelogResult:
+    """The results of generating a changelog."""
+
+    starting_tag: Optional[str]
+    """The tag the changelog was generated from, if any."""
+
+    release_hint: str
+    """The suggested release type."""
+
+    rendered: RenderedChangelog
+    """The rendered changelog."""
+
+
+def find_starting_tag(config: Configuration) -> Optional[str]:
+    """
+    Run the starting tag pipeline.
+
+    Args:
+        config: The configuration to use.
+
+    Returns:
+        The tag to generate the changelog from, or ``None`` to generate it from the first commit.
+    """
+    if not config.starting_tag_pipeline:
+        return None
+    with profile_stage("starting tag pipeline"):
+        start_tag_pipeline = pipeline_factory(config.starting_tag_pipeline, **config.variables)
+        return start_tag_pipeline.run() or None
+
+
+def run_changelog(
+    repository: Repo,
+    config: Configuration,
+    branch_name: str,
+    starting_tag: Optional[str] = None,
+    run_output_pipeline: bool = True,
+    history: Optional[HistoryIndex] = None,
+    paths: Optional[Sequence[str]] = None,
+) -> ChangelogResult:
+    """
+    Generate the changelog and release hint of a repository, and run the output pipeline.
+
+    Args:
+        repository: The git repository to evaluate.
+        config: The configuration to use.
+        branch_name: The name of the branch for release hint decisions.
+        starting_tag: Generate the changelog from this tag. If ``None``, the starting tag pipeline finds it.
+        run_output_pipeline: Run the output pipeline with the rendered changelog.
+        history: Reuse the tags, commits, and changed files in this index.
+        paths: Only include commits that change files matching these glob patterns.
+
+    Returns:
+        The starting tag, release hint, and rendered changelog.
+    """
+    if not starting_tag:
+        starting_tag = find_starting_tag(config)
+
+    if not starting_tag:
+        logger.info("No starting tag found. Generating entire change log.")
+    else:
+        logger.info(f"Generating change log from tag: '{starting_tag}'.")
+
+    with profile_stage("commit processing"):
+        version_contexts = get_context_from_tags(repository, config, starting_tag, history, paths)
+    with profile_stage("release hint"):
+        release_hint = suggest_release_type(branch_name, version_contexts, config)
+
+    # use the output pipeline to deal with the rendered change log.
+    with profile_stage("rendering"):
+        rendered_chglog = render_changelog(version_contexts, config, bool(starting_tag))
+
+    if run_output_pipeline:
+        with profile_stage("output pipeline"):
+            output_pipeline = pipeline_factory(config.output_pipeline, **config.variables)
+            output_pipeline.run(rendered_chglog.full)
+
+    return ChangelogResult(starting_tag=starting_tag, release_hint=release_hint, rendered=rendered_chglog)
@@ -0,0 +1,173 @@
+"""
+A long-running process that generates changelogs with warm caches.
+
+`generate-changelog serve` listens on a Unix socket. Clients run `generate-changelog --server <socket> ...` with the
+usual flags, which are forwarded to the server and run there. The server keeps what a fresh process would have to
+rebuild on every run: imported modules, the action registry, Jinja environments, parsed configuration files, open
+GitPython repositories, the actions of each pipeline, and the tags, commit records and changed files of each
+repository. The history of a repository is read again when its `HEAD` or refs change.
+
+Requests are handled one at a time, since each one changes the working directory and the global configuration.
+"""
+
+import io
+import json
+import os
+import socket
+import socketserver
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import List, Optional, Union
+
+import rich_click as click
+
+from generate_changelog.indented_logger import get_indented_logger
+
+logger = get_indented_logger(__name__)
+
+SERVER_SOCKET_ENVVAR = "CHANGELOG_SERVER_SOCKET"
+"""The environment variable clients read the server socket path from."""
+
+
+def run_request(argv: List[str], cwd: str) -> dict:
+    """
+    Run the `generate` command in this process as if it was started in `cwd` with `argv`.
+
+    Args:
+        argv: The command line arguments for the `generate` command.
+        cwd: The working directory of the client.
+
+    Returns:
+        A dictionary with the `exit_code`, `stdout` and `stderr` of the command.
+    """
+    from generate_changelog.cli import generate
+    from generate_changelog.configuration import reset_config
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    original_cwd = os.getcwd()
+    reset_config()
+    try:
+        os.chdir(cwd)
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            exit_code = _invoke(generate, argv)
+    finally:
+        os.chdir(original_cwd)
+
+    return {"exit_code": exit_code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def _invoke(command: click.Command, argv: List[str]) -> int:
+    """Run a click command without letting it exit the process, and return its exit code."""
+    try:
+        result = command.main(args=argv, prog_name="generate-changelog", standalone_mode=False)
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
+    except Exception:  # noqa: BLE001
+        traceback.print_exc()
+        return 1
+    return result if isinstance(result, int) else 0
+
+
+class ChangelogRequestHandler(socketserver.StreamRequestHandler):
+    """Read one JSON request line, run it, and write one JSON response line."""
+
+    def handle(self) -> None:
+        """Handle a client request."""
+        line = self.rfile.readline()
+        if not line:
+            return
+        request = json.loads(line)
+        logger.info(f"Request from {request['cwd']}: {' '.join(request['argv'])}")
+        response = run_request(request["argv"], request["cwd"])
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class ChangelogServer(socketserver.UnixStreamServer):
+    """A Unix socket server that handles changelog requests one at a time."""
+
+    def server_close(self) -> None:
+        """Close the socket and remove its file."""
+        super().server_close()
+        Path(self.server_address).unlink(missing_ok=True)
+
+
+def make_server(socket_path: Union[str, Path]) -> ChangelogServer:
+    """
+    Create a server listening on `socket_path` and warm the caches shared between requests.
+
+    Args:
+        socket_path: The path of the Unix socket to listen on.
+
+    Returns:
+        The server, ready to handle requests.
+
+    Raises:
+        RuntimeError: If another server is already listening on the socket.
+    """
+    from generate_changelog import commits, git_ops, pipeline, release_hint, templating  # noqa: F401
+    from generate_changelog.actions import BUILT_INS
+
+    socket_path = Path(socket_path)
+    if socket_path.exists():
+        if _is_listening(socket_path):
+            raise RuntimeError(f"A server is already listening on {socket_path}.")
+        socket_path.unlink()
+
+    BUILT_INS.load_builtins()
+    git_ops.enable_repo_cache()
+    git_ops.enable_history_cache()
+    pipeline.enable_pipeline_cache()
+    return ChangelogServer(str(socket_path), ChangelogRequestHandler)
+
+
+def _is_listening(socket_path: Path) -> bool:
+    """Is a process accepting connections on the socket?"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
+
+
+def serve(socket_path: Union[str, Path]) -> None:
+    """
+    Handle changelog requests on a Unix socket until interrupted.
+
+    Args:
+        socket_path: The path of the Unix socket to listen on.
+    """
+    # The server runs requests itself; it must never forward them to another server.
+    os.environ.pop(SERVER_SOCKET_ENVVAR, None)
+
+    with make_server(socket_path) as server:
+        logger.warning(f"Listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.warning("Shutting down.")
+
+
+def send_request(socket_path: Union[str, Path], argv: List[str], cwd: Optional[str] = None) -> dict:
+    """
+    Send a request to a running server and wait for the response.
+
+    Args:
+        socket_path: The path of the Unix socket the server listens on.
+        argv: The command line arguments for the `generate` command.
+        cwd: The working directory to run the command in. Defaults to the current working directory.
+
+    Returns:
+        A dictionary with the `exit_code`, `stdout` and `stderr` of the command.
+    """
+    request = {"argv": argv, "cwd": cwd or os.getcwd()}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as response:
+            return json.loads(response.readline())
@@ -0,0 +1,177 @@
+"""
+Plan and perform the fetches a shallow clone needs to generate a changelog.
+
+A changelog from a starting tag only needs the commits after the tag and the tag's commit, not the full history. The
+[`plan_shallow_fetch`][generate_changelog.shallow.plan_shallow_fetch] function measures how deep a shallow clone must
+be, using a repository with the full history, such as a local bare mirror.
+[`deepen`][generate_changelog.shallow.deepen] then fetches just that much from the mirror.
+"""
+
+import datetime
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import click
+from git import GitCommandError, Repo
+
+from generate_changelog.cat_file import get_cat_file
+from generate_changelog.git_ops import get_tags, shallow_commits
+from generate_changelog.indented_logger import get_indented_logger
+
+logger = get_indented_logger(__name__)
+
+
+@dataclass
+class ShallowPlan:
+    """The history a shallow clone needs to generate a changelog from a starting tag."""
+
+    head: str
+    """The SHA of the commit the changelog ends at."""
+
+    starting_tag: Optional[str]
+    """The tag the changelog starts at, or `None` for the full history."""
+
+    depth: Optional[int]
+    """The `git fetch --depth` that includes every needed commit, or `None` if the full history is needed."""
+
+    shallow_since: Optional[datetime.datetime]
+    """The commit date of the oldest needed commit, for `git fetch --shallow-since`."""
+
+    tags: List[str] = field(default_factory=list)
+    """The tags that point to needed commits."""
+
+    shas: List[str] = field(default_factory=list, repr=False)
+    """The SHAs of the needed commits: the commits after the starting tag, and the tag's commit."""
+
+    def as_dict(self) -> dict:
+        """Return the plan as JSON-compatible values."""
+        return {
+            "head": self.head,
+            "starting_tag": self.starting_tag,
+            "commits": len(self.shas) if self.starting_tag else None,
+            "depth": self.depth,
+            "shallow_since": self.shallow_since.isoformat() if self.shallow_since else None,
+            "tags": self.tags,
+        }
+
+
+def _distances(head: str, parents: Dict[str, List[str]]) -> Dict[str, int]:
+    """Return the length of the shortest path from `head` to each commit, which is how `git fetch --depth` counts."""
+    distances = {head: 0}
+    queue = deque([head])
+    while queue:
+        sha = queue.popleft()
+        for parent in parents.get(sha, []):
+            if parent not in distances:
+                distances[parent] = distances[sha] + 1
+                queue.append(parent)
+    return distances
+
+
+def plan_shallow_fetch(source: Repo, starting_tag: Optional[str], head: str = "HEAD") -> ShallowPlan:
+    """
+    Measure the history a shallow clone needs to generate a changelog from a starting tag.
+
+    The depth reaches the parents of the farthest commit after the tag, so none of those commits is at the shallow
+    boundary and `git log <tag>..HEAD` is complete. The tag's commit itself may be at the boundary.
+
+    Args:
+        source: A repository with the full history, such as a local bare mirror.
+        starting_tag: The tag the changelog starts at. If `None`, the full history is needed.
+        head: The commit the changelog ends at.
+
+    Returns:
+        The plan.
+
+    Raises:
+        UsageError: If the starting tag or head doesn't exist in the source repository.
+    """
+    try:
+        head_sha = source.git.rev_parse("--verify", f"{head}^{{commit}}")
+        tag_sha = source.git.rev_parse("--verify", f"{starting_tag}^{{commit}}") if starting_tag else None
+    except GitCommandError as e:
+        raise click.UsageError(f"Can't find '{starting_tag}' or '{head}' in {source.git_dir}.") from e
+
+    if tag_sha is None:
+        return ShallowPlan(head=head_sha, starting_tag=None, depth=None, shallow_since=None)
+
+    # Each line is "<commit time> <sha> <parent sha>..."
+    lines = source.git.rev_list("--timestamp", "--parents", f"{tag_sha}..{head_sha}").splitlines()
+    tag_time = int(source.git.log("-1", "--format=%ct", tag_sha))
+    parents: Dict[str, List[str]] = {}
+    oldest = tag_time
+    for line in lines:
+        timestamp, sha, *commit_parents = line.split()
+        parents[sha] = commit_parents
+        oldest = min(oldest, int(timestamp))
+
+    distances = _distances(head_sha, parents)
+    farthest = max((distances[sha] for sha in parents), default=-1)
+    depth = max(farthest + 2, distances.get(tag_sha, 0) + 1)
+    shas = [*parents, tag_sha]
+    needed = set(shas)
+    tags = [tag.name for tag in get_tags(source) if tag.commit in needed]
+
+    return ShallowPlan(
+        head=head_sha,
+        starting_tag=starting_tag,
+        depth=depth,
+        shallow_since=datetime.datetime.fromtimestamp(oldest, datetime.timezone.utc),
+        tags=tags,
+        shas=shas,
+    )
+
+
+def needs_deepening(repository: Repo, plan: ShallowPlan) -> bool:
+    """
+    Return whether a repository is missing history the plan needs.
+
+    Args:
+        repository: The repository to check.
+        plan: The plan made from the full history.
+
+    Returns:
+        `True` if a needed commit is missing or at the shallow boundary.
+    """
+    boundary = shallow_commits(repository)
+    if not boundary:
+        return False
+    if plan.depth is None:
+        return True
+
+    objects = get_cat_file(repository.git_dir).check(plan.shas)
+    if any(git_object is None for git_object in objects):
+        return True
+    # The tag's commit is the last needed commit, and it may be at the boundary.
+    return any(sha in boundary for sha in plan.shas[:-1])
+
+
+def deepen(repository: Repo, mirror: str, plan: ShallowPlan) -> bool:
+    """
+    Fetch just enough history from a mirror for the plan, and the tags of the needed commits.
+
+    Args:
+        repository: The shallow repository to deepen.
+        mirror: The path or URL of a repository with the full history.
+        plan: The plan made from the mirror.
+
+    Returns:
+        `True` if commits were fetched.
+    """
+    deepened = needs_deepening(repository, plan)
+    if deepened and plan.depth is None:
+        logger.info("Fetching the full history.")
+        repository.git.fetch("--unshallow", "--no-tags", mirror, plan.head)
+    elif deepened:
+        logger.info(f"Fetching {plan.depth} commits of history.")
+        repository.git.fetch(f"--depth={plan.depth}", "--no-tags", mirror, plan.head)
+
+    # The tags' commits are already here, so this only fetches the refs and annotated tag objects.
+    if plan.depth is None:
+        refspecs = ["+refs/tags/*:refs/tags/*"]
+    else:
+        refspecs = [f"+refs/tags/{tag}:refs/tags/{tag}" for tag in plan.tags]
+    if refspecs:
+        repository.git.fetch("--no-tags", mirror, *refspecs)
+    return deepened
@@ -1,7 +1,9 @@
 """Templating functions."""
 
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
 
 from jinja2 import ChoiceLoader, Environment, FileSystemLoader, PackageLoader, select_autoescape
 
@@ -24,12 +26,27 @@ class RenderedChangelog:
     full: Optional[str] = None
 
 
+def _resolved_template_dirs(config: Configuration) -> Tuple[str, ...]:
+    """Return the configured template directories as absolute paths, for use as a cache key."""
+    return tuple(str(Path(template_dir).resolve()) for template_dir in config.template_dirs)
+
+
 def get_default_env(config: Optional[Configuration] = None) -> Environment:
-    """The default Jinja environment for rendering a changelog."""
+    """
+    The default Jinja environment for rendering a changelog.
+
+    Environments are cached by template directory, so templates are only compiled once per process.
+    """
     if config is None:
         config = get_config()
+    return _default_env(_resolved_template_dirs(config))
+
+
+@lru_cache(maxsize=32)
+def _default_env(template_dirs: Tuple[str, ...]) -> Environment:
+    """Create the default Jinja environment for a set of template directories."""
     return Environment(
-        loader=ChoiceLoader([FileSystemLoader(config.template_dirs), PackageLoader("generate_changelog")]),
+        loader=ChoiceLoader([FileSystemLoader(template_dirs), PackageLoader("generate_changelog")]),
         trim_blocks=True,
         lstrip_blocks=True,
         keep_trailing_newline=True,
@@ -38,11 +55,21 @@ def get_default_env(config: Optional[Configuration] = None) -> Environment:
 
 
 def get_pipeline_env(config: Optional[Configuration] = None) -> Environment:
-    """The Jinja environment for rendering actions and pipelines."""
+    """
+    The Jinja environment for rendering actions and pipelines.
+
+    Environments are cached by template directory, so templates are only compiled once per process.
+    """
     if config is None:
         config = get_config()
+    return _pipeline_env(_resolved_template_dirs(config))
+
+
+@lru_cache(maxsize=32)
+def _pipeline_env(template_dirs: Tuple[str, ...]) -> Environment:
+    """Create the Jinja environment for rendering actions and pipelines for a set of template directories."""
     return Environment(
-        loader=ChoiceLoader([FileSystemLoader(config.template_dirs), PackageLoader("generate_changelog")]),
+        loader=ChoiceLoader([FileSystemLoader(template_dirs), PackageLoader("generate_changelog")]),
         autoescape=select_autoescape(),
     )
 
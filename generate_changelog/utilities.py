@@ -1,6 +1,9 @@
 """Utility methods."""
 
-from typing import TYPE_CHECKING, Any, Iterable, Optional
+import fnmatch
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, Tuple, Union
 
 if TYPE_CHECKING:
     from generate_changelog.configuration import Configuration
@@ -120,6 +123,130 @@ def resolve_name(obj: Any, name: str, default: Any = None) -> Any:
         return default
 
 
+_UNRESOLVED = object()
+"""Returned by a lookup that failed."""
+
+
+def _compile_lookup(bit: str) -> Callable[[Any], Any]:
+    """
+    Return a function that looks up one part of a dotted name, like `resolve_name`.
+
+    Dict keys and the attributes of objects that can't be subscripted take a single lookup. Other objects use
+    `resolve_name`. The function returns `_UNRESOLVED` if the lookup fails.
+    """
+
+    def lookup(current: Any) -> Any:
+        if isinstance(current, dict) and bit in current:
+            return current[bit]
+        if not hasattr(type(current), "__getitem__"):
+            return getattr(current, bit, _UNRESOLVED)
+        return resolve_name(current, bit, _UNRESOLVED)
+
+    return lookup
+
+
+@lru_cache(maxsize=256)
+def _compile_lookups(name: str) -> Tuple[Callable[[Any], Any], ...]:
+    """Return the lookups of each part of a dotted name."""
+    return tuple(_compile_lookup(bit) for bit in name.split("."))
+
+
+def compile_name(name: str, default: Any = None) -> Callable[[Any], Any]:
+    """
+    Compile a dotted name into a function that gets its value from an object.
+
+    The function returns the same values as [`resolve_name`][generate_changelog.utilities.resolve_name], but the
+    name is only split once, and most lookups don't raise and catch exceptions.
+
+    Examples:
+        >>> get_category = compile_name("metadata.category")
+        >>> get_category({"metadata": {"category": "Fixes"}})
+        'Fixes'
+
+    Args:
+        name: A dotted name to the value, such as `mykey.0.name`
+        default: The value to return if the name cannot be resolved from the object
+
+    Returns:
+        A function that accepts an object and returns the value at the name, or the default value.
+    """
+    lookups = _compile_lookups(name)
+
+    def accessor(obj: Any) -> Any:
+        current = obj
+        try:
+            for lookup in lookups:
+                current = lookup(current)
+                if current is _UNRESOLVED:
+                    return default
+        except Exception:  # NOQA: BLE001
+            return default
+        return current
+
+    return accessor
+
+
 def diff_index(iterable1: Iterable, iterable2: Iterable) -> Optional[int]:
     """Return the index where iterable2 is different from iterable1."""
     return next((index for index, (item1, item2) in enumerate(zip(iterable1, iterable2)) if item1 != item2), None)
+
+
+def path_matches(patterns: Iterable[str], paths: Iterable[str]) -> bool:
+    """
+    Does any of the paths match any of the glob patterns?
+
+    Examples:
+        >>> path_matches(["docs/*"], ["README.md", "docs/index.md"])
+        True
+        >>> path_matches(["docs/*"], ["README.md"])
+        False
+
+    Args:
+        patterns: The `fnmatch`-style glob patterns. `*` also matches `/`.
+        paths: The paths to check.
+
+    Returns:
+        `True` if any path matches any pattern.
+    """
+    paths = list(paths)
+    return any(_glob_regex(pattern).match(path) for pattern in patterns for path in paths)
+
+
+@lru_cache(maxsize=256)
+def _glob_regex(pattern: str) -> re.Pattern:
+    """Compile a glob pattern into a regular expression."""
+    return re.compile(fnmatch.translate(pattern))
+
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60, "w": 7 * 24 * 60 * 60}
+"""The number of seconds in each duration unit."""
+
+
+def parse_duration(value: Union[str, int, float, None]) -> Optional[float]:
+    """
+    Convert a duration like `90s`, `30m`, `12h`, `1d` or `2w` into seconds.
+
+    Examples:
+        >>> parse_duration("1d")
+        86400.0
+        >>> parse_duration(300)
+        300.0
+
+    Args:
+        value: A number of seconds, or a number followed by a unit. `None` means no duration.
+
+    Returns:
+        The duration in seconds, or `None`.
+
+    Raises:
+        ValueError: If the value is not a valid duration.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    match = re.fullmatch(r"\s*(?P<amount>\d+(?:\.\d+)?)\s*(?P<unit>[smhdw]?)\s*", value, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"'{value}' is not a valid duration. Use a number followed by s, m, h, d, or w.")
+    return float(match["amount"]) * DURATION_UNITS[match["unit"].lower() or "s"]
@@ -78,3 +78,69 @@ def test_incremental_file_insert_missing_file(tmp_path):
     writer("This is new\n")
 
     assert temp_file.read_text() == "This is new\n"
+
+
+def test_incremental_file_insert_no_match_replaces_file(tmp_path):
+    """When the heading pattern isn't found, the whole file is replaced."""
+    temp_file = tmp_path / "output.txt"
+    temp_file.write_text("Old content\n")
+
+    writer = file_processing.IncrementalFileInsert(str(temp_file), r"(?im)^## \d+\.\d+\.\d+")
+    writer("This is new\n")
+
+    assert temp_file.read_text() == "This is new\n"
+
+
+def test_incremental_file_insert_keeps_tail_byte_for_byte(tmp_path):
+    """The content after the heading is copied unchanged, even after multibyte characters."""
+    temp_file = tmp_path / "output.txt"
+    tail = "## 0.0.1 (2022-01-01)\n\n" + "- Non-ascii éèàâ§µ stays.\n" * 50_000
+    temp_file.write_text(f"# Changelog\n\n## Unreleased ✨\n\n- Old.\n\n{tail}", encoding="utf-8")
+    temp_file.chmod(0o640)
+
+    writer = file_processing.IncrementalFileInsert(str(temp_file), r"(?im)^## \d+\.\d+\.\d+")
+    writer("# Changelog\n\n## Unreleased ✨\n\n- New.\n")
+
+    assert temp_file.read_text(encoding="utf-8") == f"# Changelog\n\n## Unreleased ✨\n\n- New.\n\n{tail}"
+    assert temp_file.stat().st_mode & 0o777 == 0o640
+    assert list(tmp_path.iterdir()) == [temp_file]
+
+
+def test_mdformat_formats_whole_file(tmp_path):
+    """Without a heading pattern, the entire file is formatted."""
+    temp_file = tmp_path / "output.md"
+    temp_file.write_text("# Changelog\n* New\n\n## 0.0.1 (2022-01-01)\n* Old\n")
+
+    formatter = file_processing.MDFormat(str(temp_file))
+    formatter()
+
+    assert temp_file.read_text() == "# Changelog\n\n- New\n\n## 0.0.1 (2022-01-01)\n\n- Old\n"
+
+
+def test_mdformat_only_formats_before_last_heading(tmp_path):
+    """With a heading pattern, content from the first heading on is untouched."""
+    temp_file = tmp_path / "output.md"
+    temp_file.write_text("# Changelog\n* New\n\n## 0.0.1 (2022-01-01)\n* Old\n")
+
+    formatter = file_processing.MDFormat(str(temp_file), r"(?im)^## \d+\.\d+\.\d+")
+    result = formatter()
+
+    assert result == "# Changelog\n\n- New\n"
+    assert temp_file.read_text() == "# Changelog\n\n- New\n\n## 0.0.1 (2022-01-01)\n* Old\n"
+
+
+def test_mdformat_leaves_a_file_starting_with_the_heading_unchanged(tmp_path):
+    """When the file starts with the heading, nothing is formatted and no blank line is added."""
+    temp_file = tmp_path / "output.md"
+    temp_file.write_text("## 0.0.1 (2022-01-01)\n* Old\n")
+
+    formatter = file_processing.MDFormat(str(temp_file), r"(?im)^## \d+\.\d+\.\d+")
+    result = formatter()
+
+    assert result == ""
+    assert temp_file.read_text() == "## 0.0.1 (2022-01-01)\n* Old\n"
+
+
+def test_format_markdown():
+    """Markdown passed through the pipeline is formatted."""
+    assert file_processing.format_markdown("# Changelog\n* New\n") == "# Changelog\n\n- New\n"
@@ -39,6 +39,82 @@ def test_parse_trailers():
     assert trailers["subject"] == ["This is a fake subject spanning to several lines\nas you can see"]
 
 
+trailer_messages = [
+    param(
+        "\nSee: the log below\nError: it failed\n\nFixed it.\n",
+        "\nSee: the log below\nError: it failed\n\nFixed it.\n",
+        {},
+        id="colons-in-body-are-not-trailers",
+    ),
+    param(
+        "\nBody\n\nfree text\nSigned-off-by: A <a@example.com>\nAcked-by: B\n",
+        "\nBody\n\nfree text\n",
+        {"signed-off-by": ["A <a@example.com>"], "acked-by": ["B"]},
+        id="git-generated-prefix",
+    ),
+    param(
+        "\nBody\n\nfree text\nmore text\nAcked-by: B\n",
+        "\nBody\n\nfree text\nmore text\nAcked-by: B\n",
+        {},
+        id="mixed-paragraph-is-not-a-trailer-block",
+    ),
+    param(
+        "\nBody\n\nCo-authored-by: A <a@example.com>\n  indented\n\n\n",
+        "\nBody\n",
+        {"co-authored-by": ["A <a@example.com>\nindented"]},
+        id="continuation-and-trailing-blank-lines",
+    ),
+    param(
+        "\nBody\n\nBREAKING CHANGE: stuff\n(cherry picked from commit abc)\nSigned-off-by: x\n",
+        "\nBody\n\nBREAKING CHANGE: stuff\n(cherry picked from commit abc)\n",
+        {"signed-off-by": ["x"]},
+        id="unparsed-lines-of-the-block-are-kept",
+    ),
+    param("\nBody\n\nCloses : #1\n", "\nBody\n", {"closes": ["#1"]}, id="spaced-separator"),
+    param("Signed-off-by: A <a@example.com>", "", {"signed-off-by": ["A <a@example.com>"]}, id="only-trailers"),
+    param("", "", {}, id="empty"),
+]
+
+
+@pytest.mark.parametrize(["message", "expected_message", "expected_trailers"], trailer_messages)
+def test_parse_trailers_uses_the_last_paragraph(message, expected_message, expected_trailers):
+    """Only the trailer block at the end of the message is parsed, and the rest of the message is returned."""
+    metadata_collector = metadata.MetadataCollector()
+
+    assert metadata.ParseTrailers(commit_metadata=metadata_collector)(message) == expected_message
+    assert metadata_collector.metadata["trailers"] == expected_trailers
+
+
+def test_parse_trailers_with_git_matches_the_parser():
+    """Parsing a batch of messages with git finds the same trailers as the built-in parser."""
+    messages = [sample_msg_1] + [p.values[0] for p in trailer_messages]
+    collectors = [metadata.MetadataCollector() for _ in messages]
+    git_collectors = [metadata.MetadataCollector() for _ in messages]
+
+    results = metadata.ParseTrailers(None).__call_batch__(messages, commit_metadata_funcs=collectors)
+    git_results = metadata.ParseTrailers(None, use_git=True).__call_batch__(
+        messages, commit_metadata_funcs=git_collectors
+    )
+
+    assert git_results == results
+    assert [c.metadata for c in git_collectors] == [c.metadata for c in collectors]
+    assert [c.metadata["trailers"] for c in collectors[1:]] == [p.values[2] for p in trailer_messages]
+
+
+def test_parse_trailers_with_git_cuts_where_git_found_trailers(mocker):
+    """With git, the trailer block is the last paragraph when git finds trailers in it, whatever the parser says."""
+    message = "\nBody\n\nfree text\nmore text\nAcked-by: B\n"
+    mocker.patch.object(metadata, "git_trailer_blocks", return_value=[["Acked-by: B"], []])
+    collectors = [metadata.MetadataCollector(), metadata.MetadataCollector()]
+
+    results = metadata.ParseTrailers(None, use_git=True).__call_batch__(
+        [message, "\nBody\n\nAcked-by: B\n"], commit_metadata_funcs=collectors
+    )
+
+    assert results == ["\nBody\n\nfree text\nmore text\n", "\nBody\n\nAcked-by: B\n"]
+    assert [c.metadata["trailers"] for c in collectors] == [{"acked-by": ["B"]}, {}]
+
+
 def test_metadata_collector():
     """Metadata collector should collect metadata."""
     mdc = metadata.MetadataCollector()
@@ -55,6 +131,17 @@ def test_metadata_collector():
     assert set(mdc.metadata["foo"]) == {"baz", "bar"}
 
 
+def test_metadata_collector_keeps_order_in_place():
+    """Saved list items are kept in the order they were first saved, in the same metadata dict."""
+    mdc = metadata.MetadataCollector()
+    collected = mdc.metadata
+    for issues in (["3", "1"], ["2", "3"], ["1", "4"]):
+        mdc(issue=issues, trailers={"closes": issues})
+
+    assert mdc.metadata is collected
+    assert mdc.metadata == {"issue": ["3", "1", "2", "4"], "trailers": {"closes": ["3", "1", "2", "4"]}}
+
+
 def test_parse_issue():
     """Parsing a pattern puts the match in the commit metadata issue key."""
 
@@ -1,5 +1,9 @@
 """Basic shell commands."""
 
+import subprocess
+
+import pytest
+
 from generate_changelog.actions import shell
 
 
@@ -10,3 +14,48 @@ def test_shell():
     }
     sh_script = shell.bash("echo ${FOO}", environment=env)
     assert sh_script == "bar\n"
+
+
+def test_persistent_shell_reuses_process():
+    """Persistent scripts run in the same long-lived bash process."""
+    env = {"FOO": "bar"}
+    assert shell.bash("echo ${FOO}", environment=env, persistent=True) == "bar\n"
+
+    first_pid = shell.bash("echo $$", environment=env, persistent=True)
+    second_pid = shell.bash("echo $$", environment=env, persistent=True)
+    assert first_pid == second_pid
+
+
+def test_persistent_shell_isolates_scripts():
+    """Changes made by one persistent script are not seen by the next."""
+    shell.bash("export LEAKED=yes\ncd /", environment={}, persistent=True)
+    assert shell.bash('echo "${LEAKED:-no}"', environment={}, persistent=True) == "no\n"
+
+
+def test_persistent_shell_keeps_pipefail():
+    """A failure anywhere in a pipeline fails the persistent script."""
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        shell.bash("false | true\necho unreachable", environment={}, persistent=True)
+
+    assert exc_info.value.returncode == 1
+    assert not exc_info.value.stdout
+
+
+def test_persistent_shell_returns_stderr():
+    """The stderr of a failed persistent script is reported."""
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        shell.bash("echo oops >&2\nexit 3", environment={}, persistent=True)
+
+    assert exc_info.value.returncode == 3
+    assert exc_info.value.stderr == "oops\n"
+
+
+def test_persistent_shell_has_no_positional_arguments():
+    """Persistent scripts don't see the worker's own arguments."""
+    assert shell.bash('echo "$#"', environment={}, persistent=True) == "0\n"
+
+
+def test_persistent_shell_hides_its_variables():
+    """Persistent scripts don't see the worker's own variables."""
+    script = 'echo "${__gc_line-unset} ${__gc_script-unset}"'
+    assert shell.bash(script, environment={}, persistent=True) == "unset unset\n"
@@ -53,3 +53,15 @@ def test_regex_sub(text, pattern, replacement, expected):
     """The replacement is substituted for the matched pattern."""
     regex_cmd = text_processing.RegexSub(pattern=pattern, replacement=replacement)
     assert regex_cmd(text) == expected
+
+
+def test_regex_batches_match_single_calls():
+    """Processing inputs in a batch gives the same results as processing them one at a time."""
+    texts = ["Spam And Spam", "Eggs", "", "1.0 And 2.0"]
+    commands = [
+        text_processing.RegexSub(pattern=r"(\w+) And (\S+)", replacement=r"\2 & \1"),
+        text_processing.FirstRegExMatch(pattern=r"(?P<word>^\w+)", named_subgroup="word", default_value="none"),
+        text_processing.FirstRegExMatchPosition(pattern=r"And", ignorecase_flag=True),
+    ]
+    for regex_cmd in commands:
+        assert regex_cmd.__call_batch__(texts) == [regex_cmd(text) for text in texts]
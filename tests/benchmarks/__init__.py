@@ -0,0 +1 @@
+"""Benchmarks of the changelog generation on synthetic repositories."""
@@ -0,0 +1,130 @@
+"""
+Fixtures for the benchmarks.
+
+The benchmarks only run when the `CHANGELOG_BENCHMARKS` environment variable is set, to `1` for the default repository
+sizes or to a comma-separated list of sizes like `1k,10k`. For example:
+
+    CHANGELOG_BENCHMARKS=1k,10k pytest tests/benchmarks --no-cov
+
+A table of how each benchmark scales with the repository size is shown at the end of the run, with the memory used by
+each stage. The memory benchmarks fail when a stage uses more than its budget in `memory-budgets.yaml`, or in the file
+named by the `CHANGELOG_MEMORY_BUDGETS` environment variable.
+"""
+
+import math
+import os
+from collections import defaultdict
+from typing import Dict, List
+
+import pytest
+from git import Repo
+
+from generate_changelog.commits import get_context_from_tags
+from generate_changelog.configuration import Configuration, get_default_config
+from generate_changelog.context import VersionContext
+from tests.benchmarks.memory import MemoryUsage
+from tests.benchmarks.synthetic_repo import RepoSpec, create_repo
+
+BENCHMARKS_ENVVAR = "CHANGELOG_BENCHMARKS"
+"""The environment variable that enables the benchmarks and selects the repository sizes."""
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+"""The numbers of commits in the benchmark repositories, when no sizes are given."""
+
+SCALING_RESULTS: Dict[str, Dict[int, float]] = defaultdict(dict)
+"""The mean time of each benchmark by repository size."""
+
+MEMORY_RESULTS: Dict[str, Dict[int, MemoryUsage]] = defaultdict(dict)
+"""The memory usage of each stage by repository size."""
+
+
+def benchmark_sizes() -> List[int]:
+    """Return the repository sizes to benchmark, or an empty list if benchmarks are disabled."""
+    value = os.environ.get(BENCHMARKS_ENVVAR, "").strip().lower()
+    if value in {"", "0", "false", "no"}:
+        return []
+    if value in {"1", "true", "yes", "all"}:
+        return DEFAULT_SIZES
+    return [int(size.strip().replace("k", "000")) for size in value.split(",")]
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    """Run benchmarks that use `repo_size` once for each selected size, or skip them."""
+    if "repo_size" not in metafunc.fixturenames:
+        return
+
+    if sizes := benchmark_sizes():
+        metafunc.parametrize("repo_size", sizes, ids=[f"{size}-commits" for size in sizes], scope="session")
+    else:
+        skip = pytest.mark.skip(reason=f"Set {BENCHMARKS_ENVVAR} to run the benchmarks.")
+        metafunc.parametrize("repo_size", [pytest.param(0, marks=skip)], ids=["disabled"], scope="session")
+
+
+@pytest.fixture(scope="session")
+def synthetic_repo(repo_size: int, tmp_path_factory: pytest.TempPathFactory) -> Repo:
+    """A synthetic repository with `repo_size` commits, created once per session."""
+    spec = RepoSpec(commits=repo_size)
+    path = tmp_path_factory.getbasetemp() / f"synthetic-{spec.key}"
+    if not path.exists():
+        create_repo(spec, path)
+    return Repo(path)
+
+
+@pytest.fixture(scope="session")
+def config() -> Configuration:
+    """The default configuration, without reading or writing a changelog file."""
+    configuration = get_default_config()
+    configuration.starting_tag_pipeline = []
+    configuration.output_pipeline = []
+    return configuration
+
+
+@pytest.fixture(scope="session")
+def version_contexts(synthetic_repo: Repo, config: Configuration) -> List[VersionContext]:
+    """The version contexts of the synthetic repository, created once per size."""
+    return get_context_from_tags(synthetic_repo, config)
+
+
+@pytest.fixture
+def scaling(request: pytest.FixtureRequest, repo_size: int):
+    """Record the mean time of the test's benchmark for the scaling table."""
+    benchmark = request.getfixturevalue("benchmark")
+    yield benchmark
+    if benchmark.stats:
+        SCALING_RESULTS[request.node.originalname][repo_size] = benchmark.stats.stats.mean
+
+
+def scaling_exponent(small: tuple, large: tuple) -> float:
+    """
+    Estimate `k` in `time ~ size ** k` from two `(size, time)` measurements.
+
+    A value near 1 is linear scaling; near 2 is quadratic.
+    """
+    (small_size, small_time), (large_size, large_time) = small, large
+    if small_time <= 0 or large_time <= 0 or small_size == large_size:
+        return math.nan
+    return math.log(large_time / small_time) / math.log(large_size / small_size)
+
+
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter) -> None:
+    """Show how each benchmark scales with the repository size, and the memory used by each stage."""
+    if MEMORY_RESULTS:
+        terminalreporter.section("memory usage")
+        for stage, results in sorted(MEMORY_RESULTS.items()):
+            usages = ", ".join(
+                f"{size:,} commits: {usage.python_peak / 2**20:.1f} MiB Python, {usage.rss_peak / 2**20:.1f} MiB RSS"
+                for size, usage in sorted(results.items())
+            )
+            terminalreporter.write_line(f"{stage}: {usages}")
+
+    if not SCALING_RESULTS:
+        return
+
+    terminalreporter.section("benchmark scaling")
+    for name, results in sorted(SCALING_RESULTS.items()):
+        measurements = sorted(results.items())
+        timings = ", ".join(f"{size:,} commits: {seconds:.3f}s" for size, seconds in measurements)
+        exponents = ", ".join(
+            f"n^{scaling_exponent(small, large):.2f}" for small, large in zip(measurements, measurements[1:])
+        )
+        terminalreporter.write_line(f"{name}: {timings}" + (f" (scaling {exponents})" if exponents else ""))
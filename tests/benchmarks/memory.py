@@ -0,0 +1,144 @@
+"""Measure and budget the memory used by a stage."""
+
+import os
+import re
+import resource
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ruamel.yaml import YAML
+
+MIB = 1024 * 1024
+BUDGETS_ENVVAR = "CHANGELOG_MEMORY_BUDGETS"
+"""The environment variable with the path of a budget file to use instead of the default one."""
+
+DEFAULT_BUDGETS_PATH = Path(__file__).parent / "memory-budgets.yaml"
+"""The budgets used when the environment variable isn't set."""
+
+PROC_STATUS = Path("/proc/self/status")
+PROC_CLEAR_REFS = Path("/proc/self/clear_refs")
+
+
+@dataclass
+class MemoryUsage:
+    """The memory used by one run of a stage."""
+
+    python_peak: int
+    """The peak size in bytes of the Python objects allocated by the stage, measured by `tracemalloc`."""
+
+    rss_peak: int
+    """How far in bytes the peak resident set size of the process rose above its size before the stage."""
+
+
+def _high_water_mark() -> int:
+    """Return the peak resident set size of the process in bytes."""
+    if PROC_STATUS.exists():
+        match = re.search(r"VmHWM:\s+(\d+) kB", PROC_STATUS.read_text(encoding="utf-8"))
+        if match:
+            return int(match.group(1)) * 1024
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _current_rss() -> Optional[int]:
+    """Return the resident set size of the process in bytes, if the platform reports it."""
+    if PROC_STATUS.exists():
+        match = re.search(r"VmRSS:\s+(\d+) kB", PROC_STATUS.read_text(encoding="utf-8"))
+        if match:
+            return int(match.group(1)) * 1024
+    return None
+
+
+def _reset_high_water_mark() -> bool:
+    """Reset the peak resident set size to the current size, where Linux allows it."""
+    try:
+        PROC_CLEAR_REFS.write_text("5", encoding="utf-8")
+    except OSError:
+        return False
+    return True
+
+
+def measure(func: Callable, *args, **kwargs) -> Tuple[Any, MemoryUsage]:
+    """
+    Call a function and measure the memory it uses.
+
+    Where the peak resident set size can't be reset, the RSS peak only counts growth above the previous peak of the
+    process, so it under-reports stages that run after a bigger one.
+
+    Args:
+        func: The function to call.
+        *args: The positional arguments of the function.
+        **kwargs: The keyword arguments of the function.
+
+    Returns:
+        The result of the function and its memory usage.
+    """
+    baseline = _current_rss() if _reset_high_water_mark() else None
+    if baseline is None:
+        baseline = _high_water_mark()
+
+    tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)
+        _, python_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, MemoryUsage(python_peak=python_peak, rss_peak=max(_high_water_mark() - baseline, 0))
+
+
+@dataclass
+class Budget:
+    """A memory limit that grows linearly with the number of commits."""
+
+    base: float = 0.0
+    """The MiB allowed regardless of the repository size."""
+
+    per_1k_commits: float = 0.0
+    """The MiB allowed for each thousand commits."""
+
+    def limit(self, commits: int) -> int:
+        """Return the limit in bytes for a repository with this many commits."""
+        return int((self.base + self.per_1k_commits * commits / 1000) * MIB)
+
+
+def load_budgets(path: Optional[Path] = None) -> Dict[str, Dict[str, Budget]]:
+    """
+    Read the memory budgets of each stage.
+
+    Args:
+        path: The budget file. If `None`, the `CHANGELOG_MEMORY_BUDGETS` environment variable or the default file is
+            used.
+
+    Returns:
+        The budgets of each stage, by measurement (`python_peak` or `rss_peak`).
+    """
+    path = path or Path(os.environ.get(BUDGETS_ENVVAR) or DEFAULT_BUDGETS_PATH)
+    contents = YAML(typ="safe").load(path.read_text(encoding="utf-8")) or {}
+    return {
+        stage: {measurement: Budget(**values) for measurement, values in measurements.items()}
+        for stage, measurements in contents.items()
+    }
+
+
+def over_budget(usage: MemoryUsage, budgets: Dict[str, Budget], commits: int) -> Dict[str, Tuple[int, int]]:
+    """
+    Compare the memory usage of a stage to its budgets.
+
+    Args:
+        usage: The measured memory usage.
+        budgets: The budgets of the stage, by measurement.
+        commits: The number of commits in the repository.
+
+    Returns:
+        The measured and allowed bytes of each measurement over its budget.
+    """
+    exceeded = {}
+    for measurement, budget in budgets.items():
+        used, allowed = getattr(usage, measurement), budget.limit(commits)
+        if used > allowed:
+            exceeded[measurement] = (used, allowed)
+    return exceeded
@@ -0,0 +1,136 @@
+"""Generate deterministic git repositories of any size for benchmarks."""
+
+import hashlib
+import random
+import subprocess
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+CONVENTIONAL_TYPES = ["feat", "fix", "docs", "refactor", "perf", "test", "chore"]
+FREE_FORM_VERBS = ["Add", "Fix", "Update", "Change", "Remove", "Improve", "Rename"]
+WORDS = (
+    "parser cache module request handler config option template render output commit tag release version "
+    "pipeline action metadata trailer author branch history index buffer stream worker queue session"
+).split()
+TRAILER_TOKENS = ["Co-authored-by", "Reviewed-by", "Signed-off-by", "Helped-by"]
+AUTHORS = [
+    ("Alice Example", "alice@example.com"),
+    ("Bob Example", "bob@example.com"),
+    ("Carol Example", "carol@x.org"),
+]
+START_TIMESTAMP = 1_600_000_000
+"""The commit time of the first commit. Each commit is an hour after the previous one."""
+
+
+@dataclass(frozen=True)
+class RepoSpec:
+    """The shape of a synthetic repository."""
+
+    commits: int = 1000
+    """The number of commits."""
+
+    tag_every: int = 50
+    """Tag every nth commit with the next version."""
+
+    files_per_commit: int = 3
+    """The number of files each commit changes."""
+
+    file_pool: int = 200
+    """The number of distinct files the commits change."""
+
+    body_lines: int = 3
+    """The number of lines in the body of each commit message."""
+
+    conventional_ratio: float = 0.7
+    """The fraction of commits with conventional commit summaries."""
+
+    trailer_ratio: float = 0.3
+    """The fraction of commits with trailers."""
+
+    seed: int = 42
+    """The seed of the random generator. The same spec always generates the same repository."""
+
+    @property
+    def key(self) -> str:
+        """A short identifier of the spec, for naming generated repositories."""
+        return hashlib.sha1(repr(sorted(asdict(self).items())).encode("utf-8")).hexdigest()[:12]  # noqa: S324
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    """Return a sentence of random words."""
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _message(rng: random.Random, spec: RepoSpec) -> str:
+    """Return a random commit message following the spec's ratios."""
+    if rng.random() < spec.conventional_ratio:
+        scope = f"({rng.choice(WORDS)})" if rng.random() < 0.5 else ""
+        breaking = "!" if rng.random() < 0.02 else ""
+        summary = f"{rng.choice(CONVENTIONAL_TYPES)}{scope}{breaking}: {_sentence(rng, 6)}"
+    else:
+        summary = f"{rng.choice(FREE_FORM_VERBS)} {_sentence(rng, 6)}"
+
+    lines = [summary, ""]
+    lines.extend(_sentence(rng, 10) for _ in range(spec.body_lines))
+    if rng.random() < spec.trailer_ratio:
+        name, email = rng.choice(AUTHORS)
+        lines.extend(["", f"{rng.choice(TRAILER_TOKENS)}: {name} <{email}>"])
+    return "\n".join(lines) + "\n"
+
+
+def _data(text: str) -> bytes:
+    """Return a fast-import `data` command for the text."""
+    encoded = text.encode("utf-8")
+    return b"data %d\n%s\n" % (len(encoded), encoded)
+
+
+def fast_import_stream(spec: RepoSpec) -> bytes:
+    """
+    Return a `git fast-import` stream that creates the repository described by the spec.
+
+    Args:
+        spec: The shape of the repository.
+
+    Returns:
+        The stream of fast-import commands.
+    """
+    rng = random.Random(spec.seed)  # noqa: S311
+    chunks = []
+    version = 0
+    for index in range(spec.commits):
+        name, email = rng.choice(AUTHORS)
+        timestamp = START_TIMESTAMP + index * 3600
+        chunks.append(b"commit refs/heads/master\nmark :%d\n" % (index + 1))
+        chunks.append(f"author {name} <{email}> {timestamp} +0000\n".encode("utf-8"))
+        chunks.append(f"committer {name} <{email}> {timestamp} +0000\n".encode("utf-8"))
+        chunks.append(_data(_message(rng, spec)))
+        if index:
+            chunks.append(b"from :%d\n" % index)
+        for file_number in rng.sample(range(spec.file_pool), min(spec.files_per_commit, spec.file_pool)):
+            path = f"src/package_{file_number % 10}/module_{file_number}.py"
+            chunks.append(f"M 100644 inline {path}\n".encode("utf-8"))
+            chunks.append(_data(f"# {index}\nVALUE = {rng.random()!r}"))
+        if (index + 1) % spec.tag_every == 0:
+            version += 1
+            chunks.append(b"reset refs/tags/%d.%d.0\nfrom :%d\n\n" % (version // 10, version % 10, index + 1))
+    return b"".join(chunks)
+
+
+def create_repo(spec: RepoSpec, path: Path) -> Path:
+    """
+    Create a bare repository described by the spec.
+
+    Args:
+        spec: The shape of the repository.
+        path: The directory to create the repository in.
+
+    Returns:
+        The path to the repository.
+    """
+    git = ["git", "-C", str(path)]
+    path.mkdir(parents=True, exist_ok=True)
+    subprocess.run([*git, "init", "--quiet", "--bare", "--initial-branch=master"], check=True)  # noqa: S603
+    subprocess.run(  # noqa: S603
+        [*git, "fast-import", "--quiet"], input=fast_import_stream(spec), check=True
+    )
+    return path
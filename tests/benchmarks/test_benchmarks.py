@@ -0,0 +1,44 @@
+"""Timing benchmarks of the main stages on synthetic repositories."""
+
+import pytest
+from click.testing import CliRunner
+
+from generate_changelog import commits, release_hint, templating
+from generate_changelog.cli import cli
+
+pytest.importorskip("pytest_benchmark")
+
+
+def rounds(repo_size: int) -> int:
+    """Run the large repositories once; they take long enough to measure."""
+    return 3 if repo_size <= 10_000 else 1
+
+
+def test_get_context_from_tags(scaling, synthetic_repo, config, repo_size):
+    """Parse and process every commit of the repository."""
+    result = scaling.pedantic(commits.get_context_from_tags, args=(synthetic_repo, config), rounds=rounds(repo_size))
+    assert result
+
+
+def test_suggest_release_type(scaling, version_contexts, config, repo_size):
+    """Apply the release hint rules to the unreleased commits."""
+    result = scaling.pedantic(
+        release_hint.suggest_release_type, args=("master", version_contexts, config), rounds=rounds(repo_size)
+    )
+    assert result
+
+
+def test_render_changelog(scaling, version_contexts, config, repo_size):
+    """Render the full changelog."""
+    result = scaling.pedantic(templating.render_changelog, args=(version_contexts, config), rounds=rounds(repo_size))
+    assert result.full
+
+
+def test_cli(scaling, synthetic_repo, tmp_path, repo_size):
+    """Run the whole command."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("starting_tag_pipeline:\noutput_pipeline:\n", encoding="utf-8")
+    args = ["-r", synthetic_repo.git_dir, "-c", str(config_path), "-o", "release-hint", "--skip-output-pipeline"]
+
+    result = scaling.pedantic(CliRunner().invoke, args=(cli, args), rounds=rounds(repo_size))
+    assert result.exit_code == 0, result.output
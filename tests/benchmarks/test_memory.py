@@ -0,0 +1,59 @@
+"""Memory benchmarks of the main stages on synthetic repositories, checked against the memory budgets."""
+
+import pytest
+
+from generate_changelog import commits, git_ops, notes, templating
+from generate_changelog.configuration import get_default_config
+from tests.benchmarks.conftest import MEMORY_RESULTS
+from tests.benchmarks.memory import load_budgets, measure, over_budget
+
+
+@pytest.fixture(scope="module")
+def budgets():
+    """The memory budgets of each stage."""
+    return load_budgets()
+
+
+@pytest.fixture
+def check_budget(request, budgets, repo_size):
+    """Measure a stage, record its usage, and fail if it is over budget."""
+
+    def check(stage: str, func, *args):
+        result, usage = measure(func, *args)
+        MEMORY_RESULTS[stage][repo_size] = usage
+        exceeded = over_budget(usage, budgets.get(stage, {}), repo_size)
+        assert not exceeded, ", ".join(
+            f"{stage} {measurement}: {used / 2**20:.1f} MiB > {allowed / 2**20:.1f} MiB"
+            for measurement, (used, allowed) in exceeded.items()
+        )
+        return result
+
+    return check
+
+
+@pytest.fixture
+def all_commits(synthetic_repo, config):
+    """Every commit of the repository as one unreleased version."""
+    return git_ops.GitTag(tag_name="HEAD", tag_info=None, commits=git_ops.parse_commits(synthetic_repo, config=config))
+
+
+def test_parse_commits_memory(check_budget, synthetic_repo, config):
+    """Parse the whole history."""
+    assert check_budget("parse_commits", git_ops.parse_commits, synthetic_repo, None, None, config)
+
+
+def test_create_version_context_memory(check_budget, all_commits, config):
+    """Process every commit into one version context."""
+    assert check_budget("create_version_context", commits.create_version_context, config, all_commits).grouped_commits
+
+
+def test_render_changelog_memory(check_budget, version_contexts, config):
+    """Render the changelog of the whole history."""
+    assert check_budget("render_changelog", templating.render_changelog, version_contexts, config).full
+
+
+def test_split_changelog_memory(check_budget, version_contexts, config):
+    """Split a changelog of the whole history into its version sections."""
+    changelog = templating.render_changelog(version_contexts, config).full
+    section_pattern = notes.get_section_pattern(get_default_config())
+    assert check_budget("split_changelog", notes.split_changelog, changelog, section_pattern, config)
@@ -14,6 +14,9 @@ import pytest
 from faker import Faker
 from git import Actor, Repo
 
+from generate_changelog.cat_file import close_cat_files
+from generate_changelog.configuration import reset_config
+
 fake = Faker()
 
 # https://www.reddit.com/r/git/comments/nl36wl/the_top_1_commit_trailers_of_gitgit/
@@ -106,6 +109,20 @@ def commit_factory(
     )
 
 
+@pytest.fixture(autouse=True)
+def reset_global_config():
+    """Discard changes to the global configuration, such as those made by CLI runs, after each test."""
+    yield
+    reset_config()
+
+
+@pytest.fixture(autouse=True)
+def close_git_processes():
+    """Stop the `git cat-file` processes started by a test, since its repository is deleted."""
+    yield
+    close_cat_files()
+
+
 @pytest.fixture
 def bare_git_repo(tmp_path) -> Repo:
     """Create a temporary bare git repository."""
@@ -203,3 +220,35 @@ def inside_dir(dirpath: Path) -> Generator[None, None, None]:
         yield
     finally:
         os.chdir(old_path)
+
+
+@pytest.fixture
+def monorepo(tmp_path) -> Repo:
+    """Make a repository with two packages, each with its own tags."""
+    repo = Repo.init(tmp_path / "monorepo", initial_branch="master")
+    configparser = repo.config_writer("repository")
+    configparser.set_value("commit", "gpgsign", False)
+    configparser.set_value("tag", "gpgsign", False)
+    configparser.release()
+
+    commits = [
+        ("new: add package a", "packages/a/a.py", "a-1.0.0"),
+        ("new: add package b", "packages/b/b.py", "b-1.0.0"),
+        ("fix: fix a bug in a", "packages/a/a.py", None),
+        ("new: add the shared docs", "docs/index.md", None),
+        ("update: change b", "packages/b/b.py", None),
+    ]
+    for day, (message, file_path, tag) in enumerate(commits, start=1):
+        path = Path(repo.working_dir) / file_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"{message}\n")
+        repo.index.add([file_path])
+        repo.index.commit(
+            message=message,
+            author=Actor("Bob", "bob@example.com"),
+            committer=Actor("Bob", "bob@example.com"),
+            commit_date=f"2022-01-0{day} 10:00:00",
+        )
+        if tag:
+            repo.create_tag(tag)
+    return repo
@@ -0,0 +1,125 @@
+"""Tests of action result memoization."""
+
+import pytest
+
+from generate_changelog import action_cache, pipeline
+from generate_changelog.configuration import set_config
+
+CALLS = []
+
+
+def counting_upper(text: str) -> str:
+    """Upper-case the text and record the call."""
+    CALLS.append(text)
+    return text.upper()
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    """Start each test with an empty action cache and call log."""
+    CALLS.clear()
+    action_cache.reset_action_cache()
+    yield
+    action_cache.reset_action_cache()
+    set_config("action_cache_path", None)
+
+
+def test_make_key_depends_on_all_parts():
+    """Changing the action, arguments, or input changes the key."""
+    key = action_cache.make_key("bash", ["echo"], {"a": 1}, "input")
+    assert key == action_cache.make_key("bash", ["echo"], {"a": 1}, "input")
+    assert key != action_cache.make_key("sh", ["echo"], {"a": 1}, "input")
+    assert key != action_cache.make_key("bash", ["echo 2"], {"a": 1}, "input")
+    assert key != action_cache.make_key("bash", ["echo"], {"a": 2}, "input")
+    assert key != action_cache.make_key("bash", ["echo"], {"a": 1}, "other input")
+
+
+def test_lru_evicts_least_recently_used():
+    """The in-memory cache keeps only the most recently used results."""
+    cache = action_cache.ActionCache(max_size=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+
+    assert cache.get("b") is action_cache.MISSING
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_expired_results_are_missing(mocker):
+    """Results are not returned after their time to live."""
+    mocked_time = mocker.patch("generate_changelog.action_cache.time.time", return_value=1000.0)
+    cache = action_cache.ActionCache()
+    cache.set("a", "1", ttl=60)
+    assert cache.get("a") == "1"
+
+    mocked_time.return_value = 1061.0
+    assert cache.get("a") is action_cache.MISSING
+
+
+def test_persistent_store_survives_new_cache(tmp_path):
+    """Results written to the persistent store are available to a new cache."""
+    db_path = tmp_path / "cache" / "actions.db"
+    cache = action_cache.ActionCache(path=db_path)
+    cache.set("a", "1", ttl=60)
+    cache.set("b", "2")
+    cache.close()
+
+    new_cache = action_cache.ActionCache(path=db_path)
+    assert new_cache.get("a") == "1"
+    assert new_cache.get("b") == "2"
+    new_cache.close()
+
+
+def test_only_scalar_results_are_cached(tmp_path):
+    """Mutable results aren't cached, so changing them can't change later hits."""
+    cache = action_cache.ActionCache(path=tmp_path / "actions.db")
+    result = ["a"]
+    cache.set("list", result)
+    cache.set("tuple", ("a", "b"))
+    cache.set("number", 3)
+    result.append("b")
+
+    assert cache.get("list") is action_cache.MISSING
+    assert cache.get("tuple") is action_cache.MISSING
+    assert cache.get("number") == 3
+    cache.close()
+
+
+def test_cached_action_is_called_once():
+    """An action with `cache: true` reuses its result for the same input."""
+    pipe = pipeline.pipeline_factory([{"action": "tests.test_action_cache.counting_upper", "cache": True}])
+    assert pipe.run("foo") == "FOO"
+    assert pipe.run("foo") == "FOO"
+    assert pipe.run("bar") == "BAR"
+
+    assert CALLS == ["foo", "bar"]
+
+
+def test_uncached_action_is_called_every_time():
+    """Actions are not cached by default."""
+    pipe = pipeline.pipeline_factory([{"action": "tests.test_action_cache.counting_upper"}])
+    pipe.run("foo")
+    pipe.run("foo")
+
+    assert CALLS == ["foo", "foo"]
+
+
+def test_cached_action_uses_persistent_store(tmp_path):
+    """Cached results are kept between runs when `action_cache_path` is configured."""
+    set_config("action_cache_path", str(tmp_path / "actions.db"))
+    actions = [{"action": "tests.test_action_cache.counting_upper", "cache": True, "cache_ttl": "1d"}]
+    assert pipeline.pipeline_factory(actions).run("foo") == "FOO"
+
+    action_cache.reset_action_cache()
+    assert pipeline.pipeline_factory(actions).run("foo") == "FOO"
+    assert CALLS == ["foo"]
+
+
+def test_actions_saving_metadata_are_not_cached(caplog):
+    """Caching is disabled for actions that save metadata, since their side effects would be lost."""
+    action = pipeline.Action("ParseTrailers", kwargs={"commit_metadata": "save_commit_metadata"}, cache=True)
+
+    assert not action.cache
+    assert "can't be cached" in caplog.text
@@ -0,0 +1,120 @@
+"""Tests of generating changelogs for many repositories."""
+
+import json
+
+import pytest
+import rich_click as click
+from click.testing import CliRunner
+
+from generate_changelog import batch
+from generate_changelog.cli import cli
+
+runner = CliRunner()
+
+
+def test_read_manifest_resolves_paths(tmp_path):
+    """Paths in the manifest are relative to the manifest, and items may be plain paths."""
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(
+        "- repos/one\n- path: repos/two\n  config: configs/two.yaml\n  overrides:\n    unreleased_label: Next\n"
+    )
+
+    entries = batch.read_manifest(manifest)
+
+    assert entries == [
+        {"path": str(tmp_path / "repos" / "one")},
+        {
+            "path": str(tmp_path / "repos" / "two"),
+            "config": str(tmp_path / "configs" / "two.yaml"),
+            "overrides": {"unreleased_label": "Next"},
+        },
+    ]
+
+
+@pytest.mark.parametrize("content", ["path: repos/one\n", "- config: one.yaml\n"])
+def test_read_manifest_rejects_invalid_manifests(tmp_path, content):
+    """A manifest must be a list of repositories with paths."""
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(content)
+
+    with pytest.raises(click.UsageError):
+        batch.read_manifest(manifest)
+
+
+def test_process_repository(default_repo):
+    """A repository's release hint, notes and timings are returned."""
+    entry = {"path": default_repo.git_dir, "overrides": {"starting_tag_pipeline": []}}
+
+    result = batch.process_repository(entry, run_output_pipeline=False)
+
+    assert result["error"] is None
+    assert result["release_hint"] == "minor"
+    assert "modified ``b`` XXX" in result["notes"]
+    assert set(result["timings"]) == {"setup", "generate", "total"}
+
+
+def test_process_repository_reuses_the_worker_config(default_repo, tmp_path, mocker, monkeypatch):
+    """The worker builds the base configuration once, and each repository gets its own copy of it."""
+    from generate_changelog import configuration, pipeline
+
+    monkeypatch.setattr(batch, "_WORKER_CONFIG", None)
+    monkeypatch.setattr(pipeline, "_PIPELINE_CACHE", None)
+    base_config = tmp_path / "base.yaml"
+    base_config.write_text("unreleased_label: Next\nstarting_tag_pipeline: []\n")
+    batch.init_worker(base_config=str(base_config))
+    get_default_config = mocker.spy(configuration, "get_default_config")
+    entry = {"path": default_repo.git_dir, "overrides": {"variables": {"repo": "one"}}}
+
+    results = [batch.process_repository(entry, str(base_config), run_output_pipeline=False) for _ in range(2)]
+
+    assert [result["error"] for result in results] == [None, None]
+    assert get_default_config.call_count == 0
+    assert "Next" in results[0]["notes"]
+    assert "repo" not in batch._WORKER_CONFIG[1].variables
+
+
+def test_process_repository_reports_errors(tmp_path):
+    """Errors are returned in the result instead of being raised."""
+    result = batch.process_repository({"path": str(tmp_path / "missing")})
+
+    assert result["release_hint"] is None
+    assert result["error"].startswith("FileNotFoundError")
+
+
+def test_batch_command_isolates_failures(default_repo, tmp_path):
+    """Every repository gets a result line, and a failure makes the command exit with 1."""
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps([default_repo.git_dir, str(tmp_path / "missing")]))
+
+    result = runner.invoke(cli, ["batch", str(manifest), "--jobs", "2", "--skip-output-pipeline"])
+
+    assert result.exit_code == 1
+    results = {item["path"]: item for item in map(json.loads, result.stdout.splitlines())}
+    assert results[default_repo.git_dir]["release_hint"] == "minor"
+    assert results[default_repo.git_dir]["error"] is None
+    assert results[str(tmp_path / "missing")]["error"]
+
+
+def test_run_batch_reports_dead_workers(mocker):
+    """A repository whose worker process died gets a result with every key."""
+    from concurrent.futures import Future
+    from concurrent.futures.process import BrokenProcessPool
+
+    def submit(*args, **kwargs):
+        future = Future()
+        future.set_exception(BrokenProcessPool("A worker process died."))
+        return future
+
+    executor = mocker.patch.object(batch, "ProcessPoolExecutor").return_value.__enter__.return_value
+    executor.submit.side_effect = submit
+
+    (result,) = batch.run_batch([{"path": "repo"}])
+
+    assert result == {
+        "path": "repo",
+        "release_hint": None,
+        "notes": None,
+        "starting_tag": None,
+        "timings": {},
+        "error": "BrokenProcessPool: A worker process died.",
+    }
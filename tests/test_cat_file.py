@@ -0,0 +1,59 @@
+"""Tests of the pooled `git cat-file` processes."""
+
+import pytest
+from git import GitCommandError
+
+from generate_changelog import cat_file
+
+
+def test_read_returns_objects_in_request_order(default_repo, monkeypatch):
+    """Objects are returned in the order requested, across several pipelined chunks."""
+    monkeypatch.setattr(cat_file, "PIPELINE_DEPTH", 2)
+    shas = [commit.hexsha for commit in default_repo.iter_commits("HEAD")]
+    reader = cat_file.CatFile(default_repo.git_dir)
+
+    objects = reader.read([*shas, "HEAD"])
+    reader.close()
+
+    assert [obj.sha for obj in objects] == [*shas, shas[0]]
+    assert all(obj.type == "commit" for obj in objects)
+    assert objects[0].content == default_repo.commit(shas[0]).data_stream.read()
+
+
+def test_missing_objects_are_none(default_repo):
+    """Revisions that don't exist return `None` without stopping the other reads."""
+    reader = cat_file.CatFile(default_repo.git_dir)
+
+    objects = reader.read(["does-not-exist", "HEAD"])
+    headers = reader.check(["HEAD^{tree}", "0" * 40])
+    reader.close()
+
+    assert objects[0] is None
+    assert objects[1].sha == default_repo.head.commit.hexsha
+    assert headers[0] == cat_file.GitObject(default_repo.head.commit.tree.hexsha, "tree", headers[0].size)
+    assert headers[0].content is None
+    assert headers[1] is None
+
+
+def test_processes_are_pooled_and_restarted(default_repo):
+    """The same processes serve every request for a repository, and a closed reader starts new ones."""
+    reader = cat_file.get_cat_file(default_repo.git_dir)
+    reader.check(["HEAD"])
+    process = reader._processes["--batch-check"]
+
+    assert cat_file.get_cat_file(default_repo.git_dir) is reader
+    reader.check(["HEAD"])
+    assert reader._processes["--batch-check"] is process
+
+    cat_file.close_cat_files()
+    assert process.poll() is not None
+    assert reader.check(["HEAD"])[0].type == "commit"
+    reader.close()
+
+
+def test_unreadable_repository_raises(tmp_path):
+    """A failed `cat-file` process is reported as a git command error."""
+    reader = cat_file.CatFile(str(tmp_path / "missing"))
+    with pytest.raises(GitCommandError):
+        reader.read(["HEAD"])
+    reader.close()
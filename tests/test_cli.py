@@ -1,9 +1,12 @@
 """Tests of the command line interface."""
 
 import json
+import subprocess
+import sys
 import traceback
 from pathlib import Path
 
+import pytest
 from click.testing import CliRunner
 
 import generate_changelog
@@ -23,6 +26,32 @@ class TestCLI:
         assert result.exit_code == 0
         assert generate_changelog.__version__ in result.stdout
 
+    def test_generate_is_the_default_command(self, default_repo):
+        """Running without a command is the same as running the generate command."""
+        config = Path(__file__).parent / "fixtures" / "std-out-config.yaml"
+        args = ["-r", default_repo.git_dir, "-c", str(config), "--skip-output-pipeline", "-o", "release-hint"]
+
+        default_result = runner.invoke(cli, args)
+        explicit_result = runner.invoke(cli, ["generate", *args])
+
+        assert default_result.exit_code == explicit_result.exit_code == 0
+        assert default_result.stdout == explicit_result.stdout == "minor\n"
+
+    def test_help_shows_the_default_command_options(self):
+        """The help without a command is the help of the generate command."""
+        result = runner.invoke(cli, ["--help"])
+        explicit_result = runner.invoke(cli, ["generate", "--help"])
+
+        assert result.exit_code == explicit_result.exit_code == 0
+        assert "--starting-tag" in result.stdout
+        assert result.stdout == explicit_result.stdout
+
+    def test_command_help_shows_the_command_options(self):
+        """The help of a named command is not replaced by the default command's help."""
+        result = runner.invoke(cli, ["serve", "--help"])
+        assert result.exit_code == 0
+        assert "--starting-tag" not in result.stdout
+
     def test_generate_config_option_generates_config(self, tmp_path: Path):
         """The generate-config option should write a default configuration file to the current directory."""
         # Assemble and Act
@@ -83,6 +112,30 @@ class TestCLI:
         assert result.exit_code == 0
         assert "minor" in result.stdout
 
+    def test_generate_from_a_window_of_recent_commits(self, default_repo):
+        """The `--max-commits` option limits the changelog to the most recent commits."""
+        config = Path(__file__).parent / "fixtures" / "std-out-config.yaml"
+
+        result = runner.invoke(
+            cli,
+            [
+                "-r",
+                default_repo.git_dir,
+                "-c",
+                str(config),
+                "--skip-output-pipeline",
+                "-o",
+                "notes",
+                "--max-commits",
+                "2",
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "## 0.0.3" in result.stdout
+        assert "## 0.0.2" not in result.stdout
+        assert "Add file ``c``" not in result.stdout
+
     def test_generate_release_hint_branch_override(self, default_repo):
         """Can override the branch to generate the release hint from, if different from the current branch."""
         # Assemble
@@ -185,3 +238,64 @@ def test_alternative_changelog_path(default_repo):
 
     assert changelog_path.exists()
     assert not Path(working_dir / "CHANGELOG.md").exists()
+
+
+def test_generate_projects_release_hints(monorepo, tmp_path):
+    """With projects configured, the release hint of each project is output as JSON."""
+    config = tmp_path / "config.yaml"
+    config.write_text(
+        "starting_tag_pipeline:\n"
+        "projects:\n"
+        "  - name: a\n"
+        "    path: packages/a\n"
+        "    tag_pattern: ^a-\n"
+        "  - name: b\n"
+        "    path: packages/b\n"
+        "    tag_pattern: ^b-\n"
+    )
+
+    result = runner.invoke(
+        cli, ["-r", monorepo.working_dir, "-c", str(config), "--skip-output-pipeline", "-o", "release-hint"]
+    )
+
+    if result.exit_code != 0:
+        print(result.stdout)
+        traceback.print_exception(*result.exc_info)
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == {"a": "patch", "b": "minor"}
+
+
+HEAVY_MODULES = {
+    "git",
+    "jinja2",
+    "mdformat",
+    "ruamel.yaml",
+    "generate_changelog.commits",
+    "generate_changelog.configuration",
+    "generate_changelog.pipeline",
+    "generate_changelog.release_hint",
+}
+
+
+def imported_modules(code: str) -> set:
+    """Run python code in a new interpreter and return the modules it imported, using `-X importtime`."""
+    result = subprocess.run(  # NOQA: S603
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, encoding="utf-8", check=False
+    )
+    return {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        pytest.param("import generate_changelog.cli", id="import"),
+        pytest.param("from generate_changelog.cli import cli; cli(['--version'])", id="version"),
+        pytest.param("from generate_changelog.cli import cli; cli(['--help'])", id="help"),
+    ],
+)
+def test_startup_does_not_import_heavy_modules(code):
+    """Importing the CLI, or asking for its version or help, must not import modules needed to generate."""
+    modules = imported_modules(code)
+
+    assert "generate_changelog.cli" in modules
+    assert not modules & HEAVY_MODULES
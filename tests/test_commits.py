@@ -3,11 +3,14 @@ from tests.conftest import commit_factory
 
 import pytest
 from faker import Faker
+from git import Actor
 from pytest import param
 
 import generate_changelog.commits
+from generate_changelog.actions.metadata import MetadataCollector
 from generate_changelog.configuration import DEFAULT_COMMIT_CLASSIFIERS, get_default_config
 from generate_changelog.context import CommitContext
+from generate_changelog.git_ops import CommitRecord
 
 fake = Faker()
 
@@ -28,9 +31,20 @@ fake = Faker()
         param(commit_factory(summary="I don't know what this does"), "Other"),
     ),
 )
-def test_first_matching(string, expected):
-    """The first matching function should properly categorize a string."""
-    assert generate_changelog.commits.first_matching(DEFAULT_COMMIT_CLASSIFIERS, string) == expected
+def test_classify_commits(string, expected):
+    """Classifying a commit should properly categorize its summary."""
+    assert generate_changelog.commits.classify_commits(DEFAULT_COMMIT_CLASSIFIERS, [string]) == [expected]
+
+
+def test_classify_commits_in_a_batch():
+    """Classifying commits in a batch gives each commit the section of its first matching classifier."""
+    commits = [commit_factory(summary=summary) for summary in ("added a thing", "fixed a bug", "misc", "renamed x")]
+
+    categories = generate_changelog.commits.classify_commits(DEFAULT_COMMIT_CLASSIFIERS, commits)
+
+    assert categories == ["New", "Fixes", "Other", "Updates"]
+    assert generate_changelog.commits.classify_commits(DEFAULT_COMMIT_CLASSIFIERS, []) == []
+    assert generate_changelog.commits.first_matching(DEFAULT_COMMIT_CLASSIFIERS, commits[1]) == "Fixes"
 
 
 def test_commit_context():
@@ -93,3 +107,89 @@ def test_get_context_from_tags(default_repo):
     assert len(v.grouped_commits[0].commits) == 2
     assert len(v.grouped_commits[0].commits[0].metadata["trailers"]) == 5
     assert len(v.grouped_commits[0].commits[1].metadata["trailers"]) == 0
+
+
+def test_commit_context_files_load_on_first_use():
+    """Files that weren't prefetched are read from the commit record the first time they are used."""
+    loads = []
+    record = CommitRecord(
+        hexsha=fake.sha1(),
+        message="fix: something",
+        author=Actor("Bob", "bob@example.com"),
+        committer=Actor("Bob", "bob@example.com"),
+        committed_datetime=datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc),
+        files_loader=lambda sha: loads.append(sha) or ["docs/index.md"],
+    )
+
+    context = generate_changelog.commits.generate_commit_context(record, get_default_config(), None)
+
+    assert loads == []
+    assert "docs/index.md" in context.files
+    assert context.files == {"docs/index.md"}
+    assert loads == [record.hexsha]
+
+
+class SaveVersionNote:
+    """An action that saves its input to the version metadata."""
+
+    def __init__(self, version_metadata, prefix):
+        self.version_metadata = version_metadata
+        self.prefix = prefix
+
+    def __call__(self, text):
+        self.version_metadata(notes=[f"{self.prefix}{text.strip()}"], last=text.strip())
+        return text
+
+
+def test_version_metadata_is_saved_in_commit_order():
+    """Version metadata is merged commit by commit, summary before body, even though the pipelines run in batches."""
+    config = get_default_config()
+    for pipeline_name, prefix in (("summary_pipeline", "summary "), ("body_pipeline", "body ")):
+        setattr(
+            config,
+            pipeline_name,
+            [
+                {
+                    "action": "tests.test_commits.SaveVersionNote",
+                    "kwargs": {"version_metadata": "save_version_metadata", "prefix": prefix},
+                }
+            ],
+        )
+    records = [
+        CommitRecord(
+            hexsha=fake.sha1(),
+            message=f"Summary {number}\n\nBody {number}",
+            author=Actor("Bob", "bob@example.com"),
+            committer=Actor("Bob", "bob@example.com"),
+            committed_datetime=datetime.datetime(2022, 1, number, tzinfo=datetime.timezone.utc),
+        )
+        for number in (1, 2)
+    ]
+    version_metadata = MetadataCollector()
+
+    generate_changelog.commits.generate_commit_contexts(records, config, version_metadata)
+
+    assert version_metadata.metadata == {
+        "notes": ["summary Summary 1", "body Body 1", "summary Summary 2", "body Body 2"],
+        "last": "Body 2",
+    }
+
+
+def test_group_by_accessors():
+    """Group by names are compiled into functions, and names that aren't commit context attributes are rejected."""
+    from click import UsageError
+
+    commit = CommitContext(
+        sha="abc123",
+        commit_datetime=datetime.datetime(2024, 1, 1),
+        committer="Jane <jane@example.com>",
+        summary="Fix it",
+        body="",
+        grouping=(),
+        metadata={"category": "Fixes"},
+    )
+    accessors = generate_changelog.commits.group_by_accessors(("metadata.category", "summary"))
+    assert [accessor(commit) for accessor in accessors] == ["Fixes", "Fix it"]
+
+    with pytest.raises(UsageError, match="Can't group commits by 'metdata.category'"):
+        generate_changelog.commits.group_by_accessors(("metdata.category",))
@@ -67,3 +67,42 @@ def test_comprehensive_merge_bad_types():
     """
     with pytest.raises(ValueError):
         data_merge.comprehensive_merge([1, 2], (2, 3))
+
+
+@pytest.mark.parametrize(
+    ["args", "expected"],
+    [
+        param([{"a": 1}, {"a": 2}], {"a": 2}, id="scalars overwrite"),
+        param([{"a": [3, 1]}, {"a": [2, 3, 0]}], {"a": [3, 1, 2, 0]}, id="lists keep their order"),
+        param([{"a": (3, 1)}, {"a": (2, 3)}], {"a": (3, 1, 2)}, id="tuples keep their order"),
+        param([{"a": {1}}, {"a": {2}}], {"a": {1, 2}}, id="sets are updated"),
+        param([{"a": {"b": [1]}}, {"a": {"b": [2], "c": 3}}], {"a": {"b": [1, 2], "c": 3}}, id="nested dicts"),
+        param([{"a": [{"x": 1}]}, {"a": [{"x": 1}, {"x": 2}]}], {"a": [{"x": 1}, {"x": 2}]}, id="unhashable items"),
+    ],
+)
+def test_ordered_merger(args: list, expected: Any):
+    """The ordered merger merges like the comprehensive merge, keeping the order of items."""
+    merger = data_merge.OrderedMerger()
+    for arg in args:
+        merger.merge(arg)
+    assert merger.target == expected
+
+
+def test_ordered_merger_copies_mutable_values():
+    """Merged containers are copied, so changing the source doesn't change the target, while scalars are shared."""
+    name = "".join(["na", "me"])
+    source = {"a": [1], "b": {"c": name}}
+    merger = data_merge.OrderedMerger()
+    merger.merge(source)
+    source["a"].append(2)
+    source["b"]["d"] = 3
+
+    assert merger.target == {"a": [1], "b": {"c": "name"}}
+    assert merger.target["b"]["c"] is name
+
+
+def test_ordered_merger_bad_types():
+    """Merging a value into a value of another type raises an error."""
+    merger = data_merge.OrderedMerger({"a": [1]})
+    with pytest.raises(ValueError):
+        merger.merge({"a": (1,)})
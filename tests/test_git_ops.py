@@ -1,8 +1,12 @@
 """Test basic git ops."""
 
+from pathlib import Path
+from typing import Tuple
 from unittest.mock import MagicMock
 
+import click
 import pytest
+from git import Actor
 from pytest import param
 
 from generate_changelog import git_ops
@@ -85,3 +89,263 @@ def test_parse_commits_include_merges_flag(include_merges, expect_no_merges_flag
         assert "--no-merges" in call_args
     else:
         assert "--no-merges" not in call_args
+
+
+def test_get_changed_files(monorepo):
+    """The files changed by every commit are read with one log."""
+    changed_files = git_ops.get_changed_files(monorepo, get_default_config())
+    files_by_summary = {monorepo.commit(sha).summary: files for sha, files in changed_files.items()}
+
+    assert files_by_summary == {
+        "new: add package a": ["packages/a/a.py"],
+        "new: add package b": ["packages/b/b.py"],
+        "fix: fix a bug in a": ["packages/a/a.py"],
+        "new: add the shared docs": ["docs/index.md"],
+        "update: change b": ["packages/b/b.py"],
+    }
+
+
+def test_parse_commits_reuses_history_commits(monorepo):
+    """Commit objects in the history index are shared between calls."""
+    history = git_ops.get_history_index(monorepo, get_default_config())
+
+    first = git_ops.parse_commits(monorepo, "a-1.0.0", config=get_default_config(), history=history)
+    second = git_ops.parse_commits(monorepo, "b-1.0.0", config=get_default_config(), history=history)
+
+    assert len(history.commits) == 4
+    assert all(commit is history.commits[commit.hexsha] for commit in first + second)
+
+
+def test_cached_history_index_is_read_again_when_refs_change(default_repo, monkeypatch):
+    """The cached history index is reused until a commit or tag moves `HEAD` or a ref."""
+    config = get_default_config()
+    assert git_ops.cached_history_index(default_repo, config) is None
+
+    monkeypatch.setattr(git_ops, "_HISTORY_CACHE", None)
+    git_ops.enable_history_cache()
+    history = git_ops.cached_history_index(default_repo, config)
+    assert git_ops.cached_history_index(default_repo, config) is history
+
+    default_repo.index.commit(message="new: another commit")
+    after_commit = git_ops.cached_history_index(default_repo, config)
+    assert after_commit is not history
+    assert default_repo.head.commit.hexsha in after_commit.changed_files
+
+    default_repo.create_tag("9.9.9")
+    after_tag = git_ops.cached_history_index(default_repo, config)
+    assert after_tag is not after_commit
+    assert "9.9.9" in [tag.name for tag in after_tag.tags]
+
+
+@pytest.fixture
+def annotated_tag(default_repo):
+    """Add an annotated tag with its own tagger and time zone to the default repo."""
+    committer = {
+        "GIT_COMMITTER_NAME": "Carol",
+        "GIT_COMMITTER_EMAIL": "carol@example.com",
+        "GIT_COMMITTER_DATE": "2022-02-01T10:00:00+0100",
+    }
+    with default_repo.git.custom_environment(**committer):
+        default_repo.git.tag("-a", "0.1.0", "-m", "Release 0.1.0")
+    return default_repo
+
+
+def test_backends_read_the_same_history(annotated_tag):
+    """The GitPython and subprocess backends return the same tags and commit records."""
+    results = []
+    for backend in git_ops.GIT_BACKENDS:
+        config = Configuration(git_backend=backend)
+        results.append((git_ops.get_tags(annotated_tag, config), git_ops.parse_commits(annotated_tag, config=config)))
+
+    (gitpython_tags, gitpython_commits), (subprocess_tags, subprocess_commits) = results
+    assert subprocess_tags == gitpython_tags
+    assert subprocess_commits == gitpython_commits
+    assert subprocess_tags[0].tagger == Actor("Carol", "carol@example.com")
+    assert subprocess_tags[0].tagged_datetime.isoformat() == "2022-02-01T10:00:00+01:00"
+    assert all(commit.files is not None for commit in subprocess_commits)
+
+
+@pytest.mark.parametrize("backend", git_ops.GIT_BACKENDS)
+def test_nested_tags_resolve_to_the_commit(annotated_tag, backend):
+    """A tag of an annotated tag points to the commit at the end of the chain, with its own tagger."""
+    tagger = {"GIT_COMMITTER_NAME": "Dave", "GIT_COMMITTER_EMAIL": "dave@example.com"}
+    with annotated_tag.git.custom_environment(**tagger):
+        annotated_tag.git.tag("-a", "0.1.0-final", "0.1.0", "-m", "Tag of a tag")
+
+    tags = {tag.name: tag for tag in git_ops.get_tags(annotated_tag, Configuration(git_backend=backend))}
+
+    assert tags["0.1.0-final"].commit == annotated_tag.head.commit.hexsha
+    assert tags["0.1.0-final"].tagger == Actor("Dave", "dave@example.com")
+
+
+@pytest.mark.parametrize("backend", git_ops.GIT_BACKENDS)
+def test_tags_without_a_tagger_use_the_commit_date(default_repo, backend, tmp_path):
+    """An annotated tag written without a tagger line gets the commit's committer and date."""
+    head = default_repo.head.commit
+    tag_object = tmp_path / "tag"
+    tag_object.write_text(f"object {head.hexsha}\ntype commit\ntag no-tagger\n\nNo tagger\n")
+    tag_sha = default_repo.git.hash_object("-t", "tag", "-w", "--literally", str(tag_object))
+    default_repo.git.update_ref("refs/tags/no-tagger", tag_sha)
+
+    tags = {tag.name: tag for tag in git_ops.get_tags(default_repo, Configuration(git_backend=backend))}
+
+    assert tags["no-tagger"].commit == head.hexsha
+    assert tags["no-tagger"].tagger == head.committer
+    assert tags["no-tagger"].tagged_datetime == head.committed_datetime
+
+
+@pytest.mark.parametrize("backend", git_ops.GIT_BACKENDS)
+def test_backend_get_commits(default_repo, backend):
+    """Commit records are returned in the order of the requested revisions."""
+    repo_backend = git_ops.get_backend(default_repo, Configuration(git_backend=backend))
+    shas = repo_backend.walk("HEAD")
+
+    records = repo_backend.get_commits(list(reversed(shas)))
+
+    assert [record.hexsha for record in records] == list(reversed(shas))
+    assert records[0].summary == default_repo.commit(shas[-1]).summary
+    assert records[0].message == default_repo.commit(shas[-1]).message
+
+
+def test_unknown_backend(default_repo):
+    """An unknown `git_backend` is a usage error."""
+    with pytest.raises(click.UsageError, match="Choose one of: gitpython, subprocess"):
+        git_ops.get_backend(default_repo, Configuration(git_backend="libgit2"))
+
+
+def test_topological_tag_order_ignores_clock_skew(bare_git_repo):
+    """Tags are ordered by ancestry, even when an older commit has a later date."""
+    bare_git_repo.index.commit(message="first", commit_date="2022-01-05 10:00:00")
+    bare_git_repo.create_tag("1.0.0")
+    bare_git_repo.index.commit(message="second, with a skewed clock", commit_date="2022-01-01 10:00:00")
+    bare_git_repo.create_tag("1.1.0")
+    bare_git_repo.index.commit(message="third", commit_date="2022-01-06 10:00:00")
+    config = Configuration(commit_graph="write")
+
+    by_date = git_ops.get_commits_by_tags(bare_git_repo, get_default_config().tag_pattern)
+    by_ancestry = git_ops.get_commits_by_tags(bare_git_repo, config.tag_pattern, config=config)
+
+    assert [group.tag_name for group in by_date] == ["HEAD", "1.0.0", "1.1.0"]
+    assert [group.tag_name for group in by_ancestry] == ["HEAD", "1.1.0", "1.0.0"]
+    assert [[commit.summary for commit in group.commits] for group in by_ancestry] == [
+        ["third"],
+        ["second, with a skewed clock"],
+        ["first"],
+    ]
+    assert (Path(bare_git_repo.git_dir) / "objects" / "info" / "commit-graph").exists()
+    assert not git_ops.ensure_commit_graph(bare_git_repo)
+
+
+def test_topological_walk_shares_a_commit_between_tags(default_repo):
+    """When several tags point to the same commit, the oldest tag gets its commits."""
+    default_repo.create_tag("0.0.3-copy", ref="0.0.3")
+    config = Configuration(commit_graph="use", tag_pattern=r"^0\.0\.3")
+
+    groups = git_ops.get_commits_by_tags(default_repo, config.tag_pattern, config=config)
+
+    assert {group.tag_name: len(group.commits) for group in groups} == {"HEAD": 1, "0.0.3": 0, "0.0.3-copy": 5}
+
+
+def test_unknown_commit_graph_mode(default_repo):
+    """An unknown `commit_graph` value is a usage error."""
+    config = Configuration(commit_graph="sometimes")
+    with pytest.raises(click.UsageError, match="Choose one of: off, use, write"):
+        git_ops.get_commits_by_tags(default_repo, config.tag_pattern, config=config)
+
+
+@pytest.fixture(params=list(git_ops.GIT_BACKENDS))
+def backend_config(request, monkeypatch) -> Tuple[Configuration, MagicMock]:
+    """The default configuration for each backend, and a mock that counts the backend's reads of changed files."""
+    backend_class = git_ops.GIT_BACKENDS[request.param]
+    spy = MagicMock(wraps=backend_class.changed_files)
+    monkeypatch.setattr(backend_class, "changed_files", lambda self, *args: spy(self, *args))
+    config = get_default_config()
+    config.git_backend = request.param
+    return config, spy
+
+
+def test_changed_files_are_read_on_first_access(default_repo, backend_config):
+    """Without a configuration that uses them, the changed files of a range are read once, when first accessed."""
+    config, changed_files = backend_config
+    commits = git_ops.parse_commits(default_repo, "0.0.1", config=config)
+
+    assert changed_files.call_count == 0
+    assert not commits[0].files_loaded
+    assert all(commit.files == [] for commit in commits)
+    assert changed_files.call_count == 1
+
+
+def test_changed_files_are_prefetched_when_used(default_repo, backend_config):
+    """A configuration that uses the changed files reads them with the commits."""
+    config, changed_files = backend_config
+    config.release_hint_rules = [{"match_result": "patch", "path": "src/*"}]
+
+    commits = git_ops.parse_commits(default_repo, "0.0.1", config=config)
+
+    assert changed_files.call_count == 1
+    assert all(commit.files_loaded for commit in commits)
+
+
+@pytest.mark.parametrize("commit_graph", ["off", "use"])
+@pytest.mark.parametrize(
+    ["window", "expected"],
+    [
+        param({"max_commits": 2}, {"HEAD": 1, "0.0.3": 1}, id="max-commits"),
+        param({"since": "2022-01-03 23:00:00"}, {"HEAD": 1, "0.0.3": 2}, id="since"),
+        param({"until": "2022-01-04 12:00:00"}, {"HEAD": 0, "0.0.3": 1, "0.0.2": 1, "0.0.1": 1}, id="until"),
+        param({"since": "2022-01-01 12:00:00", "until": "2022-01-04 12:00:00"}, {"HEAD": 0, "0.0.3": 1, "0.0.2": 1}),
+        param({"since": "2030-01-01"}, {"HEAD": 0}, id="empty"),
+    ],
+)
+def test_commits_in_a_window(default_repo, commit_graph, window, expected):
+    """Only the commits in the window are included, and the versions outside it are left out."""
+    config = get_default_config()
+    config.commit_graph = commit_graph
+    for option, value in window.items():
+        setattr(config, option, value)
+
+    groups = git_ops.get_commits_by_tags(default_repo, config.tag_pattern, config=config)
+
+    assert {group.tag_name: len(group.commits) for group in groups} == expected
+
+
+def test_window_prunes_older_tags(default_repo, monkeypatch):
+    """The ranges of the tags older than the window are never walked."""
+    config = get_default_config()
+    config.max_commits = 2
+    parse_commits = MagicMock(wraps=git_ops.parse_commits)
+    monkeypatch.setattr(git_ops, "parse_commits", parse_commits)
+
+    git_ops.get_commits_by_tags(default_repo, config.tag_pattern, config=config)
+
+    assert [call.args[1:3] for call in parse_commits.call_args_list] == [("0.0.3", "HEAD"), ("0.0.2", "0.0.3")]
+
+
+@pytest.mark.parametrize("commit_graph", ["off", "use"])
+@pytest.mark.parametrize(
+    ["paths", "expected"],
+    [
+        param(["packages/a"], {"HEAD": ["fix: fix a bug in a"], "b-1.0.0": [], "a-1.0.0": ["new: add package a"]}),
+        param(
+            [":(glob)packages/*/b.py"],
+            {"HEAD": ["update: change b"], "b-1.0.0": ["new: add package b"], "a-1.0.0": []},
+            id="glob",
+        ),
+    ],
+)
+def test_commits_in_paths(monorepo, monkeypatch, commit_graph, paths, expected):
+    """Git filters the history by the configured pathspecs, so other commits are never read."""
+    config = get_default_config()
+    config.commit_graph = commit_graph
+    config.paths = paths
+    read_shas = []
+    backend_class = git_ops.GIT_BACKENDS[config.git_backend]
+    get_commits = backend_class.get_commits
+    monkeypatch.setattr(
+        backend_class, "get_commits", lambda self, revs: read_shas.extend(revs) or get_commits(self, revs)
+    )
+
+    groups = git_ops.get_commits_by_tags(monorepo, ".*", config=config)
+
+    assert {group.tag_name: [commit.summary for commit in group.commits] for group in groups} == expected
+    assert len(read_shas) == 1 + sum(len(summaries) for summaries in expected.values())  # HEAD is always read
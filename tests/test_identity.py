@@ -0,0 +1,103 @@
+"""Tests of identity parsing and mailmap resolution."""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from git import Actor, Repo
+from pytest import param
+
+from generate_changelog.commits import get_context_from_tags
+from generate_changelog.configuration import get_default_config
+from generate_changelog.identity import IdentityResolver, format_contact, has_mailmap, parse_contact
+
+
+@pytest.fixture
+def mailmap_repo(tmp_path) -> Repo:
+    """A repository with a `.mailmap` and commits by the old identities of its people."""
+    repo = Repo.init(tmp_path / "mailmap-repo", initial_branch="master")
+    mailmap = Path(repo.working_dir) / ".mailmap"
+    mailmap.write_text(
+        "Bob Smith <bob@example.com> <bobby@old.example.com>\n"
+        "Alice Jones <alice@example.com> Al <al@old.example.com>\n",
+        encoding="utf-8",
+    )
+    repo.index.add([".mailmap"])
+    old_bob = Actor("Bobby", "bobby@old.example.com")
+    for number in range(1, 4):
+        repo.index.commit(
+            f"new: commit {number}\n\nCo-authored-by: Al <al@old.example.com>",
+            author=old_bob,
+            committer=old_bob,
+            commit_date=f"2022-01-0{number}T10:00:00",
+        )
+    return repo
+
+
+@pytest.mark.parametrize(
+    ["contact", "expected"],
+    [
+        param("Bob Smith <bob@example.com>", ("Bob Smith", "bob@example.com"), id="name-and-email"),
+        param("Bob Smith", ("Bob Smith", ""), id="name-only"),
+        param("Bob Smith <>", ("Bob Smith <>", ""), id="empty-email"),
+    ],
+)
+def test_parse_contact(contact, expected):
+    """Contacts are split into a name and an email."""
+    assert parse_contact(contact) == expected
+
+
+def test_format_contact_interns_contacts():
+    """Equal contacts are the same string."""
+    name = "".join(["Bob", " Smith"])
+    assert format_contact(name, "bob@example.com") is format_contact("Bob Smith", "bob@example.com")
+
+
+def test_resolver_without_a_repository_keeps_contacts():
+    """Without a repository, contacts are returned as they are."""
+    resolver = IdentityResolver()
+    assert resolver.resolve("Bobby <bobby@old.example.com>") == "Bobby <bobby@old.example.com>"
+
+
+def test_resolver_maps_new_contacts_in_one_batch(mailmap_repo, monkeypatch):
+    """Each batch of new contacts is mapped with one `git check-mailmap`, and mapped contacts are cached."""
+    resolver = IdentityResolver(mailmap_repo)
+    check_mailmap = MagicMock(wraps=resolver._check_mailmap)
+    monkeypatch.setattr(resolver, "_check_mailmap", check_mailmap)
+
+    resolver.resolve_all(["Bobby <bobby@old.example.com>", "Al <al@old.example.com>", "Carol", "Carol"])
+    resolver.resolve_all(["Bobby <bobby@old.example.com>"])
+
+    assert check_mailmap.call_count == 1
+    assert check_mailmap.call_args.args == (["Bobby <bobby@old.example.com>", "Al <al@old.example.com>"],)
+    assert resolver.resolve("Bobby <bobby@old.example.com>") == "Bob Smith <bob@example.com>"
+    assert resolver.resolve("Al <al@old.example.com>") == "Alice Jones <alice@example.com>"
+    assert resolver.resolve("Carol") == "Carol"
+
+
+def test_has_mailmap(mailmap_repo, default_repo):
+    """A repository has a mailmap if its work tree has a `.mailmap` or its configuration names one."""
+    assert has_mailmap(mailmap_repo)
+    assert not has_mailmap(default_repo)
+    with default_repo.config_writer("repository") as writer:
+        writer.set_value("mailmap", "file", "/etc/mailmap")
+    assert has_mailmap(default_repo)
+
+
+@pytest.mark.parametrize(
+    ["mailmap", "expected_authors"],
+    [
+        param(True, ["Alice Jones", "Bob Smith"], id="mapped"),
+        param(False, ["Al", "Bobby"], id="not-mapped"),
+    ],
+)
+def test_commit_contexts_use_the_mailmap(mailmap_repo, mailmap, expected_authors):
+    """The committers and trailer authors of the commit contexts are mapped through the mailmap."""
+    config = get_default_config()
+    config.mailmap = mailmap
+
+    (version,) = get_context_from_tags(mailmap_repo, config)
+
+    commits = [commit for group in version.grouped_commits for commit in group.commits]
+    assert len(commits) == 3
+    assert all(commit.author_names == expected_authors for commit in commits)
@@ -1,5 +1,6 @@
 from pathlib import Path
 
+import pytest
 from git import Actor
 
 import generate_changelog.commits
@@ -9,7 +10,8 @@ from generate_changelog.configuration import get_default_config
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
 
-def test_tags_on_multiple_branches(bare_git_repo, capsys):
+@pytest.fixture
+def multi_branch_repo(bare_git_repo):
     """
     Make a bunch of default commits to a temporary bare git repo.
 
@@ -72,6 +74,12 @@ def test_tags_on_multiple_branches(bare_git_repo, capsys):
 
     # print(bare_git_repo.git.log(all=True, pretty=r"tformat:%s %d", graph=True))
 
+    return bare_git_repo
+
+
+def test_tags_on_multiple_branches(multi_branch_repo, capsys):
+    """Tags sorted by date split the history into the commits between consecutive tags."""
+    bare_git_repo = multi_branch_repo
     changelog_config = get_default_config()
     changelog_config.update_from_file(FIXTURES_DIR / "std-out-config.yaml")
     context = generate_changelog.commits.get_context_from_tags(bare_git_repo, changelog_config)
@@ -92,3 +100,42 @@ def test_tags_on_multiple_branches(bare_git_repo, capsys):
     assert ver002.grouped_commits[0].commits[0].summary == "Commit 2 on develop."
     assert len(ver001.grouped_commits[0].commits) == 1
     assert ver001.grouped_commits[0].commits[0].summary == "Commit 1 on master."
+
+
+def test_topological_walk_assigns_each_commit_once(multi_branch_repo):
+    """With a topological walk, each commit belongs to the oldest tag that contains it."""
+    changelog_config = get_default_config()
+    changelog_config.update_from_file(FIXTURES_DIR / "std-out-config.yaml")
+    changelog_config.commit_graph = "use"
+
+    context = generate_changelog.commits.get_context_from_tags(multi_branch_repo, changelog_config)
+
+    summaries = {
+        version.label: {commit.summary for group in version.grouped_commits for commit in group.commits}
+        for version in context
+    }
+    assert [version.label for version in context] == ["Unreleased", "0.0.4", "0.0.3", "0.0.2", "0.0.1"]
+    assert summaries == {
+        "Unreleased": set(),
+        "0.0.4": {"Commit 5 on master.", "Commit 3 on develop."},
+        "0.0.3": {"Commit 4 on master."},
+        "0.0.2": {"Commit 2 on develop."},
+        "0.0.1": {"Commit 1 on master."},
+    }
+
+
+def test_topological_walk_from_starting_tag(multi_branch_repo):
+    """Only the versions the starting tag doesn't contain are included, including those on merged branches."""
+    changelog_config = get_default_config()
+    changelog_config.update_from_file(FIXTURES_DIR / "std-out-config.yaml")
+    changelog_config.commit_graph = "use"
+
+    context = generate_changelog.commits.get_context_from_tags(multi_branch_repo, changelog_config, "0.0.3")
+
+    assert [version.label for version in context] == ["Unreleased", "0.0.4", "0.0.2"]
+    assert context[-1].previous_tag == "0.0.3"
+    assert {commit.summary for commit in context[1].grouped_commits[0].commits} == {
+        "Commit 5 on master.",
+        "Commit 3 on develop.",
+    }
+    assert [commit.summary for commit in context[2].grouped_commits[0].commits] == ["Commit 2 on develop."]
@@ -0,0 +1,85 @@
+"""Tests of generating changelogs for several projects in one repository."""
+
+import pytest
+import rich_click as click
+
+from generate_changelog import monorepo as monorepo_mod
+from generate_changelog.configuration import get_default_config
+
+PROJECTS = [
+    {"name": "a", "path": "packages/a", "tag_pattern": r"^a-\d+\.\d+\.\d+$"},
+    {"name": "b", "path": ["packages/b/*.py"], "tag_pattern": r"^b-\d+\.\d+\.\d+$", "unreleased_label": "Next"},
+]
+
+
+@pytest.fixture
+def monorepo_config():
+    """A configuration with two projects that doesn't read or write files."""
+    config = get_default_config()
+    config.starting_tag_pipeline = []
+    config.output_pipeline = []
+    config.projects = PROJECTS
+    return config
+
+
+def test_project_paths_treat_directories_as_prefixes():
+    """Paths without glob characters match everything below the directory."""
+    assert monorepo_mod.project_paths({"name": "a", "path": "packages/a/"}) == ["packages/a/*"]
+    assert monorepo_mod.project_paths({"name": "a", "path": ["src/*.py", "docs"]}) == ["src/*.py", "docs/*"]
+
+
+@pytest.mark.parametrize("project", [{"path": "packages/a"}, {"name": "a"}])
+def test_project_paths_require_name_and_path(project):
+    """Projects without a name or a path are configuration errors."""
+    with pytest.raises(click.UsageError):
+        monorepo_mod.project_paths(project)
+
+
+def test_project_configuration_overrides_options(monorepo_config, tmp_path):
+    """Project options override a copy of the repository configuration."""
+    monorepo_config.report_path = tmp_path / "report.txt"
+    original_variables = dict(monorepo_config.variables)
+    project = {"name": "b", "path": "packages/b", "variables": {"changelog_filename": "packages/b/CHANGELOG.md"}}
+
+    project_config = monorepo_mod.project_configuration(monorepo_config, project)
+
+    assert project_config.rendered_variables["changelog_filename"] == "packages/b/CHANGELOG.md"
+    assert project_config.report_path == tmp_path / "report-b.txt"
+    assert project_config.projects == []
+    assert monorepo_config.variables == original_variables
+
+
+def test_generate_project_changelogs_splits_commits_by_path(monorepo, monorepo_config):
+    """Each project gets the commits that change its files, its own tags, and its own release hint."""
+    changelogs = monorepo_mod.generate_project_changelogs(monorepo, monorepo_config, "master")
+
+    assert [changelog.name for changelog in changelogs] == ["a", "b"]
+    assert [changelog.release_hint for changelog in changelogs] == ["patch", "minor"]
+
+    a_changelog = changelogs[0].rendered.full
+    assert "fix a bug in a" in a_changelog
+    assert "a-1.0.0" in a_changelog
+    assert "package b" not in a_changelog
+    assert "shared docs" not in a_changelog
+
+    b_changelog = changelogs[1].rendered.full
+    assert "## Next" in b_changelog
+    assert "change b" in b_changelog
+    assert "add package b" in b_changelog
+    assert "package a" not in b_changelog
+
+
+def test_projects_with_the_same_tags_share_the_version_grouping(monorepo, monorepo_config, mocker):
+    """Commits are grouped by version once for projects with the same tag pattern, and filtered per project."""
+    monorepo_config.projects = [
+        {"name": "a", "path": "packages/a", "tag_pattern": r"^a-\d+\.\d+\.\d+$"},
+        {"name": "a-docs", "path": "docs", "tag_pattern": r"^a-\d+\.\d+\.\d+$"},
+    ]
+    group_commits = mocker.spy(monorepo_mod.git_ops, "_group_commits_by_tags")
+
+    changelogs = monorepo_mod.generate_project_changelogs(monorepo, monorepo_config, "master")
+
+    assert group_commits.call_count == 1
+    assert "fix a bug in a" in changelogs[0].rendered.full
+    assert "fix a bug in a" not in changelogs[1].rendered.full
+    assert "shared docs" in changelogs[1].rendered.full
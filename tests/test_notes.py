@@ -1,6 +1,8 @@
 """Test the retrieval of release notes from the changelog."""
 
+import re
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
@@ -92,3 +94,52 @@ def test_get_version_notes():
         "#### Other\n\n"
         "- Crash on connection reset."
     )
+
+
+def test_iter_changelog_sections_matches_split_changelog():
+    """Scanning the file should find the same sections as splitting its contents."""
+    config = configuration.get_default_config()
+    changelog_path = FIXTURES_DIR.joinpath("rendered_conv_commit_repo.md")
+    pattern = r"(?im)^## (?P<rev>\d+\.\d+(?:\.\d+)?)\s+\(\d+-\d{2}-\d{2}\)$"
+
+    sections = list(notes.iter_changelog_sections(changelog_path, pattern, config=config))
+    expected = notes.split_changelog(changelog_path.read_text(), pattern, config=config)
+
+    assert [section.version for section in sections] == [version for version, _ in expected]
+    assert [notes.read_section(changelog_path, section) for section in sections] == [text for _, text in expected]
+
+
+def test_iter_changelog_sections_is_lazy(tmp_path, monkeypatch):
+    """Only the headings needed to locate the requested sections are searched for."""
+    matched = []
+
+    class RecordingPattern:
+        """Records the headings found by a compiled pattern."""
+
+        def __init__(self, pattern):
+            self.regex = re.compile(pattern)
+
+        def finditer(self, contents):
+            for match in self.regex.finditer(contents):
+                matched.append(match.group(1))
+                yield match
+
+    monkeypatch.setattr(notes, "re", SimpleNamespace(compile=RecordingPattern))
+    changelog_path = tmp_path / "CHANGELOG.md"
+    older = "".join(f"## 1.0.{patch} (2022-01-01)\n\nOld.\n\n" for patch in range(100, 0, -1))
+    changelog_path.write_text(f"# Changelog\n\n## 2.0.0 (2022-01-02)\n\nNew.\n\n{older}")
+    sections = notes.iter_changelog_sections(changelog_path, r"(?im)^## (\d+\.\d+\.\d+) .*$")
+
+    first = next(sections)
+    assert first.version == "2.0.0"
+    assert notes.read_section(changelog_path, first) == "\n\nNew.\n\n"
+    # The second heading ends the first section; the other 99 are never searched for.
+    assert matched == [b"2.0.0", b"1.0.100"]
+    sections.close()
+
+
+def test_iter_changelog_sections_empty_file(tmp_path):
+    """An empty changelog has no sections."""
+    changelog_path = tmp_path / "CHANGELOG.md"
+    changelog_path.touch()
+    assert list(notes.iter_changelog_sections(changelog_path, r"(?im)^## (\d+\.\d+\.\d+)")) == []
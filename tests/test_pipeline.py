@@ -5,6 +5,8 @@ from pathlib import Path
 import pytest
 
 from generate_changelog import pipeline
+from generate_changelog.actions import text_processing
+from generate_changelog.actions.metadata import MetadataCollector
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
@@ -99,3 +101,64 @@ def test_pipelline_dag():
     input_text = "This is new\n"
     expected = input_text + "## 0.0.1 (2022-01-01)\n\nThis stuff stays.\n"
     assert pipe.run(input_text) == expected
+
+
+def test_pipeline_run_batch_matches_run():
+    """Running a batch gives the same results as running the pipeline on each input."""
+    actions = [
+        {"action": "strip_spaces"},
+        {"action": "RegexSub", "kwargs": {"pattern": r"^(fix|feat): ", "replacement": ""}},
+        {"action": "SetDefault", "args": ["no commit message"]},
+        {"action": "PrefixString", "kwargs": {"prefix": "{{ result_1 | length }} "}},
+        {"action": "capitalize"},
+    ]
+    inputs = ["  fix: a bug ", "feat: a feature", "", None]
+    pipe = pipeline.pipeline_factory(actions)
+
+    assert pipe.run_batch(inputs) == [pipe.run(value) for value in inputs]
+    assert pipe.run_batch([]) == []
+
+
+def test_action_run_batch_renders_static_arguments_once(mocker):
+    """Arguments without Jinja syntax are rendered once, and the batch goes to the action's `__call_batch__`."""
+    from generate_changelog.templating import get_pipeline_env
+
+    action = pipeline.Action("RegexSub", kwargs={"pattern": "a", "replacement": "b"})
+    from_string = mocker.spy(get_pipeline_env(), "from_string")
+    call_batch = mocker.spy(text_processing.RegexSub, "__call_batch__")
+
+    assert action.run_batch([{}, {}, {}], ["a", "aa", "c"]) == ["b", "bb", "c"]
+    assert from_string.call_count == 2
+    assert call_batch.call_count == 1
+
+
+def test_pipeline_cache_reuses_actions(mocker, monkeypatch):
+    """With the pipeline cache, pipelines of the same action list share their rendered static arguments."""
+    from generate_changelog.templating import get_pipeline_env
+
+    monkeypatch.setattr(pipeline, "_PIPELINE_CACHE", None)
+    pipeline.enable_pipeline_cache()
+    actions = [{"action": "RegexSub", "kwargs": {"pattern": "a", "replacement": "b"}}]
+    from_string = mocker.spy(get_pipeline_env(), "from_string")
+    collector = MetadataCollector()
+
+    first = pipeline.pipeline_factory(actions)
+    second = pipeline.pipeline_factory(actions, version_metadata_func=collector)
+
+    assert first.run_batch(["a", "c"]) == ["b", "c"]
+    assert second.run_batch(["aa"]) == ["bb"]
+    assert from_string.call_count == 2
+    assert first.actions[0] is not second.actions[0]
+    assert second.actions[0].version_metadata_func is collector
+    assert first.actions[0].version_metadata_func is pipeline.noop_func
+
+
+def test_action_run_batch_saves_metadata_per_input():
+    """Each input of a batch saves its commit metadata with its own callable."""
+    action = pipeline.Action("ParseTrailers", kwargs={"commit_metadata": "save_commit_metadata"})
+    collectors = [MetadataCollector(), MetadataCollector()]
+
+    action.run_batch([{}, {}], ["Body\n\nCo-authored-by: A <a@x.com>", "Body"], collectors)
+
+    assert collectors[0].metadata["trailers"] == {"co-authored-by": ["A <a@x.com>"]}
+    assert not collectors[1].metadata["trailers"]
@@ -0,0 +1,155 @@
+"""Tests of the pipeline hooks."""
+
+import json
+import traceback
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from generate_changelog import pipeline_hooks
+from generate_changelog.cli import cli
+from generate_changelog.pipeline import pipeline_factory
+
+runner = CliRunner()
+
+
+def explode(value: str) -> str:
+    """An action that always fails."""
+    raise ValueError("boom")
+
+
+class RecordingHook(pipeline_hooks.PipelineHook):
+    """Records the hook calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def on_action_start(self, action, input_value):
+        """Record the start of an action."""
+        self.calls.append(("start", action.name, input_value))
+
+    def on_action_end(self, action, duration, input_size, output_size, exception):
+        """Record the end of an action."""
+        assert duration >= 0
+        self.calls.append(("end", action.name, input_size, output_size, exception))
+
+
+def test_pipeline_notifies_its_hooks():
+    """Pipeline hooks are told when each action starts and ends, with the input and output sizes."""
+    hook = RecordingHook()
+    pipe = pipeline_factory([{"action": "strip_spaces"}, {"action": "capitalize", "id": "cap"}], hooks=[hook])
+
+    assert pipe.run("  hello ") == "Hello"
+    assert hook.calls == [
+        ("start", "strip_spaces", "  hello "),
+        ("end", "strip_spaces", 8, 5, None),
+        ("start", "cap", "hello"),
+        ("end", "cap", 5, 5, None),
+    ]
+
+
+def test_hooks_are_notified_of_exceptions():
+    """A failing action is reported to the hooks, and the exception is raised."""
+    hook = RecordingHook()
+    pipe = pipeline_factory([{"action": "tests.test_pipeline_hooks.explode"}], hooks=[hook])
+
+    with pytest.raises(ValueError):
+        pipe.run("input")
+
+    assert hook.calls[-1][:4] == ("end", "tests.test_pipeline_hooks.explode", 5, None)
+    assert isinstance(hook.calls[-1][4], ValueError)
+
+
+def test_registered_hooks_observe_every_pipeline():
+    """Globally registered hooks are notified by all pipelines while they are registered."""
+    hook = RecordingHook()
+    pipe = pipeline_factory([{"action": "strip_spaces"}])
+
+    with pipeline_hooks.registered_hooks(hook):
+        pipe.run(" a ")
+    pipe.run(" b ")
+
+    assert [call[2] for call in hook.calls if call[0] == "start"] == [" a "]
+
+
+def test_no_hooks_fast_path():
+    """Without hooks, the pipeline's empty tuple is used as is."""
+    no_hooks = ()
+    assert pipeline_hooks.active_hooks(no_hooks) is no_hooks
+
+
+def test_action_stats_collector():
+    """The collector aggregates calls, errors, time and sizes by action name."""
+    collector = pipeline_hooks.ActionStatsCollector()
+    pipeline_factory([{"action": "strip_spaces"}], hooks=[collector]).run(" abc ")
+    pipeline_factory([{"action": "strip_spaces"}], hooks=[collector]).run("de")
+    with pytest.raises(ValueError):
+        pipeline_factory([{"action": "tests.test_pipeline_hooks.explode"}], hooks=[collector]).run("x")
+
+    stats = collector.stats["strip_spaces"]
+    assert (stats.calls, stats.errors, stats.input_size, stats.output_size) == (2, 0, 7, 5)
+    assert collector.stats["tests.test_pipeline_hooks.explode"].errors == 1
+
+
+def test_batches_still_run_in_one_call_while_hooks_are_registered(mocker):
+    """Hooks observe a batch as one run carrying the number of inputs, and the batch still uses `__call_batch__`."""
+    from generate_changelog.actions import text_processing
+
+    call_batch = mocker.spy(text_processing.RegexSub, "__call_batch__")
+    hook = RecordingHook()
+    collector = pipeline_hooks.ActionStatsCollector()
+    pipe = pipeline_factory([{"action": "RegexSub", "id": "sub", "kwargs": {"pattern": "a", "replacement": "b"}}])
+
+    with pipeline_hooks.registered_hooks(hook), pipeline_hooks.registered_hooks(collector):
+        assert pipe.run_batch(["a", "aa", "c"]) == ["b", "bb", "c"]
+
+    assert call_batch.call_count == 1
+    assert hook.calls == [("start", "sub", ["a", "aa", "c"]), ("end", "sub", 4, 4, None)]
+    assert (collector.stats["sub"].calls, collector.stats["sub"].input_size) == (3, 4)
+
+
+def test_span_file_exporter_writes_nested_spans(tmp_path):
+    """Each action gets a span, and actions run within actions are children of their span."""
+    path = tmp_path / "spans.jsonl"
+    exporter = pipeline_hooks.SpanFileExporter(path)
+    outer = pipeline_factory([{"action": "strip_spaces", "id": "outer"}]).actions[0]
+    inner = pipeline_factory([{"action": "tests.test_pipeline_hooks.explode", "id": "inner"}]).actions[0]
+
+    exporter.on_action_start(outer, "input")
+    exporter.on_action_start(inner, "input")
+    exporter.on_action_end(inner, 0.001, 5, None, ValueError("boom"))
+    exporter.on_action_end(outer, 0.002, 5, 5, None)
+    exporter.close()
+
+    inner_span, outer_span = map(json.loads, path.read_text().splitlines())
+    assert inner_span["traceId"] == outer_span["traceId"] == exporter.trace_id
+    assert inner_span["parentSpanId"] == outer_span["spanId"]
+    assert not outer_span["parentSpanId"]
+    assert inner_span["status"] == {"code": "STATUS_CODE_ERROR", "message": "ValueError: boom"}
+    assert outer_span["name"] == "action outer"
+    assert outer_span["attributes"] == {
+        "action.name": "outer",
+        "action.input_count": 1,
+        "action.input_size": 5,
+        "action.output_size": 5,
+    }
+    assert outer_span["endTimeUnixNano"] - outer_span["startTimeUnixNano"] == 2_000_000
+
+
+def test_generate_trace_option(default_repo, tmp_path):
+    """The `--trace` option writes a span for each action run."""
+    config = Path(__file__).parent / "fixtures" / "std-out-config.yaml"
+    trace_path = tmp_path / "trace.jsonl"
+
+    result = runner.invoke(
+        cli, ["-r", default_repo.git_dir, "-c", str(config), "-o", "release-hint", "--trace", str(trace_path)]
+    )
+
+    if result.exit_code != 0:
+        print(result.stdout)
+        traceback.print_exception(*result.exc_info)
+    assert result.exit_code == 0
+    names = {json.loads(line)["name"] for line in trace_path.read_text().splitlines()}
+    assert {"action ParseTrailers", "action strip_spaces", "action stdout"} <= names
+    assert pipeline_hooks._HOOKS == []
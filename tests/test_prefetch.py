@@ -0,0 +1,51 @@
+"""Tests of finding the commit fields a configuration uses."""
+
+import pytest
+from pytest import param
+
+from generate_changelog.configuration import get_default_config
+from generate_changelog.prefetch import LAZY_FIELDS, commit_fields_used
+
+
+def test_default_configuration_uses_no_lazy_fields():
+    """The default classifiers, rules and templates don't use the changed files."""
+    assert commit_fields_used(get_default_config()) == frozenset()
+
+
+@pytest.mark.parametrize(
+    ["option", "value"],
+    [
+        param("release_hint_rules", [{"match_result": "patch", "path": "src/*"}], id="release-rule-path"),
+        param("group_by", ["metadata.category", "files"], id="group-by"),
+        param("commit_classifiers", [{"action": "myproject.is_docs_change", "category": "Docs"}], id="custom-action"),
+    ],
+)
+def test_configuration_options_that_use_files(option, value):
+    """Release rules with paths, `group_by` entries and custom classifier actions may use the changed files."""
+    config = get_default_config()
+    setattr(config, option, value)
+    assert commit_fields_used(config) == {"files"}
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        param("{% for path in commit.files %}{{ path }}{% endfor %}", id="attribute"),
+        param("{{ commit['files'] | length }}", id="item"),
+        param("{{ commit | attr('files') }}", id="attr-filter"),
+    ],
+)
+def test_templates_that_use_files(tmp_path, template):
+    """Templates in the template directories are searched for the fields they look up."""
+    (tmp_path / "commit.md.jinja").write_text(template, encoding="utf-8")
+    config = get_default_config()
+    config.template_dirs = [str(tmp_path)]
+    assert commit_fields_used(config) == {"files"}
+
+
+def test_unparsable_template_uses_all_fields(tmp_path):
+    """If a template can't be parsed, all the lazy fields are prefetched."""
+    (tmp_path / "commit.md.jinja").write_text("{% for %}", encoding="utf-8")
+    config = get_default_config()
+    config.template_dirs = [str(tmp_path)]
+    assert commit_fields_used(config) == LAZY_FIELDS
@@ -0,0 +1,81 @@
+"""Tests of the stage profiler."""
+
+import json
+import pstats
+import traceback
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from generate_changelog import profiling
+from generate_changelog.cli import cli
+
+runner = CliRunner()
+
+
+def test_profile_stage_does_nothing_without_a_profiler():
+    """Stages aren't recorded unless a profiler is active."""
+    assert profiling.get_profiler() is None
+    with profiling.profile_stage("stage"):
+        pass
+    assert profiling.get_profiler() is None
+
+
+def test_profiler_records_calls_and_time():
+    """Each call of a stage adds to its count and total."""
+    profiler = profiling.Profiler()
+    profiler.record("stage", 0.5)
+    profiler.record("stage", 1.5)
+    profiler.record("other", 1.0, calls=4)
+
+    assert profiler.stages["stage"] == profiling.StageStats(calls=2, total=2.0)
+    assert profiler.stages["stage"].mean == pytest.approx(1.0)
+    assert profiler.as_dict()["stages"]["other"] == {"calls": 4, "total": 1.0, "mean": 0.25}
+    assert profiler.table().row_count == 2
+
+
+def test_profile_run_writes_outputs(tmp_path):
+    """A profiled run writes the JSON statistics, the report table and the cProfile statistics."""
+    json_path, report_path, prof_path = tmp_path / "profile.json", tmp_path / "report.txt", tmp_path / "run.prof"
+    report_path.write_text("Release hint report\n")
+
+    with profiling.profile_run(json_path, report_path, prof_path) as profiler:
+        assert profiling.get_profiler() is profiler
+        with profiling.profile_stage("stage"):
+            sum(range(1000))
+
+    assert profiling.get_profiler() is None
+    assert json.loads(json_path.read_text())["stages"]["stage"]["calls"] == 1
+    report = report_path.read_text()
+    assert report.startswith("Release hint report\n")
+    assert "Profile:" in report
+    assert pstats.Stats(str(prof_path)).total_calls > 0
+
+
+def test_profile_run_without_outputs_does_not_profile(tmp_path):
+    """Without a JSON or cProfile path, nothing is profiled."""
+    with profiling.profile_run(report_path=tmp_path / "report.txt") as profiler:
+        assert profiler is None
+        assert profiling.get_profiler() is None
+
+
+def test_generate_profile_option(default_repo, tmp_path):
+    """The `--profile` option records every stage of a run, including each action."""
+    config = Path(__file__).parent / "fixtures" / "std-out-config.yaml"
+    json_path = tmp_path / "profile.json"
+
+    result = runner.invoke(
+        cli,
+        ["-r", default_repo.git_dir, "-c", str(config), "-o", "release-hint", "--profile", str(json_path)],
+    )
+
+    if result.exit_code != 0:
+        print(result.stdout)
+        traceback.print_exception(*result.exc_info)
+    assert result.exit_code == 0
+    stages = json.loads(json_path.read_text())["stages"]
+    for stage in ["tag discovery", "range parsing", "classification", "grouping", "release hint", "rendering"]:
+        assert stages[stage]["calls"] >= 1
+    assert stages["action: ParseTrailers"]["calls"] == 5  # One of the six commits is ignored
+    assert stages["action: stdout"]["calls"] == 1
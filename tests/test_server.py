@@ -0,0 +1,94 @@
+"""Tests of the changelog server."""
+
+import os
+import threading
+import traceback
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from generate_changelog import git_ops, pipeline, server
+from generate_changelog.cli import cli, generate, params_to_args
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def running_server(tmp_path):
+    """Run a changelog server in a background thread."""
+    socket_path = tmp_path / "changelog.sock"
+    changelog_server = server.make_server(socket_path)
+    thread = threading.Thread(target=changelog_server.serve_forever, daemon=True)
+    thread.start()
+    yield socket_path
+    changelog_server.shutdown()
+    changelog_server.server_close()
+    thread.join()
+    git_ops._REPO_CACHE = None
+    git_ops._HISTORY_CACHE = None
+    pipeline._PIPELINE_CACHE = None
+
+
+def test_params_to_args_round_trip():
+    """Parsed parameters convert back into arguments that parse to the same values."""
+    args = ["-c", str(FIXTURES_DIR / "std-out-config.yaml"), "-t", "1.0.0", "--skip-output-pipeline", "-vv"]
+    ctx = generate.make_context("generate", list(args))
+
+    assert generate.make_context("generate", params_to_args(generate, ctx.params)).params == ctx.params
+
+
+def test_run_request_runs_generate(default_repo, tmp_path):
+    """A request runs the generate command in the requested directory and captures its output."""
+    config = FIXTURES_DIR / "std-out-config.yaml"
+    argv = ["-r", default_repo.git_dir, "-c", str(config), "--skip-output-pipeline", "-o", "release-hint"]
+
+    response = server.run_request(argv, str(tmp_path))
+
+    assert response["exit_code"] == 0
+    assert response["stdout"] == "minor\n"
+
+
+def test_run_request_reports_usage_errors(tmp_path):
+    """Usage errors are returned as a failed exit code instead of exiting the server."""
+    response = server.run_request(["--output", "bogus"], str(tmp_path))
+
+    assert response["exit_code"] == 2
+    assert "bogus" in response["stderr"]
+
+
+def test_client_forwards_to_server(default_repo, running_server):
+    """The CLI forwards its arguments to the server and echoes the result."""
+    config = FIXTURES_DIR / "std-out-config.yaml"
+
+    for _ in range(2):
+        result = runner.invoke(
+            cli,
+            [
+                "--server",
+                str(running_server),
+                "-r",
+                default_repo.git_dir,
+                "-c",
+                str(config),
+                "--skip-output-pipeline",
+                "-o",
+                "release-hint",
+            ],
+        )
+        if result.exit_code != 0:
+            print(result.output)
+            traceback.print_exception(*result.exc_info)
+        assert result.exit_code == 0
+        assert result.stdout == "minor\n"
+
+    assert list(git_ops._REPO_CACHE) == [os.path.abspath(default_repo.git_dir)]
+    assert [key[0] for key in git_ops._HISTORY_CACHE] == [os.path.abspath(default_repo.git_dir)]
+
+
+def test_make_server_refuses_running_socket(running_server):
+    """Only one server can listen on a socket."""
+    with pytest.raises(RuntimeError):
+        server.make_server(running_server)
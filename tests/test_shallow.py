@@ -0,0 +1,111 @@
+"""Tests of the shallow clone planner."""
+
+import json
+import logging
+
+import pytest
+from click import UsageError
+from click.testing import CliRunner
+from git import Actor, Repo
+
+from generate_changelog import git_ops, shallow
+from generate_changelog.cli import cli
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def mirror(tmp_path) -> Repo:
+    """A repository with eight commits, a lightweight tag on the third and an annotated tag on the sixth."""
+    repo = Repo.init(tmp_path / "mirror", initial_branch="master")
+    actor = Actor("Bob", "bob@example.com")
+    for number in range(1, 9):
+        repo.index.commit(
+            f"new: commit {number}", author=actor, committer=actor, commit_date=f"2022-01-0{number}T10:00:00"
+        )
+        if number == 3:
+            repo.create_tag("1.0.0")
+        elif number == 6:
+            with repo.git.custom_environment(GIT_COMMITTER_NAME="Bob", GIT_COMMITTER_EMAIL="bob@example.com"):
+                repo.git.tag("-a", "1.1.0", "-m", "Release 1.1.0")
+    return repo
+
+
+@pytest.fixture
+def shallow_clone(mirror, tmp_path) -> Repo:
+    """A clone of the mirror with only its last commit and no tags."""
+    return Repo.clone_from(f"file://{mirror.working_dir}", tmp_path / "clone", depth=1, no_tags=True)
+
+
+def test_plan_from_a_starting_tag(mirror):
+    """The plan covers the commits after the tag, their parents, and the tags on them."""
+    plan = shallow.plan_shallow_fetch(mirror, "1.0.0")
+
+    assert plan.depth == 6
+    assert len(plan.shas) == 6
+    assert plan.shas[-1] == mirror.commit("1.0.0").hexsha
+    assert plan.shallow_since.isoformat() == "2022-01-03T10:00:00+00:00"
+    assert sorted(plan.tags) == ["1.0.0", "1.1.0"]
+
+
+def test_plan_without_a_starting_tag_needs_the_full_history(mirror):
+    """Without a starting tag, there is no depth."""
+    plan = shallow.plan_shallow_fetch(mirror, None)
+    assert plan.as_dict() == {
+        "head": mirror.head.commit.hexsha,
+        "starting_tag": None,
+        "commits": None,
+        "depth": None,
+        "shallow_since": None,
+        "tags": [],
+    }
+
+
+def test_unknown_starting_tag(mirror):
+    """A starting tag missing from the mirror is a usage error."""
+    with pytest.raises(UsageError, match=r"Can't find '9\.9\.9'"):
+        shallow.plan_shallow_fetch(mirror, "9.9.9")
+
+
+def test_deepen_fetches_just_enough(mirror, shallow_clone, caplog):
+    """Deepening fetches the needed commits and tags, and leaves the clone shallow."""
+    plan = shallow.plan_shallow_fetch(mirror, "1.1.0")
+    assert shallow.needs_deepening(shallow_clone, plan)
+
+    assert shallow.deepen(shallow_clone, mirror.git_dir, plan)
+
+    assert not shallow.needs_deepening(shallow_clone, plan)
+    assert git_ops.shallow_commits(shallow_clone) == {mirror.commit("1.1.0").hexsha}
+    assert sorted(tag.name for tag in shallow_clone.tags) == ["1.1.0"]
+    with caplog.at_level(logging.WARNING):
+        commits = git_ops.parse_commits(shallow_clone, "1.1.0")
+    assert [commit.summary for commit in commits] == ["new: commit 8", "new: commit 7"]
+    assert "shallow clone" not in caplog.text
+
+
+def test_parse_commits_warns_at_the_shallow_boundary(shallow_clone, caplog):
+    """Reading the full history of a shallow clone warns that commits may be missing."""
+    with caplog.at_level(logging.WARNING):
+        git_ops.parse_commits(shallow_clone)
+    assert "shallow clone" in caplog.text
+
+
+def test_plan_fetch_command(mirror, shallow_clone):
+    """The `plan-fetch` command outputs the plan and deepens the clone from the mirror."""
+    args = ["plan-fetch", "-r", shallow_clone.working_dir, "-t", "1.0.0", "--mirror", mirror.git_dir, "--deepen"]
+
+    result = runner.invoke(cli, args)
+
+    assert result.exit_code == 0, result.output
+    output = json.loads(result.output)
+    assert output["depth"] == 6
+    assert output["needs_deepening"] is True
+    assert output["deepened"] is True
+    assert len(list(shallow_clone.iter_commits("1.0.0..HEAD"))) == 5
+
+
+def test_plan_fetch_deepen_needs_a_mirror(shallow_clone):
+    """Deepening without a mirror is a usage error."""
+    result = runner.invoke(cli, ["plan-fetch", "-r", shallow_clone.working_dir, "-t", "1.0.0", "--deepen"])
+    assert result.exit_code == 2
+    assert "--deepen needs a --mirror" in result.output
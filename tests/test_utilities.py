@@ -49,6 +49,33 @@ def test_resolve_name_property_error():
     assert utilities.resolve_name(test_obj, "exc", default="default") == "default"
 
 
+@pytest.mark.parametrize(
+    ["name", "data"],
+    [
+        param("key1", mapping, id="simple mapping"),
+        param("dict-key.dict-key-key1", mapping, id="nested mapping"),
+        param("dict_attr.key1", test_obj, id="attribute then key"),
+        param("list_attr.2", test_obj, id="list lookup"),
+        param("list_attr.9", test_obj, id="index out of range"),
+        param("key3", mapping, id="missing key"),
+        param("exc", test_obj, id="property error"),
+        param("dict_attr.key1.0.upper", test_obj, id="string index then attribute"),
+    ],
+)
+def test_compile_name_matches_resolve_name(name, data):
+    """A compiled name gets the same value as resolving the name."""
+    assert utilities.compile_name(name, "default")(data) == utilities.resolve_name(data, name, "default")
+
+
+def test_compile_name_accepts_unhashable_defaults():
+    """The default can be any value, such as a list."""
+    default = []
+    get_missing = utilities.compile_name("missing.key", default)
+
+    assert get_missing({}) is default
+    assert utilities.compile_name("key", [])({"key": "value"}) == "value"
+
+
 @pytest.mark.parametrize(
     ["iterable1", "iterable2", "index"],
     [
@@ -63,3 +90,40 @@ def test_diff_index(iterable1, iterable2, index):
         assert utilities.diff_index(iterable1, iterable2) is index
     else:
         assert utilities.diff_index(iterable1, iterable2) == index
+
+
+@pytest.mark.parametrize(
+    ["patterns", "paths", "expected"],
+    [
+        param(["docs/*"], ["README.md", "docs/api/index.md"], True, id="nested-match"),
+        param(["docs/*"], ["README.md"], False, id="no-match"),
+        param(["*.md", "*.py"], ["src/app.py"], True, id="second-pattern"),
+        param(["*.md"], [], False, id="no-paths"),
+    ],
+)
+def test_path_matches(patterns, paths, expected):
+    """Paths match when any path matches any glob pattern."""
+    assert utilities.path_matches(patterns, paths) is expected
+
+
+@pytest.mark.parametrize(
+    ["value", "expected"],
+    [
+        param(None, None, id="none"),
+        param(90, 90.0, id="int"),
+        param("45", 45.0, id="no-unit"),
+        param("30m", 1800.0, id="minutes"),
+        param("12h", 43200.0, id="hours"),
+        param("1d", 86400.0, id="days"),
+        param("2W", 1209600.0, id="weeks-uppercase"),
+    ],
+)
+def test_parse_duration(value, expected):
+    """Durations are converted to seconds."""
+    assert utilities.parse_duration(value) == expected
+
+
+def test_parse_duration_invalid():
+    """Invalid durations raise an error."""
+    with pytest.raises(ValueError):
+        utilities.parse_duration("1 fortnight")